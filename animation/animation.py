@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from pydeation.constants import WHITE
+from pydeation.animation.timeline import Timeline
 import c4d
 
 
@@ -68,7 +69,7 @@ class ProtoAnimation(ABC):
         pass
 
     @abstractmethod
-    def execute(self):
+    def execute(self, timeline=None):
         """sets the actual keyframes of the animation"""
         pass
 
@@ -83,8 +84,11 @@ class ProtoAnimation(ABC):
         pass
 
     def get_current_value(self):
-        """returns the value of the objects parameter"""
-        self.current_value = self.target.obj[self.descriptor]
+        """returns the value of the objects parameter using the shadow state of the active timeline if available"""
+        if Timeline.active is None:
+            self.current_value = self.target.obj[self.descriptor]
+        else:
+            self.current_value = Timeline.active.state.get(self.target, self.descriptor)
 
     def get_value_type(self):
         """automatically gets the value type by reading the current values type"""
@@ -146,17 +150,30 @@ class ScalarAnimation(ProtoAnimation):
         self.set_value_fin(value_fin, ignore_relative=True)
         return self
 
-    def execute(self):
-        """sets the actual keyframes of the animation"""
+    def execute(self, timeline=None):
+        """sets the actual keyframes of the animation
+        if a timeline is given the keyframes are recorded in it instead of being created directly"""
         # translate relative to absolute run time
         self.scale_relative_run_time(self.abs_run_time)
         # calculate offset frame for initial keyframe
         offset = 1 / self.document.GetFps()
+        time_ini = self.global_time(self.abs_start)
+        time_fin = self.global_time(self.abs_stop - offset)
+        # remember the global times in seconds for evaluation and analysis
+        self.global_start = time_ini.Get()
+        self.global_stop = time_fin.Get()
+        if timeline is not None:
+            timeline.add_animation(self)
+            self.key_ini = timeline.add_key(
+                self.target, self.desc_id, time_ini, self.value_ini)  # record initial keyframe
+            self.key_fin = timeline.add_key(
+                self.target, self.desc_id, time_fin, self.value_fin)  # record final keyframe
+            return
         # set keyframes
         self.key_ini = KeyFrame(
-            self.target, self.desc_id, value=self.value_ini, time=self.global_time(self.abs_start))  # create initial keyframe
+            self.target, self.desc_id, value=self.value_ini, time=time_ini)  # create initial keyframe
         self.key_fin = KeyFrame(
-            self.target, self.desc_id, value=self.value_fin, time=self.global_time(self.abs_stop - offset))  # create final keyframe
+            self.target, self.desc_id, value=self.value_fin, time=time_fin)  # create final keyframe
 
     def scale_relative_run_time(self, abs_run_time):
         """scales the relative run time by the absolute run time"""
@@ -200,6 +217,10 @@ class ScalarAnimation(ProtoAnimation):
         # make sure it's correct data_type
         self.value_fin = self.value_type(value)
 
+    def is_static(self):
+        """checks whether the animation leaves the parameter unchanged"""
+        return self.value_ini == self.value_fin == self.value_type(self.current_value)
+
     def get_vector(self):
         """returns the vector i.e. the the difference between final and initial value"""
         vector = self.value_fin - self.value_ini
@@ -241,11 +262,16 @@ class VectorAnimation:
                                     self.descriptor_y, self.descriptor_z]
 
     def create_scalar_animations(self):
-        """creates three scalar animations for the respective components of the vector"""
+        """creates the scalar animations for the respective components of the vector
+        components which are not given or do not change are skipped"""
         self.scalar_animations = []
         for descriptor, value in zip(self.sub_descriptors, self.values):
+            if value is None:
+                continue
             scalar_animation = ScalarAnimation(
                 target=self.target, descriptor=descriptor, value_fin=value, relative=self.relative)
+            if scalar_animation.is_static():
+                continue
             self.scalar_animations.append(scalar_animation)
 
 class ColorAnimation(VectorAnimation):
@@ -291,10 +317,17 @@ class BoolAnimation(ProtoAnimation):
         else:
             return f"BoolAnimation: {self.name}, {self.target}, {self.value}"
 
-    def execute(self):
+    def execute(self, timeline=None):
         """sets the actual keyframes of the animation"""
         self.scale_relative_run_time(
             self.abs_run_time)  # translates the relative to absolute run time
+        # remember the global time in seconds for evaluation and analysis
+        self.global_start = self.global_stop = self.global_time(self.abs_start).Get()
+        if timeline is not None:
+            timeline.add_animation(self)
+            self.key = timeline.add_key(
+                self.target, self.desc_id, self.global_time(self.abs_start), self.value)  # record initial keyframe
+            return
         self.key = KeyFrame(
             self.target, self.desc_id, value=self.value, time=self.global_time(self.abs_start))  # create initial keyframe
 
@@ -325,13 +358,47 @@ class BoolAnimation(ProtoAnimation):
         self.rel_start = rel_start_rescaled_translated
 
 
+class TimeTransform:
+    """an affine transform t -> scale * t + offset mapping relative run time of a group's child onto the group's relative run time"""
+
+    def __init__(self, scale=1, offset=0):
+        self.scale = scale
+        self.offset = offset
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"TimeTransform: {self.scale}t + {self.offset}"
+
+    def __call__(self, time):
+        return self.scale * time + self.offset
+
+    @classmethod
+    def from_run_time(cls, rel_run_time):
+        """creates the transform that maps [0,1] onto the given relative run time"""
+        rel_start, rel_stop = rel_run_time
+        return cls(scale=rel_stop - rel_start, offset=rel_start)
+
+    def compose(self, inner):
+        """returns the transform applying the inner transform first and self second"""
+        return TimeTransform(scale=self.scale * inner.scale, offset=self.scale * inner.offset + self.offset)
+
+    def is_identity(self):
+        return self.scale == 1 and self.offset == 0
+
+    def get_run_time(self):
+        """returns the relative run time [0,1] is mapped onto"""
+        return (self(0), self(1))
+
+
 class AnimationGroup:
-    """an animation group holds a set of animations and can be used to recursively nest sets of animations and perform transformations on those"""
+    """an animation group holds a set of animations and can be used to recursively nest sets of animations and perform transformations on those
+    the relative run times attached to nested groups are only composed into time transforms and applied once when the group is flattened"""
 
     def __init__(self, *animations, category=None):
         """animations here refer to single animations or animation groups both with and without a relative run time attached"""
-        self.animations = self.digest_input(animations)
+        self.children = self.digest_input(animations)
         self.category = category
+        self.transforms_applied = False  # whether the children's time transforms were already written to the animations
 
     def __repr__(self):
         strings = "AnimationGroup: "
@@ -340,73 +407,50 @@ class AnimationGroup:
         return strings
 
     def __iter__(self):
-        self.idx = 0
-        return self
+        return iter(self.animations)
 
-    def __next__(self):
-        if self.idx < len(self.animations):
-            aimation = self.animations[self.idx]
-            self.idx += 1
-            return aimation
-        else:
-            raise StopIteration
+    @property
+    def animations(self):
+        """the flattened animations with all time transforms applied"""
+        return list(self.flatten())
 
     def digest_input(self, animations):
-        """applies all necessary transformations on the animations"""
-        rescaled_animations = self.rescale_other(animations)
-        flattened_animations = self.flatten(rescaled_animations)
-        return flattened_animations
-
-    def rescale_other(self, animations):
-        """loops over passed animations and applies rescaling in case of attached relative run time"""
-        rescaled_animations = []
+        """pairs the passed animations with the time transform of their attached relative run time"""
+        children = []
         for animation in animations:
+            transform = TimeTransform()
             if type(animation) is tuple:
-                animation_tuple = animation  # is tuple
-                animation, rel_run_time = animation_tuple  # unpack tuple
-                if type(animation) is AnimationGroup:
-                    animation_group = animation  # is animaiton group
-                    animation_group.rescale_self(rel_run_time)
-                elif type(animation) is ScalarAnimation:
+                animation, rel_run_time = animation  # unpack tuple
+                transform = TimeTransform.from_run_time(rel_run_time)
+            if issubclass(animation.__class__, VectorAnimation):
+                children += [(scalar_animation, transform)
+                             for scalar_animation in animation.scalar_animations]
+            elif issubclass(animation.__class__, (ProtoAnimation, AnimationGroup)):
+                children.append((animation, transform))
+        return children
+
+    def flatten(self, transform=None):
+        """lazily yields the contained animations while applying the composed time transform exactly once per animation"""
+        if transform is None:
+            transform = TimeTransform()
+        for animation, child_transform in self.children:
+            if not self.transforms_applied:
+                composed_transform = transform.compose(child_transform)
+            else:
+                composed_transform = transform  # child transform is already contained in the animation
+            if type(animation) is AnimationGroup:
+                yield from animation.flatten(composed_transform)
+            else:
+                if not composed_transform.is_identity():
                     animation.rescale_relative_run_time(
-                        rel_run_time)  # rescale relative run time
-                elif type(animation) is VectorAnimation:
-                    for scalar_animation in animation.scalar_animations:
-                        scalar_animation.rescale_relative_run_time(
-                            rel_run_time)  # rescale relative run time
-                # append to rescaled animations
-                rescaled_animations.append(animation)
-            elif issubclass(animation.__class__, (ScalarAnimation, VectorAnimation, AnimationGroup)):
-                # append to rescaled animations
-                rescaled_animations.append(animation)
-        return rescaled_animations
-
-    def rescale_self(self, rel_run_time):
-        """rescales animations contained in self"""
-        for animation in self.animations:
-            animation.rescale_relative_run_time(rel_run_time)
+                        composed_transform.get_run_time())
+                yield animation
+        self.transforms_applied = True
 
-    def flatten(self, animations):
-        """checks for and unpacks animation groups"""
-        flattened_animations = []
-        for animation in animations:
-            if type(animation) is AnimationGroup:
-                animation_group = animation  # is animation group
-                # append to flattned input
-                flattened_animations += animation_group.animations
-            elif issubclass(animation.__class__, ScalarAnimation):
-                # append to flattened input
-                flattened_animations.append(animation)
-            elif issubclass(animation.__class__, VectorAnimation):
-                # append to flattened input
-                vector_animation = animation
-                flattened_animations += vector_animation.scalar_animations
-        return flattened_animations
-
-    def execute(self):
+    def execute(self, timeline=None):
         """executes all animations of the animation group"""
-        for animation in self.animations:
-            animation.execute()
+        for animation in self.flatten():
+            animation.execute(timeline=timeline)
 
     def get_objs(self):
         """retreives the objects contained in the animation group"""
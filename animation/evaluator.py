@@ -0,0 +1,126 @@
+from pydeation.animation.animation import BoolAnimation
+from pydeation.animation.timeline import desc_id_key
+from pydeation.constants import FPS
+import numpy as np
+
+
+class TimelineEvaluator:
+    """packs executed scalar and bool animations into arrays and evaluates all animated tracks for a vector of times in one numpy pass.
+    within a track the most recently started animation determines the value, before its first animation a track holds the initial value"""
+
+    def __init__(self, animations, interpolation="spline"):
+        self.interpolation = interpolation  # "spline" mimics the eased default keys, "linear" interpolates linearly
+        self.pack(animations)
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"TimelineEvaluator: {len(self.tracks)} tracks, {len(self.starts)} animations"
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def pack(self, animations):
+        """converts the animations into arrays sorted by track and start time"""
+        self.tracks = []  # (target, desc id key) per track id
+        track_ids = {}
+        rows = []
+        for animation in animations:
+            track = (animation.target, desc_id_key(animation.desc_id))
+            if track not in track_ids:
+                track_ids[track] = len(self.tracks)
+                self.tracks.append(track)
+            if isinstance(animation, BoolAnimation):
+                # state changes jump to their value at the start
+                rows.append((track_ids[track], animation.global_start, animation.global_stop,
+                             float(animation.value), float(animation.value), True))
+            else:
+                rows.append((track_ids[track], animation.global_start, animation.global_stop,
+                             float(animation.value_ini), float(animation.value_fin), False))
+        rows.sort(key=lambda row: (row[0], row[1]))
+        columns = list(zip(*rows)) if rows else [()] * 6
+        self.track_ids = np.array(columns[0], dtype=np.int64)
+        self.starts = np.array(columns[1], dtype=np.float64)
+        self.stops = np.array(columns[2], dtype=np.float64)
+        self.values_ini = np.array(columns[3], dtype=np.float64)
+        self.values_fin = np.array(columns[4], dtype=np.float64)
+        self.steps = np.array(columns[5], dtype=bool)
+        # index of the first animation of every track
+        self.track_offsets = np.searchsorted(self.track_ids, np.arange(len(self.tracks)))
+        # shift every track into its own time band so a single sorted array can be searched for all tracks
+        self.band_origin = self.starts.min() - 1 if len(self.starts) else 0
+        self.band_width = self.stops.max() - self.band_origin + 1 if len(self.starts) else 1
+        self.band_keys = self.track_ids * self.band_width + (self.starts - self.band_origin)
+
+    def evaluate(self, times):
+        """returns an array of shape (tracks, times) holding the value of every track at the given times in seconds"""
+        times = np.asarray(times, dtype=np.float64)
+        if not len(self.tracks):
+            return np.zeros((0, len(times)))
+        track_ids = np.arange(len(self.tracks))[:, np.newaxis]
+        # times outside of the band would leak into neighbouring tracks and are clipped as the values are constant there
+        band_times = np.clip(times - self.band_origin, 0, self.band_width - 1 / 2)
+        queries = track_ids * self.band_width + band_times[np.newaxis, :]
+        # latest animation of the track started at or before the time
+        indices = np.searchsorted(self.band_keys, queries, side="right") - 1
+        before_first = indices < self.track_offsets[:, np.newaxis]
+        indices = np.maximum(indices, self.track_offsets[:, np.newaxis])
+        durations = self.stops[indices] - self.starts[indices]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            progress = np.where(durations > 0, (times - self.starts[indices]) / durations, 1)
+        progress = np.clip(progress, 0, 1)
+        if self.interpolation == "spline":
+            progress = progress * progress * (3 - 2 * progress)  # flat tangents at both keys
+        values = self.values_ini[indices] + (self.values_fin[indices] - self.values_ini[indices]) * progress
+        # before its first animation a track holds the initial value, state changes have not happened yet
+        first_values = self.values_ini[self.track_offsets][:, np.newaxis]
+        values = np.where(before_first, first_values, values)
+        return values
+
+    def evaluate_frames(self, frames, fps=FPS):
+        """returns the values of all tracks at the given frames"""
+        return self.evaluate(np.asarray(frames, dtype=np.float64) / fps)
+
+    def evaluate_track(self, target, desc_id, times):
+        """returns the values of a single track at the given times"""
+        track_id = self.tracks.index((target, desc_id_key(desc_id)))
+        return self.evaluate(times)[track_id]
+
+    def get_value_ranges(self):
+        """returns the minimum and maximum value every track takes"""
+        minima = np.minimum(self.values_ini, self.values_fin)
+        maxima = np.maximum(self.values_ini, self.values_fin)
+        track_minima = np.minimum.reduceat(minima, self.track_offsets) if len(self.tracks) else minima
+        track_maxima = np.maximum.reduceat(maxima, self.track_offsets) if len(self.tracks) else maxima
+        return {track: (track_min, track_max) for track, track_min, track_max in zip(self.tracks, track_minima, track_maxima)}
+
+    def find_out_of_range(self, lower=0, upper=1, tracks=None):
+        """returns the tracks whose values leave the given range e.g. completion parameters leaving [0,1]"""
+        value_ranges = self.get_value_ranges()
+        if tracks is None:
+            tracks = self.tracks
+        return [track for track in tracks if value_ranges[track][0] < lower or value_ranges[track][1] > upper]
+
+    def find_overlaps(self):
+        """returns pairs of animations on the same track where the later one starts before the earlier one stops"""
+        same_track = self.track_ids[1:] == self.track_ids[:-1]
+        overlapping = same_track & (self.starts[1:] < self.stops[:-1])
+        return [(self.tracks[self.track_ids[i]], self.starts[i + 1], self.stops[i]) for i in np.flatnonzero(overlapping)]
+
+    def diff(self, other, times, tolerance=1e-6):
+        """compares the tracks of two evaluators by object name and desc id and returns the maximum deviation per differing track
+        tracks missing in one of the evaluators are reported with a deviation of infinity"""
+        values = dict(zip(self.get_track_names(), self.evaluate(times)))
+        other_values = dict(zip(other.get_track_names(), other.evaluate(times)))
+        deviations = {}
+        for track_name in values.keys() | other_values.keys():
+            if track_name not in values or track_name not in other_values:
+                deviations[track_name] = np.inf
+                continue
+            deviation = np.abs(values[track_name] - other_values[track_name]).max()
+            if deviation > tolerance:
+                deviations[track_name] = deviation
+        return deviations
+
+    def get_track_names(self):
+        """returns a readable identifier per track which is stable between builds"""
+        return [(str(target), desc_id) for target, desc_id in self.tracks]
@@ -0,0 +1,182 @@
+from pydeation.animation.timeline import desc_id_key
+from collections import defaultdict
+
+
+class Interval:
+    """holds the global start and stop time of an executed animation"""
+
+    def __init__(self, start, stop, animation=None, index=0):
+        self.start = start
+        self.stop = stop
+        self.animation = animation
+        self.index = index  # order of execution
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"Interval: {self.start}, {self.stop}, {self.animation}"
+
+    def contains(self, time):
+        return self.start <= time <= self.stop
+
+    def overlaps(self, other):
+        """checks whether two intervals share more than a boundary point
+        state changes have no duration and overlap if they lie strictly inside the other interval"""
+        if self.start == self.stop or other.start == other.stop:
+            return self.start < other.stop and other.start < self.stop or self.start == other.start == self.stop == other.stop
+        return max(self.start, other.start) < min(self.stop, other.stop)
+
+
+class IntervalTree:
+    """a centered interval tree answering stabbing and range queries in logarithmic time plus the number of hits"""
+
+    def __init__(self, intervals):
+        self.size = len(intervals)
+        self.center = None
+        self.left = None
+        self.right = None
+        self.by_start = []  # intervals containing the center sorted by start
+        self.by_stop = []  # intervals containing the center sorted by stop descending
+        if intervals:
+            self.build(intervals)
+
+    def __len__(self):
+        return self.size
+
+    def build(self, intervals):
+        """splits the intervals at the median endpoint into left, center and right"""
+        endpoints = sorted(endpoint for interval in intervals for endpoint in (interval.start, interval.stop))
+        self.center = endpoints[len(endpoints) // 2]
+        left = [interval for interval in intervals if interval.stop < self.center]
+        right = [interval for interval in intervals if interval.start > self.center]
+        centered = [interval for interval in intervals if interval.start <= self.center <= interval.stop]
+        self.by_start = sorted(centered, key=lambda interval: interval.start)
+        self.by_stop = sorted(centered, key=lambda interval: interval.stop, reverse=True)
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def query_point(self, time):
+        """returns the intervals containing the given time"""
+        hits = []
+        node = self
+        while node is not None and node.center is not None:
+            if time < node.center:
+                for interval in node.by_start:
+                    if interval.start > time:
+                        break
+                    hits.append(interval)
+                node = node.left
+            elif time > node.center:
+                for interval in node.by_stop:
+                    if interval.stop < time:
+                        break
+                    hits.append(interval)
+                node = node.right
+            else:
+                hits += node.by_start
+                break
+        return hits
+
+    def query_range(self, start, stop):
+        """returns the intervals intersecting the closed range [start, stop]"""
+        hits = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node is None or node.center is None:
+                continue
+            if stop < node.center:
+                for interval in node.by_start:
+                    if interval.start > stop:
+                        break
+                    hits.append(interval)
+                stack.append(node.left)
+            elif start > node.center:
+                for interval in node.by_stop:
+                    if interval.stop < start:
+                        break
+                    hits.append(interval)
+                stack.append(node.right)
+            else:
+                hits += node.by_start
+                stack += [node.left, node.right]
+        return hits
+
+
+class AnimationIndex:
+    """indexes the executed animations of a scene per track for conflict detection and activity queries"""
+
+    def __init__(self, animations):
+        self.intervals = defaultdict(list)  # track -> intervals
+        self.object_intervals = defaultdict(list)  # target -> intervals of all its tracks
+        for index, animation in enumerate(animations):
+            track = (animation.target, desc_id_key(animation.desc_id))
+            interval = Interval(animation.global_start, animation.global_stop,
+                                animation=animation, index=index)
+            self.intervals[track].append(interval)
+            self.object_intervals[animation.target].append(interval)
+        self.trees = {track: IntervalTree(intervals)
+                      for track, intervals in self.intervals.items()}
+        self.tree = IntervalTree(
+            [interval for intervals in self.intervals.values() for interval in intervals])
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"AnimationIndex: {len(self.trees)} tracks, {len(self.tree)} animations"
+
+    def get_active(self, time):
+        """returns the animations active at the given time"""
+        return [interval.animation for interval in self.tree.query_point(time)]
+
+    def get_active_on_track(self, target, desc_id, time):
+        """returns the animations of a single track active at the given time"""
+        tree = self.trees.get((target, desc_id_key(desc_id)))
+        if tree is None:
+            return []
+        return [interval.animation for interval in tree.query_point(time)]
+
+    def get_active_in_range(self, start, stop):
+        """returns the animations active at any time within the given range"""
+        return [interval.animation for interval in self.tree.query_range(start, stop)]
+
+    def find_conflicts(self):
+        """returns pairs of animations writing the same track over overlapping intervals"""
+        conflicts = []
+        for track, tree in self.trees.items():
+            for interval in self.intervals[track]:
+                for other in tree.query_range(interval.start, interval.stop):
+                    # report every pair once
+                    if other.index <= interval.index or not interval.overlaps(other):
+                        continue
+                    conflicts.append((track, interval.animation, other.animation))
+        return conflicts
+
+    def get_activity_spans(self, target=None):
+        """returns the merged time spans during which an object is animated
+        without a target the spans of all animated objects are returned"""
+        if target is None:
+            return {target: self.get_activity_spans(target) for target in self.object_intervals}
+        intervals = sorted(self.object_intervals.get(target, []),
+                           key=lambda interval: interval.start)
+        spans = []
+        for interval in intervals:
+            if spans and interval.start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], interval.stop)
+            else:
+                spans.append([interval.start, interval.stop])
+        return [tuple(span) for span in spans]
+
+    def get_idle_spans(self, target, start, stop):
+        """returns the time spans within [start, stop] during which the object is not animated"""
+        idle_spans = []
+        time = start
+        for span_start, span_stop in self.get_activity_spans(target):
+            if span_start > time:
+                idle_spans.append((time, min(span_start, stop)))
+            time = max(time, span_stop)
+            if time >= stop:
+                break
+        if time < stop:
+            idle_spans.append((time, stop))
+        return idle_spans
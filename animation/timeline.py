@@ -0,0 +1,320 @@
+from collections import defaultdict
+import hashlib
+import c4d
+
+
+class TimelineKey:
+    """holds the information of a single keyframe before it is written to the document"""
+
+    def __init__(self, target, desc_id, time, value, interpolation=None):
+        self.target = target
+        self.desc_id = desc_id
+        self.time = time  # time in seconds
+        self.value = value
+        self.interpolation = interpolation
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"TimelineKey: {self.target}, {self.time}, {self.value}"
+
+
+class TrackIndex:
+    """caches the animation track and curve per (object, desc id) so every track is only searched once per scene"""
+
+    def __init__(self):
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, target, desc_id):
+        """returns the track and curve for the given target, finding or creating the track on first access"""
+        index_key = (target, desc_id_key(desc_id))
+        entry = self.entries.get(index_key)
+        if entry is None:
+            track = target.obj.FindCTrack(desc_id)
+            if track is None:
+                track = c4d.CTrack(target.obj, desc_id)
+                # insert ctrack into objects timeline
+                target.obj.InsertTrackSorted(track)
+            entry = (track, track.GetCurve())
+            self.entries[index_key] = entry
+        return entry
+
+    def invalidate(self, target=None):
+        """forgets the cached tracks of the given target or of all targets"""
+        if target is None:
+            self.entries = {}
+            return
+        for index_key in [index_key for index_key in self.entries if index_key[0] is target]:
+            del self.entries[index_key]
+
+
+class ParameterState:
+    """shadows the pending value of each (object, descriptor) so animations read and update parameters in python.
+    values are written to the objects when the timeline is compiled or immediately in write through mode.
+    only values set through the state and not yet written are shadowed, all other reads go to the object
+    such that direct writes to the object are never hidden behind a stale value"""
+
+    def __init__(self, write_through=True, capture_initial=False):
+        self.write_through = write_through
+        self.values = {}  # (target, parameter key) -> value not yet written to the object
+        self.dirty = {}  # (target, parameter key) -> descriptor, values not yet written to the object
+        # records the values parameters had before they were first touched, used to reset objects on incremental builds
+        self.initial_values = {} if capture_initial else None  # (target, parameter key) -> (descriptor, value)
+        self.capturing = capture_initial
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, target, descriptor):
+        """returns the logical value of the parameter, pending values take precedence over the object"""
+        parameter, component = split_descriptor(descriptor)
+        state_key = (target, parameter_key(parameter))
+        if state_key in self.values:
+            value = self.values[state_key]
+        else:
+            value = target.obj[parameter]
+        if self.capturing and state_key not in self.initial_values:
+            self.initial_values[state_key] = (parameter, copy_value(value))
+        if component is not None:
+            return value[component - c4d.VECTOR_X]
+        if type(value) is c4d.Vector:
+            return c4d.Vector(value.x, value.y, value.z)  # do not leak the shadowed vector
+        return value
+
+    def set(self, target, descriptor, value, immediate=False):
+        """updates the logical value of the parameter, immediate writes it to the object regardless of the mode"""
+        parameter, component = split_descriptor(descriptor)
+        state_key = (target, parameter_key(parameter))
+        if self.capturing and state_key not in self.initial_values:
+            self.get(target, parameter)  # captures the initial value
+        if component is not None:
+            vector = self.get(target, parameter)
+            setattr(vector, "xyz"[component - c4d.VECTOR_X], value)
+            value = vector
+        elif type(value) is c4d.Vector:
+            value = c4d.Vector(value.x, value.y, value.z)
+        elif type(value) is int and type(self.get(target, parameter)) is float:
+            value = float(value)  # c4d stores ints passed to real parameters as floats
+        if self.write_through or immediate:
+            target.obj[parameter] = value
+            self.values.pop(state_key, None)
+            self.dirty.pop(state_key, None)
+        else:
+            self.values[state_key] = value
+            self.dirty[state_key] = parameter
+
+    def flush(self):
+        """writes all pending values to their objects"""
+        for state_key, parameter in self.dirty.items():
+            target = state_key[0]
+            target.obj[parameter] = self.values[state_key]
+        self.values = {}
+        self.dirty = {}
+
+    def invalidate(self, target=None):
+        """forgets the pending values of the given target or of all targets"""
+        if target is None:
+            self.values = {}
+            self.dirty = {}
+            return
+        for state_key in [state_key for state_key in self.values if state_key[0] is target]:
+            del self.values[state_key]
+            self.dirty.pop(state_key, None)
+
+
+class Timeline:
+    """a timeline collects the keyframes of a scene in memory and writes them to the document in a single compile step.
+    in immediate mode the keyframes are written as soon as they are added which reproduces the classic behaviour"""
+
+    active = None  # the timeline of the scene currently being constructed
+
+    def __init__(self, document=None, deferred=False, prune=True, previous_tracks=None):
+        self.document = document
+        if self.document is None:
+            self.document = c4d.documents.GetActiveDocument()
+        self.deferred = deferred
+        self.prune = prune  # drop keys that do not change their curve on compile
+        self.keys = []
+        self.animations = []  # executed scalar and bool animations
+        self.track_index = TrackIndex()
+        # parameter values are only written back to the objects on compile in deferred mode
+        self.state = ParameterState(write_through=not deferred, capture_initial=previous_tracks is not None)
+        # tracks written by the previous build of an incremental scene, only changed tracks are rewritten
+        self.previous_tracks = previous_tracks
+        self.signatures = {}  # (target, desc id key) -> (desc id, key signature) of the compiled tracks
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"Timeline: {len(self.keys)} keys"
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def activate(self):
+        """makes the timeline accessible to objects and animations of the scene"""
+        Timeline.active = self
+
+    def deactivate(self):
+        """stops objects and animations from routing their parameters through the timeline"""
+        if Timeline.active is self:
+            Timeline.active = None
+
+    def invalidate(self, target):
+        """forgets the cached tracks and parameter values of a target e.g. after it was removed from the document"""
+        self.track_index.invalidate(target)
+        self.state.invalidate(target)
+
+    def add_key(self, target, desc_id, time, value, interpolation=None):
+        """records a keyframe or writes it directly in immediate mode"""
+        if type(time) is c4d.BaseTime:
+            time = time.Get()
+        key = TimelineKey(target, desc_id, time, value,
+                          interpolation=interpolation)
+        if self.deferred:
+            self.keys.append(key)
+        else:
+            self.write_keys(target, desc_id, [key])
+        return key
+
+    def add_animation(self, animation):
+        """records an executed animation for later evaluation and analysis"""
+        self.animations.append(animation)
+
+    def get_tracks(self):
+        """groups the recorded keys per track in order of first appearance"""
+        tracks = defaultdict(list)
+        for key in self.keys:
+            track_id = (key.target, desc_id_key(key.desc_id))
+            tracks[track_id].append(key)
+        return tracks
+
+    def compile(self):
+        """writes all recorded keys to the document grouped per track and sorted by time"""
+        self.state.flush()
+        for track_id, keys in self.get_tracks().items():
+            keys.sort(key=lambda key: key.time)
+            if self.prune:
+                keys = prune_keys(keys)
+            if self.previous_tracks is not None:
+                signature = get_signature(keys)
+                self.signatures[track_id] = (keys[0].desc_id, signature)
+                previous_track = self.previous_tracks.pop(track_id, None)
+                if previous_track is not None and previous_track[1] == signature:
+                    continue  # track is unchanged since the previous build
+                track, curve = self.track_index.get(keys[0].target, keys[0].desc_id)
+                curve.FlushKeys()
+            self.write_keys(keys[0].target, keys[0].desc_id, keys)
+        self.keys = []
+        if self.previous_tracks is not None:
+            self.remove_previous_tracks()
+
+    def remove_previous_tracks(self):
+        """removes the tracks of the previous build which received no keys in this build"""
+        for (target, track_key), (desc_id, signature) in self.previous_tracks.items():
+            track = target.obj.FindCTrack(desc_id)
+            if track is not None:
+                track.Remove()
+            self.track_index.invalidate(target)
+        self.previous_tracks = {}
+
+    def write_keys(self, target, desc_id, keys):
+        """writes a list of keys to the curve of a single track"""
+        track, curve = self.track_index.get(target, desc_id)
+        for key in keys:
+            write_key(curve, key)
+
+    def validate(self):
+        """returns a list of conflicts where a track receives different values at the same time"""
+        conflicts = []
+        for track_id, keys in self.get_tracks().items():
+            values = {}
+            for key in keys:
+                if key.time in values and values[key.time] != key.value:
+                    conflicts.append((track_id, key.time, values[key.time], key.value))
+                values[key.time] = key.value
+        return conflicts
+
+    def get_hash(self):
+        """returns a digest of the recorded keys to compare timelines between builds"""
+        digest = hashlib.sha1()
+        for track_id, keys in self.get_tracks().items():
+            target, desc_id = track_id
+            digest.update(f"{target}{desc_id}".encode())
+            for key in sorted(keys, key=lambda key: key.time):
+                digest.update(f"{key.time}:{key.value}:{key.interpolation}".encode())
+        return digest.hexdigest()
+
+
+def get_signature(keys):
+    """returns a comparable summary of the keys of a track"""
+    return tuple((key.time, key.value, key.interpolation) for key in keys)
+
+
+def copy_value(value):
+    """returns a copy of mutable parameter values"""
+    if type(value) is c4d.Vector:
+        return c4d.Vector(value.x, value.y, value.z)
+    return value
+
+
+def write_key(curve, key):
+    """adds a single timeline key to the given curve"""
+    c4d_key = curve.AddKey(c4d.BaseTime(key.time))["key"]
+    if type(key.value) in (bool, int):  # used for state changing keyframes like visibility
+        c4d_key.SetGeData(curve, key.value)
+    else:  # general case
+        c4d_key.SetValue(curve, key.value)
+    if key.interpolation is not None:
+        c4d_key.SetInterpolation(curve, key.interpolation)
+    return c4d_key
+
+
+def prune_keys(keys):
+    """drops the keys of a time sorted track which do not change the curve:
+    keys holding the same value as both neighbours as well as repeated leading and trailing keys"""
+    pruned_keys = []
+    for i, key in enumerate(keys):
+        previous_key = pruned_keys[-1] if pruned_keys else None
+        next_key = keys[i + 1] if i + 1 < len(keys) else None
+        if previous_key is None and next_key is None:
+            pruned_keys.append(key)  # always keep at least one key
+        elif (previous_key is None or keys_equal(previous_key, key)) and (next_key is None or keys_equal(key, next_key)):
+            continue  # key lies on a flat segment of the curve
+        else:
+            pruned_keys.append(key)
+    return pruned_keys
+
+
+def keys_equal(key, other):
+    """checks whether two keys hold the same value under the same interpolation"""
+    if key.interpolation != other.interpolation:
+        return False
+    if type(key.value) is float or type(other.value) is float:
+        return abs(key.value - other.value) < 1e-9
+    return key.value == other.value
+
+
+def desc_id_key(desc_id):
+    """converts a desc id into a hashable tuple of its levels"""
+    return tuple((desc_id[i].id, desc_id[i].dtype, desc_id[i].creator) for i in range(desc_id.GetDepth()))
+
+
+def split_descriptor(descriptor):
+    """splits a descriptor into the parameter and the optional vector component"""
+    if type(descriptor) is tuple:
+        return descriptor[0], descriptor[1]
+    if type(descriptor) is c4d.DescID and descriptor.GetDepth() == 2 and descriptor[0].id != c4d.ID_USERDATA:
+        return descriptor[0].id, descriptor[1].id
+    return descriptor, None
+
+
+def parameter_key(parameter):
+    """converts an id or desc id into a hashable key"""
+    if type(parameter) is c4d.DescID:
+        return tuple(descriptor_level.id for descriptor_level in (parameter[i] for i in range(parameter.GetDepth())))
+    return (parameter,)
@@ -0,0 +1,263 @@
+import c4d
+import hashlib
+import inspect
+import json
+import os
+import struct
+
+PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__))
+# splines are cached per user outside of the package which may not be writable and is under version control
+USER_CACHE_PATH = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+SPLINE_CACHE_PATH = os.path.join(USER_CACHE_PATH, "pydeation", "splines")
+
+# layout of the spline cache files: magic, version, point count, segment count, has tangents, closed
+SPLINE_HEADER = struct.Struct("<4sHII??")
+SPLINE_MAGIC = b"PDSP"
+SPLINE_VERSION = 1
+
+
+class CachedSceneError(Exception):
+    """raised when the python objects of construct() are requested from a scene loaded from the cache"""
+    pass
+
+
+class SceneCache:
+    """stores built scene documents under a content hash of everything that determines them:
+    the source of the scene class, the pydeation source, the construction arguments and the imported assets"""
+
+    active = None  # the cache collecting the assets of the scene currently being constructed
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.assets = []  # files imported during construction
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"SceneCache: {self.directory}"
+
+    def activate(self):
+        """makes the cache accessible to objects importing assets"""
+        SceneCache.active = self
+
+    def get_key(self, scene):
+        """returns the content hash identifying the scene, None if the scene source is not available"""
+        digest = hashlib.sha1()
+        try:
+            for scene_class in type(scene).__mro__:
+                if scene_class.__module__ in ("builtins", "abc", "pydeation.scene"):
+                    continue  # library classes are covered by the package digest
+                digest.update(inspect.getsource(scene_class).encode())
+        except (OSError, TypeError):
+            return None
+        digest.update(get_package_digest().encode())
+        digest.update(repr(sorted(scene.get_cache_arguments().items())).encode())
+        return digest.hexdigest()
+
+    def get_paths(self, key):
+        """returns the paths of the cached document and its manifest"""
+        return os.path.join(self.directory, key + ".c4d"), os.path.join(self.directory, key + ".json")
+
+    def lookup(self, key):
+        """returns the path of the cached document if it exists and its assets are unchanged"""
+        document_path, manifest_path = self.get_paths(key)
+        if not os.path.exists(document_path) or not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        for asset_path, asset_digest in manifest["assets"].items():
+            if not os.path.exists(asset_path) or get_file_digest(asset_path) != asset_digest:
+                return None
+        return document_path
+
+    def load(self, key):
+        """loads the cached document, returns None on a cache miss"""
+        document_path = self.lookup(key)
+        if document_path is None:
+            return None
+        return c4d.documents.LoadDocument(document_path, c4d.SCENEFILTER_OBJECTS | c4d.SCENEFILTER_MATERIALS, None)
+
+    def store(self, key, document, scene_name=None):
+        """saves the document together with the digests of the assets imported while building it"""
+        os.makedirs(self.directory, exist_ok=True)
+        document_path, manifest_path = self.get_paths(key)
+        if not c4d.documents.SaveDocument(document, document_path, c4d.SAVEDOCUMENTFLAGS_NONE, c4d.FORMAT_C4DEXPORT):
+            return False
+        manifest = {
+            "scene": scene_name,
+            "assets": {asset_path: get_file_digest(asset_path) for asset_path in self.assets if os.path.exists(asset_path)}
+        }
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
+        return True
+
+    def register_asset(self, file_path):
+        """remembers a file imported during construction"""
+        if file_path not in self.assets:
+            self.assets.append(file_path)
+
+
+class SplineCache:
+    """stores the splines imported from files under the digest of the file content in a compact binary format.
+    splines are kept in memory as well such that repeated imports only clone the spline"""
+
+    def __init__(self, directory=SPLINE_CACHE_PATH):
+        self.directory = directory
+        self.splines = {}  # file digest and importer -> spline
+        self.digests = {}  # (file path, modification time, size) -> file digest
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"SplineCache: {self.directory}, {len(self.splines)} splines in memory"
+
+    def get(self, file_path, create, importer="vector_import"):
+        """returns a copy of the spline imported from the file, create(file_path) imports it on a cache miss.
+        splines of different importers are cached separately"""
+        spline = self.find(file_path, importer=importer)
+        if spline is None:
+            spline = create(file_path)
+            self.add(file_path, spline, importer=importer)
+        return spline.GetClone()
+
+    def find(self, file_path, importer="vector_import"):
+        """returns the cached spline of the file from memory or disk, None on a cache miss"""
+        digest = f"{self.get_digest(file_path)}_{importer}"
+        spline = self.splines.get(digest)
+        if spline is None:
+            spline = self.load(digest)
+        if spline is not None:
+            self.splines[digest] = spline
+        return spline
+
+    def add(self, file_path, spline, importer="vector_import"):
+        """caches the spline imported from the file in memory and on disk"""
+        digest = f"{self.get_digest(file_path)}_{importer}"
+        self.store(digest, spline)
+        self.splines[digest] = spline
+
+    def get_missing(self, file_paths, importer="vector_import"):
+        """returns the distinct file paths whose splines are not cached yet"""
+        return [file_path for file_path in dict.fromkeys(file_paths) if self.find(file_path, importer=importer) is None]
+
+    def get_digest(self, file_path):
+        """returns the digest of the file content, only hashing the file again when it was modified"""
+        status = os.stat(file_path)
+        file_key = (file_path, status.st_mtime_ns, status.st_size)
+        if file_key not in self.digests:
+            self.digests[file_key] = get_file_digest(file_path)
+        return self.digests[file_key]
+
+    def get_path(self, digest):
+        return os.path.join(self.directory, digest + ".spline")
+
+    def load(self, digest):
+        """rebuilds the spline from its cache file, returns None on a cache miss or an outdated file"""
+        try:
+            with open(self.get_path(digest), "rb") as spline_file:
+                data = spline_file.read()
+        except OSError:
+            return None
+        try:
+            return decode_spline(data)
+        except (ValueError, struct.error):
+            return None
+
+    def store(self, digest, spline):
+        """writes the spline to its cache file, replacing it atomically"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_path(digest)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "wb") as spline_file:
+            spline_file.write(encode_spline(spline))
+        os.replace(temporary_path, path)
+
+
+def encode_spline(spline):
+    """returns the points, tangents, segments, closed flag and local matrix of the spline as bytes"""
+    points = spline.GetAllPoints()
+    point_count = len(points)
+    has_tangents = spline.GetTangentCount() == point_count
+    segments = [spline.GetSegment(index) for index in range(spline.GetSegmentCount())]
+    matrix = spline.GetMl()
+    values = [coordinate for vector in (matrix.off, matrix.v1, matrix.v2, matrix.v3) for coordinate in (vector.x, vector.y, vector.z)]
+    values += [coordinate for point in points for coordinate in (point.x, point.y, point.z)]
+    if has_tangents:
+        for index in range(point_count):
+            tangent = spline.GetTangent(index)
+            values += [tangent["vl"].x, tangent["vl"].y, tangent["vl"].z, tangent["vr"].x, tangent["vr"].y, tangent["vr"].z]
+    return b"".join([
+        SPLINE_HEADER.pack(SPLINE_MAGIC, SPLINE_VERSION, point_count, len(segments), has_tangents, bool(spline[c4d.SPLINEOBJECT_CLOSED])),
+        struct.pack(f"<{len(values)}d", *values),
+        struct.pack(f"<{len(segments)}I", *[segment["cnt"] for segment in segments]),
+        struct.pack(f"<{len(segments)}?", *[segment["closed"] for segment in segments])
+    ])
+
+
+def decode_spline(data):
+    """creates the spline object from the bytes written by encode_spline"""
+    magic, version, point_count, segment_count, has_tangents, closed = SPLINE_HEADER.unpack_from(data)
+    if magic != SPLINE_MAGIC or version != SPLINE_VERSION:
+        raise ValueError("outdated spline cache file")
+    offset = SPLINE_HEADER.size
+    value_count = 12 + point_count * (9 if has_tangents else 3)
+    values = struct.unpack_from(f"<{value_count}d", data, offset)
+    offset += 8 * value_count
+    counts = struct.unpack_from(f"<{segment_count}I", data, offset)
+    offset += 4 * segment_count
+    closed_flags = struct.unpack_from(f"<{segment_count}?", data, offset)
+    vectors = [c4d.Vector(*values[index:index + 3]) for index in range(0, len(values), 3)]
+    spline = c4d.BaseObject(c4d.Ospline)
+    spline.ResizeObject(point_count, segment_count)
+    spline.SetMl(c4d.Matrix(*vectors[:4]))
+    spline.SetAllPoints(vectors[4:4 + point_count])
+    if has_tangents:
+        tangents = vectors[4 + point_count:]
+        for index in range(point_count):
+            spline.SetTangent(index, tangents[2 * index], tangents[2 * index + 1])
+    for index, (count, segment_closed) in enumerate(zip(counts, closed_flags)):
+        spline.SetSegment(index, count, segment_closed)
+    spline[c4d.SPLINEOBJECT_CLOSED] = closed
+    spline.Message(c4d.MSG_UPDATE)
+    return spline
+
+
+spline_cache = SplineCache()  # shared by all imports of a session
+
+
+def register_asset(file_path):
+    """registers an imported file with the active scene cache if available"""
+    if SceneCache.active is not None:
+        SceneCache.active.register_asset(file_path)
+
+
+def get_file_digest(file_path):
+    """returns the sha1 digest of a file's content"""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(2**16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+package_digests = {}  # (file path, modification time, size) of all sources -> package digest
+
+
+def get_package_digest():
+    """returns a digest of the pydeation sources standing in for the library version,
+    only hashing the sources again when one of them was added, removed or modified"""
+    file_keys = []
+    for directory, directory_names, file_names in os.walk(PACKAGE_PATH):
+        directory_names[:] = sorted(name for name in directory_names if name not in ("__pycache__", "recording", "cache", "tests"))
+        for file_name in sorted(file_names):
+            if file_name.endswith(".py"):
+                file_path = os.path.join(directory, file_name)
+                status = os.stat(file_path)
+                file_keys.append((file_path, status.st_mtime_ns, status.st_size))
+    file_keys = tuple(file_keys)
+    if file_keys not in package_digests:
+        digest = hashlib.sha1()
+        for file_path, modification_time, size in file_keys:
+            digest.update(os.path.relpath(file_path, PACKAGE_PATH).encode())
+            digest.update(get_file_digest(file_path).encode())
+        package_digests.clear()  # only the current sources are of interest
+        package_digests[file_keys] = digest.hexdigest()
+    return package_digests[file_keys]
@@ -46,6 +46,7 @@ OBJECT_DESCID_OUT = c4d.DescID(c4d.DescLevel(40000002, 400007012, 400001000))
 PYTHON_OBJECT_DESCID_IN = c4d.DescID(c4d.DescLevel(4013, 133, 1022471))
 PYTHON_VECTOR_DESCID_OUT = c4d.DescID(c4d.DescLevel(4006, 400007004, 1022471))
 PYTHON_REAL_DESCID_IN = c4d.DescID(c4d.DescLevel(4005, 400007003, 1022471))
+PYTHON_REAL_DESCID_OUT = c4d.DescID(c4d.DescLevel(4005, 400007003, 1022471))
 PYTHON_INTEGER_DESCID_IN = c4d.DescID(c4d.DescLevel(4001, 400007002, 1022471))
 
 # common descIds
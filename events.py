@@ -0,0 +1,61 @@
+import c4d
+
+
+class EventQueue:
+    """routes c4d update events and ui commands of a scene build.
+    in headless mode they are collected and replayed once after the build which avoids redraws on machines without viewport"""
+
+    active = None  # the event queue of the scene currently being constructed
+
+    def __init__(self, headless=False):
+        self.headless = headless
+        self.commands = []  # deferred ui commands in order of first call
+        self.event_pending = False
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"EventQueue: {len(self.commands)} commands, event pending: {self.event_pending}"
+
+    def activate(self):
+        """makes the event queue accessible to objects of the scene"""
+        EventQueue.active = self
+
+    def event_add(self):
+        """updates cinema or marks an update as pending in headless mode"""
+        if self.headless:
+            self.event_pending = True
+        else:
+            c4d.EventAdd()
+
+    def call_command(self, command_id):
+        """calls a ui command or defers it in headless mode, repeated commands are only called once"""
+        if not self.headless:
+            c4d.CallCommand(command_id)
+        elif command_id not in self.commands:
+            self.commands.append(command_id)
+
+    def flush(self):
+        """calls the deferred commands followed by a single update and leaves headless mode"""
+        for command_id in self.commands:
+            c4d.CallCommand(command_id)
+        if self.event_pending or self.commands:
+            c4d.EventAdd()
+        self.commands = []
+        self.event_pending = False
+        self.headless = False
+
+
+def event_add():
+    """updates cinema through the active event queue if available"""
+    if EventQueue.active is None:
+        c4d.EventAdd()
+    else:
+        EventQueue.active.event_add()
+
+
+def call_command(command_id):
+    """calls a ui command through the active event queue if available"""
+    if EventQueue.active is None:
+        c4d.CallCommand(command_id)
+    else:
+        EventQueue.active.call_command(command_id)
@@ -27,6 +27,18 @@ def rreload(module):
 # first we reload the sublibraries to update the changes
 import sys
 import importlib
+import pydeation.cache
+import pydeation.events
+import pydeation.incremental
+import pydeation.animation.timeline
+import pydeation.svg
+import pydeation.spline_geometry
+import pydeation.xpresso.formula
+import pydeation.xpresso.graph
+import pydeation.xpresso.passes
+import pydeation.tags
+import pydeation.animation.animation
+import pydeation.objects.abstract_objects
 import pydeation.scene
 import pydeation.utils
 import pydeation.objects.helper_objects
@@ -48,6 +60,19 @@ if pydeation_path not in sys.path:
     print("add path")
     sys.path.insert(0, pydeation_path)
 
+# modules holding the state shared during construction are reloaded before the modules reading it
+reload(pydeation.cache)
+reload(pydeation.events)
+reload(pydeation.incremental)
+reload(pydeation.animation.timeline)
+reload(pydeation.svg)
+reload(pydeation.spline_geometry)
+reload(pydeation.xpresso.formula)
+reload(pydeation.xpresso.graph)
+reload(pydeation.xpresso.passes)
+reload(pydeation.tags)
+reload(pydeation.animation.animation)
+reload(pydeation.objects.abstract_objects)
 reload(pydeation.scene)
 reload(pydeation.utils)
 reload(pydeation.objects.helper_objects)
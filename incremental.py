@@ -0,0 +1,161 @@
+from abc import ABCMeta
+from collections import Counter
+import functools
+import hashlib
+import inspect
+import c4d
+
+# scene name -> build plan of the last incremental build, kept across script runs and reloads of this module
+previous_builds = globals().get("previous_builds", {})
+
+
+class BuildPlan:
+    """holds the outcome of an incremental build: the objects per stable identity, the written keys per track
+    and the values the animated parameters had before they were first touched"""
+
+    def __init__(self, document=None):
+        self.document = document
+        self.objects = {}  # identity -> object, in construction order
+        self.tracks = {}  # (target, desc id key) -> (desc id, key signature)
+        self.initial_values = {}  # (target, parameter key) -> (parameter, value)
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"BuildPlan: {len(self.objects)} objects, {len(self.tracks)} tracks"
+
+    def restore_initial_values(self):
+        """resets all parameters touched by the previous build to their values before animation"""
+        for (target, state_key), (parameter, value) in self.initial_values.items():
+            target.obj[parameter] = value
+
+
+class IncrementalBuild:
+    """diffs the objects constructed by a scene against the previous build of the same scene and reuses unchanged ones.
+    an object is identified by its class, its construction arguments and its occurrence among identical constructions.
+    objects created inside the construction of another object belong to it and are not identified separately"""
+
+    active = None  # the build of the scene currently being constructed
+
+    def __init__(self, previous=None):
+        self.previous = previous
+        self.plan = BuildPlan()
+        self.depth = 0  # nesting of object constructions
+        self.occurrences = Counter()
+        self.created = []
+        self.reused = []
+        self.removed = []
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"IncrementalBuild: {len(self.created)} created, {len(self.reused)} reused, {len(self.removed)} removed"
+
+    def activate(self):
+        """makes the build accessible to the object constructions"""
+        IncrementalBuild.active = self
+
+    def get_identity(self, cls, args, kwargs):
+        """returns the stable identity of a top level object construction"""
+        construction = (get_class_key(cls), get_argument_key(args), get_argument_key(kwargs))
+        occurrence = self.occurrences[construction]
+        self.occurrences[construction] += 1
+        return hashlib.sha1(repr(construction + (occurrence,)).encode()).hexdigest()
+
+    def construct(self, cls, args, kwargs, create):
+        """returns the object of the previous build with the same identity or creates a new one"""
+        if self.depth > 0:
+            return create()
+        identity = self.get_identity(cls, args, kwargs)
+        instance = None
+        if self.previous is not None:
+            instance = self.previous.objects.pop(identity, None)
+        if instance is not None:
+            self.reused.append(instance)
+        else:
+            self.depth += 1
+            self.set_capturing(False)  # values set while constructing are part of the object not of the animation
+            try:
+                instance = create()
+            finally:
+                self.depth -= 1
+                self.set_capturing(True)
+            self.created.append(instance)
+        instance.build_identity = identity
+        self.plan.objects[identity] = instance
+        return instance
+
+    def set_capturing(self, capturing):
+        """toggles the recording of initial parameter values on the active timeline"""
+        from pydeation.animation.timeline import Timeline
+        if Timeline.active is not None and Timeline.active.state.initial_values is not None:
+            Timeline.active.state.capturing = capturing
+
+    def get_previous_tracks(self):
+        """returns a copy of the tracks written by the previous build"""
+        if self.previous is None:
+            return {}
+        return dict(self.previous.tracks)
+
+    def finish(self, document, timeline):
+        """removes the objects of the previous build that were not constructed again and stores the plan for the next run"""
+        if self.previous is not None:
+            for instance in self.previous.objects.values():
+                instance.remove()
+                self.removed.append(instance)
+            # keep the initial values of reused targets whose parameters were not touched again
+            for state_key, value in self.previous.initial_values.items():
+                if state_key[0].obj.GetDocument() is not None:
+                    self.plan.initial_values.setdefault(state_key, value)
+        self.plan.document = document
+        self.plan.tracks = timeline.signatures
+        self.plan.initial_values.update(timeline.state.initial_values)
+        IncrementalBuild.active = None
+        return self.plan
+
+
+class IncrementalMeta(ABCMeta):
+    """routes object constructions through the active incremental build"""
+
+    def __call__(cls, *args, **kwargs):
+        if IncrementalBuild.active is None:
+            return super().__call__(*args, **kwargs)
+        return IncrementalBuild.active.construct(cls, args, kwargs, lambda: super(IncrementalMeta, cls).__call__(*args, **kwargs))
+
+
+def get_previous_build(scene_name, document):
+    """returns the plan of the previous build of the scene if its document is still the active one"""
+    previous = previous_builds.get(scene_name)
+    if previous is None or previous.document is not document:
+        return None
+    return previous
+
+
+def store_build(scene_name, plan):
+    """remembers the plan for the next run of the scene"""
+    previous_builds[scene_name] = plan
+
+
+@functools.lru_cache(maxsize=None)
+def get_class_key(cls):
+    """returns the name and source digest of a class such that edited classes are constructed again,
+    the source of all base classes is included as edits to a base class change the objects as well"""
+    digest = hashlib.sha1()
+    for base_class in cls.__mro__:
+        if base_class.__module__ in ("builtins", "abc"):
+            continue  # library classes do not change between builds
+        try:
+            source = inspect.getsource(base_class)
+        except (OSError, TypeError):
+            source = ""
+        digest.update(source.encode())
+    return (cls.__module__, cls.__qualname__, digest.hexdigest())
+
+
+def get_argument_key(value):
+    """converts construction arguments into a comparable key, objects are represented by their identity"""
+    if hasattr(value, "build_identity"):
+        return ("object", value.build_identity)
+    if type(value) in (list, tuple):
+        return tuple(get_argument_key(item) for item in value)
+    if type(value) is dict:
+        return tuple((key, get_argument_key(item)) for key, item in sorted(value.items()))
+    return repr(value)
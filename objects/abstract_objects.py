@@ -5,15 +5,28 @@ from pydeation.materials import FillMaterial, SketchMaterial
 from pydeation.tags import FillTag, SketchTag, XPressoTag, AlignToSplineTag
 from pydeation.constants import WHITE, SCALE_X, SCALE_Y, SCALE_Z
 from pydeation.animation.animation import VectorAnimation, ScalarAnimation, ColorAnimation
+from pydeation.animation.timeline import Timeline
+from pydeation.events import event_add
+from pydeation.incremental import IncrementalMeta
 from pydeation.xpresso.userdata import *
 from pydeation.xpresso.xpressions import XRelation, XIdentity, XSplineLength, XBoundingBox, XAction, Movement
+from pydeation.xpresso.passes import sort_graph_xpressions
+from pydeation.utils import SplineMetrics
 import pydeation.objects.effect_objects as effect_objects
 from abc import ABC, abstractmethod
 import c4d.utils
 import c4d
 
+# attributes of visible objects which are only created on first access
+VISIBILITY_ATTRIBUTES = ("visibility_parameter", "visibility_u_group")
+LIVE_BOUNDING_BOX_PARAMETER_NAMES = ("width_parameter", "height_parameter", "depth_parameter", "center_parameter",
+                                     "center_x_parameter", "center_y_parameter", "center_z_parameter")
+LIVE_BOUNDING_BOX_ATTRIBUTES = LIVE_BOUNDING_BOX_PARAMETER_NAMES + ("live_bounding_box_parameters", "live_bounding_box_u_group")
 
-class ProtoObject(ABC):
+
+class ProtoObject(ABC, metaclass=IncrementalMeta):
+
+    spline_metrics = None  # lengths of the spline measured on first access
 
     def __init__(self, name=None, x=0, y=0, z=0, h=0, p=0, b=0, scale=1, position=None, rotation=None, plane="xy"):
         self.document = c4d.documents.GetActiveDocument()  # get document
@@ -103,15 +116,29 @@ class ProtoObject(ABC):
         """specifies the relations between the part's parameters using xpresso"""
         pass
 
+    def get_parameter(self, descriptor):
+        """returns the logical value of a parameter using the shadow state of the active timeline if available"""
+        if Timeline.active is None:
+            return self.obj[descriptor]
+        return Timeline.active.state.get(self, descriptor)
+
+    def set_parameter(self, descriptor, value, immediate=False):
+        """sets the logical value of a parameter using the shadow state of the active timeline if available
+        immediate writes the value to the object right away e.g. for static transformations"""
+        if Timeline.active is None:
+            self.obj[descriptor] = value
+        else:
+            Timeline.active.state.set(self, descriptor, value, immediate=immediate)
+
     def set_position(self, x=0, y=0, z=0, position=None, relative=False):
         if position is None:
             position = c4d.Vector(x, y, z)
         elif type(position) is not c4d.Vector:
             position = c4d.Vector(*position)
         if relative:
-            self.obj[c4d.ID_BASEOBJECT_POSITION] += position
+            self.set_parameter(c4d.ID_BASEOBJECT_POSITION, self.get_parameter(c4d.ID_BASEOBJECT_POSITION) + position, immediate=True)
         else:
-            self.obj[c4d.ID_BASEOBJECT_POSITION] = position
+            self.set_parameter(c4d.ID_BASEOBJECT_POSITION, position, immediate=True)
 
     def set_rotation(self, h=0, p=0, b=0, rotation=None, relative=False):
         if rotation is None:
@@ -119,24 +146,24 @@ class ProtoObject(ABC):
         elif type(rotation) is not c4d.Vector:
             rotation = c4d.Vector(*rotation)
         if relative:
-            self.obj[c4d.ID_BASEOBJECT_ROTATION] += rotation
+            self.set_parameter(c4d.ID_BASEOBJECT_ROTATION, self.get_parameter(c4d.ID_BASEOBJECT_ROTATION) + rotation, immediate=True)
         else:
-            self.obj[c4d.ID_BASEOBJECT_ROTATION] = rotation
+            self.set_parameter(c4d.ID_BASEOBJECT_ROTATION, rotation, immediate=True)
 
     def set_frozen_rotation(self, h=0, p=0, b=0, rotation=None, relative=False):
         if rotation is None:
             rotation = c4d.Vector(h, p, b)
         if relative:
-            self.obj[c4d.ID_BASEOBJECT_FROZEN_ROTATION] += rotation
+            self.set_parameter(c4d.ID_BASEOBJECT_FROZEN_ROTATION, self.get_parameter(c4d.ID_BASEOBJECT_FROZEN_ROTATION) + rotation, immediate=True)
         else:
-            self.obj[c4d.ID_BASEOBJECT_FROZEN_ROTATION] = rotation
+            self.set_parameter(c4d.ID_BASEOBJECT_FROZEN_ROTATION, rotation, immediate=True)
 
     def set_scale(self, scale=1, relative=False):
         if relative:
-            self.obj[c4d.ID_BASEOBJECT_SCALE] *= scale
+            self.set_parameter(c4d.ID_BASEOBJECT_SCALE, self.get_parameter(c4d.ID_BASEOBJECT_SCALE) * scale, immediate=True)
         else:
             scale = c4d.Vector(scale, scale, scale)
-            self.obj[c4d.ID_BASEOBJECT_SCALE] = scale
+            self.set_parameter(c4d.ID_BASEOBJECT_SCALE, scale, immediate=True)
 
     def move(self, x=0, y=0, z=0, position=None, relative=True):
         if position is None:
@@ -147,9 +174,9 @@ class ProtoObject(ABC):
         animation = VectorAnimation(
             target=self, descriptor=descriptor, vector=position, relative=relative)
         if relative:
-            self.obj[descriptor] += position
+            self.set_parameter(descriptor, self.get_parameter(descriptor) + position)
         else:
-            self.obj[descriptor] = position
+            self.set_parameter(descriptor, position)
         return animation
 
     def rotate(self, h=0, p=0, b=0, rotation=None):
@@ -160,7 +187,7 @@ class ProtoObject(ABC):
         descriptor = c4d.ID_BASEOBJECT_ROTATION
         animation = VectorAnimation(
             target=self, descriptor=descriptor, vector=rotation, relative=True)
-        self.obj[descriptor] += rotation
+        self.set_parameter(descriptor, self.get_parameter(descriptor) + rotation)
         return animation
 
     def scale(self, x=0, y=0, z=0, scale=None):
@@ -173,71 +200,54 @@ class ProtoObject(ABC):
         descriptor = c4d.ID_BASEOBJECT_SCALE
         animation = VectorAnimation(
             target=self, descriptor=descriptor, vector=scale, relative=True, multiplicative=True)
-        self.obj[descriptor] += scale
+        self.set_parameter(descriptor, self.get_parameter(descriptor) + scale)
         return animation
 
     def insert_to_document(self):
         self.document.InsertObject(self.obj)
 
+    def remove(self):
+        """removes the object from the document and forgets its cached animation tracks"""
+        self.obj.Remove()
+        if Timeline.active is not None:
+            Timeline.active.invalidate(self)
+
+    def get_spline_metrics(self):
+        """returns the lengths of the spline, measured again only once the spline changed"""
+        if self.spline_metrics is None or not self.spline_metrics.is_valid(self.obj):
+            self.spline_metrics = SplineMetrics(self.obj)
+        return self.spline_metrics
+
+    def get_spline_geometry(self):
+        """returns the spline as geometry of the numpy spline kernel for sampling and nearest point queries"""
+        return self.get_spline_metrics().get_geometry()
+
     def get_segment_count(self):
-        # returns the length of the spline or a specific segment
-        spline_help = c4d.utils.SplineHelp()
-        spline_help.InitSplineWith(self.obj)
-        segment_count = spline_help.GetSegmentCount()
-        return segment_count
+        # returns the number of segments of the spline
+        return self.get_spline_metrics().segment_count
 
     def get_length(self, segment=None):
         # returns the length of the spline or a specific segment
-        spline_help = c4d.utils.SplineHelp()
-        spline_help.InitSplineWith(self.obj)
-
-        if segment:
-            segment_length = spline_help.GetSegmentLength(segment)
-            return segment_length
+        spline_metrics = self.get_spline_metrics()
+        if segment is not None:
+            return spline_metrics.segment_lengths[segment]
         else:
-            spline_length = spline_help.GetSplineLength()
-            return spline_length
+            return spline_metrics.length
 
     def get_spline_segment_lengths(self):
         # get the length of each segment
-        segment_lengths = []
-        for i in range(self.get_segment_count()):
-            segment_lengths.append(self.get_length(segment=i))
-        return segment_lengths
+        return list(self.get_spline_metrics().segment_lengths)
 
     def set_object_properties(self):
         """used to set the unique properties of a specific object"""
         pass
 
     def sort_relations_by_priority(self):
-        """sorts the relations by priority"""
-
-        # right now it oly ensures that the actions are inserted above the relations
-        # in the future we will implement priority and sorting by sub-xpression dependencies
-
-        # get node master
-        master = self.custom_tag.obj.GetNodeMaster()
-        parent = master.GetRoot()
-
-        """
-        # resort by parent reference
-        for relation in self.relations:
-            if relation.parent:
-                self.relations.remove(relation)
-                parent_idx = self.relations.index(relation.parent)
-                self.relations.insert(parent_idx, relation)
-        for action in self.actions:
-            if action.parent:
-                self.actions.remove(action)
-                parent_idx = self.actions.index(action.parent)
-                self.actions.insert(parent_idx, action)
-        """
-        if self.relations:
-            for relation in self.relations:
-                master.InsertFirst(parent, relation.obj)
-        if self.actions:
-            for action in self.actions:
-                master.InsertFirst(parent, action.obj)
+        """sorts the xpressions of the custom tag such that each one is evaluated after the ones it depends on"""
+        graph = self.custom_tag.graph
+        # recorded graphs are sorted by the graph registry once all their xpressions are known
+        if graph.materialized:
+            sort_graph_xpressions(graph)
 
 
 class VisibleObject(ProtoObject):
@@ -247,13 +257,55 @@ class VisibleObject(ProtoObject):
         super().__init__(**kwargs)
         self.creation = creation
         self.visible = visible
+        self.visibility_heirs = []  # (part, desc id) whose visibility follows the one of the object
+        if not visible:
+            self.create_visibility()  # hidden objects need the relation right away
+        self.add_bounding_box_information()
+
+    def __getattr__(self, name):
+        """creates the visibility and the live bounding box on first access of their parameters,
+        most objects never use them"""
+        if name in VISIBILITY_ATTRIBUTES and "visibility_parameter" not in self.__dict__:
+            self.create_visibility()
+            return getattr(self, name)
+        if name in LIVE_BOUNDING_BOX_ATTRIBUTES and "live_bounding_box_parameters" not in self.__dict__:
+            self.create_live_bounding_box()
+            return getattr(self, name)
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+    def has_visibility(self):
+        """returns whether the visibility parameter was created"""
+        return "visibility_parameter" in self.__dict__
+
+    def create_visibility(self):
+        """creates the visibility parameter, its relation and the inheritance to the heirs"""
         self.specify_visibility_parameter()
         self.insert_visibility_parameter()
         self.specify_visibility_relation()
+        for part, desc_id in self.visibility_heirs:
+            self.specify_visibility_inheritance(part, desc_id=desc_id)
+
+    def create_live_bounding_box(self):
+        """creates the live bounding box parameters and their relation"""
         self.specify_live_bounding_box_parameters()
         self.insert_live_bounding_box_parameters()
         self.specify_live_bounding_box_relation()
-        self.add_bounding_box_information()
+
+    def pass_on_visibility(self, part, desc_id=None):
+        """lets the visibility of the part or the given parameter of it follow the visibility of the object.
+        the relation is created once the visibility of either of them is used"""
+        self.visibility_heirs.append((part, desc_id))
+        if self.has_visibility():
+            self.specify_visibility_inheritance(part, desc_id=desc_id)
+        elif desc_id is None and part.has_visibility():
+            self.create_visibility()
+
+    def specify_visibility_inheritance(self, part, desc_id=None):
+        """links the visibility of the part to the visibility of the object"""
+        if desc_id is None:
+            desc_id = part.visibility_parameter.desc_id
+        visibility_relation = XIdentity(
+            part=part, whole=self, desc_ids=[desc_id], parameter=self.visibility_parameter, name="VisibilityInheritance")
 
     def specify_action_parameters(self):
         pass
@@ -330,21 +382,22 @@ class VisibleObject(ProtoObject):
                                         parameters=[self.visibility_parameter], formula=f"1-{self.visibility_parameter.name}")
 
     def specify_live_bounding_box_parameters(self):
-        """specifies bounding box parameters"""
-        self.width_parameter = ULength(name="Width")
-        self.height_parameter = ULength(name="Height")
-        self.depth_parameter = ULength(name="Depth")
-        self.center_parameter = UVector(name="Center")
-        self.center_x_parameter = ULength(name="CenterX")
-        self.center_y_parameter = ULength(name="CenterY")
-        self.center_z_parameter = ULength(name="CenterZ")
-        self.live_bounding_box_parameters = [self.width_parameter,
-                                             self.height_parameter,
-                                             self.depth_parameter,
-                                             self.center_parameter,
-                                             self.center_x_parameter,
-                                             self.center_y_parameter,
-                                             self.center_z_parameter]
+        """specifies bounding box parameters, attributes of the same name specified by subclasses are kept
+        e.g. the width of a node, the live parameter is then only reachable through get_live_bounding_box_parameters()"""
+        self.live_bounding_box_parameters = [ULength(name="Width"),
+                                             ULength(name="Height"),
+                                             ULength(name="Depth"),
+                                             UVector(name="Center"),
+                                             ULength(name="CenterX"),
+                                             ULength(name="CenterY"),
+                                             ULength(name="CenterZ")]
+        for name, parameter in self.get_live_bounding_box_parameters().items():
+            if name not in self.__dict__:
+                setattr(self, name, parameter)
+
+    def get_live_bounding_box_parameters(self):
+        """returns the live bounding box parameters per attribute name"""
+        return dict(zip(LIVE_BOUNDING_BOX_PARAMETER_NAMES, self.live_bounding_box_parameters))
 
     def insert_live_bounding_box_parameters(self):
         """inserts the bounding box parameters as userdata"""
@@ -353,9 +406,7 @@ class VisibleObject(ProtoObject):
 
     def specify_live_bounding_box_relation(self):
         """feed bounding box information into parameters"""
-        live_bounding_box_relation = XBoundingBox(self, target=self, width_parameter=self.width_parameter, height_parameter=self.height_parameter,
-                                                  depth_parameter=self.depth_parameter, center_parameter=self.center_parameter,
-                                                  center_x_parameter=self.center_x_parameter, center_y_parameter=self.center_y_parameter, center_z_parameter=self.center_z_parameter)
+        live_bounding_box_relation = XBoundingBox(self, target=self, **self.get_live_bounding_box_parameters())
 
     def add_bounding_box_information(self):
         bounding_box_center, bounding_radius = c4d.utils.GetBBox(
@@ -390,7 +441,7 @@ class VisibleObject(ProtoObject):
         desc_id = self.creation_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def un_create(self, completion=0):
@@ -398,7 +449,7 @@ class VisibleObject(ProtoObject):
         desc_id = self.creation_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def align_to_spline(self, spline=None):
@@ -421,7 +472,7 @@ class VisibleObject(ProtoObject):
         self.obj.SetAbsPos(self.obj.GetAbsPos() + vec)
         self.obj.SetAllPoints(points)
         self.obj.Message(c4d.MSG_UPDATE)
-        c4d.EventAdd()
+        event_add()
 
 
 class CustomObject(VisibleObject):
@@ -489,12 +540,9 @@ class CustomObject(VisibleObject):
 
     def specify_visibility_inheritance_relations(self):
         """inherits visibility to parts"""
-        visibility_relations = []
         for part in self.parts:
-            if hasattr(part, "visibility_parameter") and not isinstance(part, effect_objects.Morpher):
-                visibility_relation = XIdentity(
-                    part=part, whole=self, desc_ids=[part.visibility_parameter.desc_id], parameter=self.visibility_parameter, name="VisibilityInheritance")
-                visibility_relations.append(visibility_relation)
+            if hasattr(part, "has_visibility") and not isinstance(part, effect_objects.Morpher):
+                self.pass_on_visibility(part)
 
     def specify_bounding_box_parameters(self):
         """specifies bounding box parameters"""
@@ -677,7 +725,7 @@ class LineObject(VisibleObject):
         desc_id = self.draw_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def un_draw(self, completion=0):
@@ -685,7 +733,7 @@ class LineObject(VisibleObject):
         desc_id = self.draw_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def fade_in(self, completion=1):
@@ -693,7 +741,7 @@ class LineObject(VisibleObject):
         desc_id = self.opacity_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def fade_out(self, completion=0):
@@ -701,7 +749,7 @@ class LineObject(VisibleObject):
         desc_id = self.opacity_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def change_color(self, color):
@@ -709,7 +757,7 @@ class LineObject(VisibleObject):
         desc_id = self.color_parameter.desc_id
         animation = ColorAnimation(
             target=self, descriptor=desc_id, vector=color)
-        self.obj[desc_id] = color
+        self.set_parameter(desc_id, color)
         return animation
 
 
@@ -797,7 +845,7 @@ class SolidObject(VisibleObject):
         desc_id = self.fill_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def un_fill(self, completion=0):
@@ -805,7 +853,7 @@ class SolidObject(VisibleObject):
         desc_id = self.fill_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def sketch_parameter_setup(self):
@@ -854,7 +902,7 @@ class SolidObject(VisibleObject):
         desc_id = self.draw_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def un_draw(self, completion=0):
@@ -862,7 +910,7 @@ class SolidObject(VisibleObject):
         desc_id = self.draw_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def glow(self, completion=1):
@@ -870,7 +918,7 @@ class SolidObject(VisibleObject):
         desc_id = self.glow_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def un_glow(self, completion=0):
@@ -878,5 +926,5 @@ class SolidObject(VisibleObject):
         desc_id = self.glow_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
@@ -81,7 +81,7 @@ class TwoDCamera(CustomObject):
         desc_id = self.frame_width_parameter.desc_id
         move_animation = self.move(x=center[0], y=center[1])
         zoom_animation = ScalarAnimation(target=self, descriptor=desc_id, value_fin=self.frame_width)
-        self.obj[desc_id] = self.frame_width
+        self.set_parameter(desc_id, self.frame_width)
         animation = AnimationGroup(move_animation, zoom_animation)
         return animation
 
@@ -90,7 +90,7 @@ class TwoDCamera(CustomObject):
             frame_width = self.frame_width
         desc_id = self.frame_width_parameter.desc_id
         animation = ScalarAnimation(target=self, descriptor=desc_id, value_fin=frame_width, **kwargs)
-        self.obj[desc_id] = frame_width
+        self.set_parameter(desc_id, frame_width)
         return animation
 
 
@@ -175,9 +175,9 @@ class ThreeDCamera(CustomObject):
         desc_ids = [self.focus_point_x_parameter.desc_id, self.focus_point_y_parameter.desc_id, self.focus_point_z_parameter.desc_id]
         values = [x, y, z]
         animation = VectorAnimation(target=self, descriptor=desc_ids, vector=values, **kwargs)
-        self.obj[desc_ids[0]] = x
-        self.obj[desc_ids[1]] = y
-        self.obj[desc_ids[2]] = z
+        self.set_parameter(desc_ids[0], x)
+        self.set_parameter(desc_ids[1], y)
+        self.set_parameter(desc_ids[2], z)
         return animation
 
     def zoom(self, frame_width=None, **kwargs):
@@ -185,7 +185,7 @@ class ThreeDCamera(CustomObject):
             frame_width = self.frame_width
         desc_id = self.frame_width_parameter.desc_id
         animation = ScalarAnimation(target=self, descriptor=desc_id, value_fin=frame_width, **kwargs)
-        self.obj[desc_id] = frame_width
+        self.set_parameter(desc_id, frame_width)
         return animation
 
     def move_orbit(self, phi=None, theta=None, radius=None, tilt=None, direction=None, **kwargs):
@@ -220,10 +220,10 @@ class ThreeDCamera(CustomObject):
         desc_ids = [self.phi_parameter.desc_id, self.theta_parameter.desc_id, self.radius_parameter.desc_id, self.tilt_parameter.desc_id]
         values = [phi, theta, radius, tilt]
         animation = VectorAnimation(target=self, descriptor=desc_ids, vector=values, **kwargs)
-        self.obj[desc_ids[0]] = phi
-        self.obj[desc_ids[1]] = theta
-        self.obj[desc_ids[2]] = radius
-        self.obj[desc_ids[3]] = tilt
+        self.set_parameter(desc_ids[0], phi)
+        self.set_parameter(desc_ids[1], theta)
+        self.set_parameter(desc_ids[2], radius)
+        self.set_parameter(desc_ids[3], tilt)
         return animation
 
     def look_at(self, target, zoom=True, border=0.2):
@@ -1,13 +1,14 @@
 from pydeation.objects.abstract_objects import CustomObject
 import pydeation.objects.effect_objects as effect_objects
 from pydeation.objects.solid_objects import Extrude, Cylinder, SweepNurbs
-from pydeation.objects.line_objects import Helix, Arc, Circle, Rectangle, SplineText, Spline, PySpline, EdgeSpline, SplineSymmetry, VisibleMoSpline, Triangle
+from pydeation.objects.line_objects import Helix, Arc, Circle, Rectangle, SplineText, Spline, PySpline, EdgeSpline, SplineSymmetry, VisibleMoSpline, Triangle, SplineMask
 from pydeation.objects.sketch_objects import Human, Fire, Footprint, GitHub, RightEye, Wave
 from pydeation.objects.helper_objects import *
 from pydeation.objects.light_objects import Light
 from pydeation.xpresso.userdata import *
 from pydeation.xpresso.xpressions import *
 from pydeation.animation.animation import ScalarAnimation
+from pydeation.utils import get_spline_geometry
 from pydeation.constants import *
 import random
 import c4d
@@ -50,13 +51,13 @@ class Group(CustomObject):
         return self.children.sort(key=key)
 
     def position_on_spline(self, spline):
-        """positions the children the given spline"""
+        """positions the children evenly spaced by arc length along the given spline"""
         number_of_children = len(self.children)
-        editable_spline = spline.get_editable()
-        for i, child in enumerate(self.children):
-            child_position = editable_spline.GetSplinePoint(
-                i / number_of_children)
-            child.set_position(position=child_position)
+        geometry = get_spline_geometry(spline.get_editable())
+        child_positions, tangents = geometry.evaluate(
+            np.arange(number_of_children) / number_of_children)
+        for child, child_position in zip(self.children, child_positions):
+            child.set_position(position=c4d.Vector(*child_position))
 
     def position_on_circle(self, radius=100, x=0, y=0, z=0, plane="xy", at_bottom=None, at_top=None):
         """positions the children on a circle"""
@@ -134,9 +135,7 @@ class Director(CustomObject):
 
     def specify_live_bounding_box_relation(self):
         """the bounding box of the director takes all targeted actors into account"""
-        live_bounding_box_relation = XBoundingBox(*self.actors, target=self, width_parameter=self.width_parameter, height_parameter=self.height_parameter,
-                                                  depth_parameter=self.depth_parameter, center_parameter=self.center_parameter,
-                                                  center_x_parameter=self.center_x_parameter, center_y_parameter=self.center_y_parameter, center_z_parameter=self.center_z_parameter)
+        live_bounding_box_relation = XBoundingBox(*self.actors, target=self, **self.get_live_bounding_box_parameters())
 
     def specify_parts(self):
         if self.mode == "domino":
@@ -938,7 +937,7 @@ class Text(CustomObject):
         self.spline_letters_hierarchy = self.spline_text.get_editable()
         # undo seperation to later safe it as hidden spline for utility (e.g.morphing)
         self.spline_text.obj[c4d.PRIM_TEXT_SEPARATE] = False
-        self.spline_text.obj.Remove()
+        self.spline_text.remove()
         self.spline_letters = []
         for spline_letter in self.spline_letters_hierarchy.GetChildren():
             self.spline_letters.append(spline_letter)
@@ -1099,7 +1098,7 @@ class SolidSpline(CustomObject):
         desc_id = self.glow_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def unglow(self, completion=0):
@@ -1107,7 +1106,7 @@ class SolidSpline(CustomObject):
         desc_id = self.glow_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class CloneConnector(CustomObject):
@@ -1160,8 +1159,8 @@ class P2PMembrane(CustomObject):
         if self.peer_symbol is None:
             self.peer_symbol = Circle(radius=5, color=self.peer_color, plane="xz", name="PeerSymbol")
         step_size = self.unified_membrane.get_length() / self.peer_count
-        self.peers_left = Cloner(clones=[self.peer_symbol], target_object=self.dynamic_membrane.destination_splines[0], step_size=step_size, name="PeersLeft")
-        self.peers_right = Cloner(clones=[self.peer_symbol], target_object=self.dynamic_membrane.destination_splines[1], use_instance=True, step_size=step_size, name="PeersRight")
+        self.peers_left = Cloner(clones=[self.peer_symbol], target_object=self.dynamic_membrane.mosplines[0], spline_step_size=step_size, name="PeersLeft")
+        self.peers_right = Cloner(clones=[self.peer_symbol], target_object=self.dynamic_membrane.mosplines[-1], use_instance=True, spline_step_size=step_size, name="PeersRight")
         self.edges = CloneConnector(self.peers_left, self.peers_right, neighbour_count=self.edge_count, color=self.edge_color, max_distance=300, name="Edges")
         self.parts += [self.unified_membrane, self.split_membrane, self.dynamic_membrane, self.peer_symbol, self.peers_left, self.peers_right, self.edges]
     
@@ -1194,12 +1193,12 @@ class P2PMembrane(CustomObject):
         morph_inheritance = XIdentity(part=self.dynamic_membrane, whole=self, desc_ids=[self.dynamic_membrane.morph_completion_parameter.desc_id],
                                                 parameter=self.morph_parameter)
         dynamic_membrane_length_left_inheritance = XIdentity(part=self, whole=self.dynamic_membrane, desc_ids=[self.dynamic_membrane_length_left_parameter.desc_id],
-                                                parameter=self.dynamic_membrane.destination_splines[0].spline_length_parameter)
-        dynamic_membrane_length_right_inheritance = XIdentity(part=self, whole=self.dynamic_membrane, desc_ids=[self.dynamic_membrane.destination_splines[1].spline_length_parameter.desc_id],
-                                                parameter=self.dynamic_membrane.destination_splines[1].spline_length_parameter)
-        peers_left_step_size_relation = XRelation(part=self.peers_left, whole=self, desc_ids=[self.peers_left.desc_ids["step_size"]],
+                                                parameter=self.dynamic_membrane.mosplines[0].spline_length_parameter)
+        dynamic_membrane_length_right_inheritance = XIdentity(part=self, whole=self.dynamic_membrane, desc_ids=[self.dynamic_membrane_length_right_parameter.desc_id],
+                                                parameter=self.dynamic_membrane.mosplines[-1].spline_length_parameter)
+        peers_left_step_size_relation = XRelation(part=self.peers_left, whole=self, desc_ids=[self.peers_left.desc_ids["spline_step_size"]],
                                                 parameters=[self.peer_count_parameter, self.dynamic_membrane_length_left_parameter], formula=f"{self.dynamic_membrane_length_left_parameter.name}/{self.peer_count_parameter.name}")
-        peers_right_step_size_relation = XRelation(part=self.peers_right, whole=self, desc_ids=[self.peers_right.desc_ids["step_size"]],
+        peers_right_step_size_relation = XRelation(part=self.peers_right, whole=self, desc_ids=[self.peers_right.desc_ids["spline_step_size"]],
                                                 parameters=[self.peer_count_parameter, self.dynamic_membrane_length_right_parameter], formula=f"{self.dynamic_membrane_length_right_parameter.name}/{self.peer_count_parameter.name}")
         edge_count_inheritance = XIdentity(priority=5, part=self.edges, whole=self, desc_ids=[self.edges.neighbour_count_parameter.desc_id],
                                                 parameter=self.edge_count_parameter)
@@ -1228,7 +1227,7 @@ class P2PMembrane(CustomObject):
         desc_id = self.split_membrane_action_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
         
 class FissionChain(CustomObject):
@@ -1271,7 +1270,7 @@ class FissionChain(CustomObject):
         desc_id = self.fission_action_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class AangEyes(CustomObject):
@@ -1378,7 +1377,7 @@ class Trinity(CustomObject):
         desc_id = self.fold_action_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class UpwardSpiral(CustomObject):
@@ -148,7 +148,7 @@ class Dicer(ActionObject):
         desc_id = self.effect_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
     def implode(self, completion=0):
@@ -156,7 +156,7 @@ class Dicer(ActionObject):
         desc_id = self.effect_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class Breather(ActionObject):
@@ -215,7 +215,7 @@ class Breather(ActionObject):
         desc_id = self.effect_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class Segment:
@@ -525,7 +525,7 @@ class Spherifier(ActionObject):
         desc_id = self.effect_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class Wrapper(ActionObject):
@@ -588,7 +588,7 @@ class Wrapper(ActionObject):
         desc_id = self.effect_parameter.desc_id
         animation = ScalarAnimation(
             target=self, descriptor=desc_id, value_fin=completion)
-        self.obj[desc_id] = completion
+        self.set_parameter(desc_id, completion)
         return animation
 
 class Pulser(ActionObject):
@@ -4,7 +4,8 @@ importlib.reload(pydeation.objects.abstract_objects)
 from pydeation.objects.abstract_objects import LineObject
 from pydeation.objects.helper_objects import Null, MoSpline
 from pydeation.constants import *
-from pydeation.xpresso.xpressions import XIdentity
+from pydeation.cache import register_asset, spline_cache
+from pydeation.svg import parse_svg_file
 import c4d
 import os
 
@@ -130,8 +131,9 @@ class Spline(LineObject):
 
 class SVG(Spline):  # takes care of importing svgs
 
-    def __init__(self, file_name, x=0, y=0, z=0, **kwargs):
+    def __init__(self, file_name, x=0, y=0, z=0, native=False, **kwargs):
         self.file_name = file_name
+        self.native = native  # parses the svg in python instead of using the vector import
         self.x = x
         self.y = y
         self.z = z
@@ -140,19 +142,22 @@ class SVG(Spline):  # takes care of importing svgs
         self.fix_axes()
 
     def extract_spline_from_vector_import(self):
-        file_path = os.path.join(SVG_PATH, self.file_name + ".svg")
-        vector_import = c4d.BaseObject(1057899)
+        file_path = get_svg_path(self.file_name)
+        register_asset(file_path)
         self.document = c4d.documents.GetActiveDocument()
-        self.document.InsertObject(vector_import)
-        vector_import[c4d.ART_FILE] = file_path
-        self.document.ExecutePasses(
-            bt=None, animation=False, expressions=False, caches=True, flags=c4d.BUILDFLAGS_NONE)
-        vector_import.Remove()
-        cache = vector_import.GetCache()
-        cache = cache.GetDown()
-        cache = cache.GetDown()
-        cache = cache.GetDownLast()
-        self.spline = cache.GetClone()
+        # the spline of each file is only imported once and then restored from the spline cache
+        if self.native:
+            self.spline = spline_cache.get(file_path, self.parse_spline, importer="native")
+        else:
+            self.spline = spline_cache.get(file_path, self.import_spline)
+
+    def parse_spline(self, file_path):
+        """parses the svg without a document pass and returns its spline"""
+        return create_spline_object(parse_svg_file(file_path))
+
+    def import_spline(self, file_path):
+        """imports the svg using a vector import object and returns its spline"""
+        return import_splines([file_path])[0]
 
     def fix_axes(self):
         self.document.SetSelection(self.obj)  # select svg
@@ -197,8 +202,7 @@ class EdgeSpline(LineObject):
 
     def fix_visibility_behaviour(self):
         """we link the visibility of the object to the sketch tag spline type fix the visibility behaviour"""
-        visibility_relation = XIdentity(
-            part=self.sketch_tag, whole=self, desc_ids=[self.sketch_tag.desc_ids["render_splines"]], parameter=self.visibility_parameter, name="VisibilityInheritance")
+        self.pass_on_visibility(self.sketch_tag, desc_id=self.sketch_tag.desc_ids["render_splines"])
 
 class PySpline(LineObject):
     """turns a c4d spline into a pydeation spline"""
@@ -288,9 +292,8 @@ class SplineMask(LineObject):
 
     def specify_relations(self):
         for input_spline in self.input_splines:
-            if hasattr(input_spline, "visibility_parameter"):
-                visibility_relation = XIdentity(
-                        part=input_spline, whole=self, desc_ids=[input_spline.visibility_parameter.desc_id], parameter=self.visibility_parameter, name="VisibilityInheritance")
+            if hasattr(input_spline, "has_visibility"):
+                self.pass_on_visibility(input_spline)
 
 class VisibleMoSpline(LineObject):
     """creates a visible MoSpline"""
@@ -417,3 +420,61 @@ class Triangle(NSide):
     def set_unique_desc_ids(self):
         super().set_unique_desc_ids()
         # Add DescID for the orientation and rotation if necessary for animation purposes.
+
+
+def create_spline_object(spline_data):
+    """creates a bezier spline object from the arrays of spline data"""
+    spline = c4d.BaseObject(c4d.Ospline)
+    spline.ResizeObject(len(spline_data), len(spline_data.segment_counts))
+    spline.SetAllPoints([c4d.Vector(*point) for point in spline_data.points.tolist()])
+    for index, (tangent_left, tangent_right) in enumerate(zip(spline_data.tangents_left.tolist(), spline_data.tangents_right.tolist())):
+        spline.SetTangent(index, c4d.Vector(*tangent_left), c4d.Vector(*tangent_right))
+    for index, (count, closed) in enumerate(zip(spline_data.segment_counts.tolist(), spline_data.segment_closed.tolist())):
+        spline.SetSegment(index, count, closed)
+    spline.Message(c4d.MSG_UPDATE)
+    return spline
+
+
+def get_svg_path(file_name):
+    return os.path.join(SVG_PATH, file_name + ".svg")
+
+
+def import_splines(file_paths):
+    """imports the svg files using one vector import object each and evaluates their caches in a single pass.
+    the imports are evaluated in a temporary document such that the pass does not depend on the size of the scene"""
+    document = c4d.documents.BaseDocument()
+    vector_imports = []
+    for file_path in file_paths:
+        vector_import = c4d.BaseObject(1057899)
+        document.InsertObject(vector_import)
+        vector_import[c4d.ART_FILE] = file_path
+        vector_imports.append(vector_import)
+    document.ExecutePasses(
+        bt=None, animation=False, expressions=False, caches=True, flags=c4d.BUILDFLAGS_NONE)
+    splines = []
+    for vector_import in vector_imports:
+        cache = vector_import.GetCache()
+        cache = cache.GetDown()
+        cache = cache.GetDown()
+        cache = cache.GetDownLast()
+        splines.append(cache.GetClone())
+        vector_import.Remove()
+    return splines
+
+
+def preload_svgs(*file_names, native=False):
+    """imports all svgs missing from the spline cache at once, svgs constructed afterwards only clone their cached spline.
+    scenes using many different sketches call this at the top of construct to avoid one document pass per svg"""
+    file_paths = [get_svg_path(file_name) for file_name in file_names]
+    for file_path in file_paths:
+        register_asset(file_path)
+    importer = "native" if native else "vector_import"
+    missing_paths = spline_cache.get_missing(file_paths, importer=importer)
+    if not missing_paths:
+        return
+    if native:
+        splines = [create_spline_object(parse_svg_file(file_path)) for file_path in missing_paths]
+    else:
+        splines = import_splines(missing_paths)
+    for file_path, spline in zip(missing_paths, splines):
+        spline_cache.add(file_path, spline, importer=importer)
@@ -12,8 +12,9 @@ import c4d
 class Sketch(CustomObject):
     """gives useful additional parameters to SVG objects"""
 
-    def __init__(self, file_name, rel_x=0, rel_y=0, rel_z=0, rel_rot=0, plane="xy", on_floor=False, color=WHITE, diameter=100, filled=False, fill_color=None, **kwargs):
+    def __init__(self, file_name, rel_x=0, rel_y=0, rel_z=0, rel_rot=0, plane="xy", on_floor=False, color=WHITE, diameter=100, filled=False, fill_color=None, native=False, **kwargs):
         self.file_name = file_name
+        self.native = native
         self.plane = plane
         self.rel_x = rel_x
         self.rel_y = rel_y
@@ -41,7 +42,7 @@ class Sketch(CustomObject):
             self.move(y=height / 2)
 
     def specify_parts(self):
-        self.svg = SVG(self.file_name, color=self.color, filled=self.filled, fill_color=self.fill_color)
+        self.svg = SVG(self.file_name, color=self.color, filled=self.filled, fill_color=self.fill_color, native=self.native)
         if self.filled:
             self.membrane = self.svg.membrane
             self.membrane.obj.InsertUnder(self.obj)
@@ -1,4 +1,5 @@
 from pydeation.objects.abstract_objects import SolidObject
+from pydeation.cache import register_asset
 import c4d
 
 
@@ -208,6 +209,7 @@ class USD(SolidObject):
 
     def extract_object_from_import(self):
         self.document = c4d.documents.GetActiveDocument()
+        register_asset(self.file_path)
         c4d.documents.MergeDocument(self.document, self.file_path, c4d.SCENEFILTER_NONE)
         # remove superfluous material null
         material_null = self.document.SearchObject("Materials")
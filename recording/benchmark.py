@@ -0,0 +1,106 @@
+"""
+this file holds the build benchmark which constructs representative scenes using the c4d stand-in
+run it from the directory containing the pydeation package:
+
+    python -m pydeation.recording.benchmark
+"""
+
+from pydeation.recording.recorder import install, recorder
+install()
+from pydeation.scene import TwoDScene
+from pydeation.objects.custom_objects import Text, P2PMembrane
+from pydeation.objects.effect_objects import Dicer
+from pydeation.objects.line_objects import Circle, Spline
+from pydeation.animation.abstract_animators import Create, Move
+import c4d
+import time
+import sys
+
+
+class TextScene(TwoDScene):
+    """builds a text of 200 letters"""
+
+    def construct(self):
+        text = Text("pydeation " * 20)
+        self.play(Create(text))
+
+
+class DicerScene(TwoDScene):
+    """slices a spline using the dicer"""
+
+    def construct(self):
+        spline = Spline(points=[(-100, -100, 0), (100, -100, 0), (100, 100, 0), (-100, 100, 0)])
+        dicer = Dicer(spline, grid_size=10)
+
+
+class P2PMembraneScene(TwoDScene):
+    """builds a peer to peer membrane"""
+
+    def construct(self):
+        membrane = P2PMembrane()
+
+
+class MoveScene(TwoDScene):
+    """plays many consecutive move animations"""
+
+    def construct(self):
+        circle = Circle()
+        for i in range(500):
+            self.play(Move(circle, x=1), run_time=1/10)
+
+
+SCENES = [TextScene, DicerScene, P2PMembraneScene, MoveScene]
+
+
+class BenchmarkResult:
+    """holds the measurements of a single scene build"""
+
+    def __init__(self, scene_class):
+        self.name = scene_class.__name__
+        self.objects = 0
+        self.xpresso_nodes = 0
+        self.keyframes = 0
+        self.calls = 0
+        self.wall_time = 0
+        self.error = None
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        if self.error is not None:
+            return f"{self.name:<20} failed: {self.error}"
+        return (f"{self.name:<20} {self.objects:>8} {self.xpresso_nodes:>8} {self.keyframes:>8} "
+                f"{self.calls:>10} {self.wall_time:>9.3f}s")
+
+
+def run_scene(scene_class, deferred=False):
+    """builds a single scene and returns its measurements"""
+    result = BenchmarkResult(scene_class)
+    recorder.reset()
+    start = time.perf_counter()
+    try:
+        scene = scene_class(deferred=deferred)
+    except Exception as error:
+        result.error = f"{error.__class__.__name__}: {error}"
+        return result
+    result.wall_time = time.perf_counter() - start
+    result.objects = len(list(scene.document.iterate_objects()))
+    result.xpresso_nodes = recorder.count("GvNode()")
+    result.keyframes = recorder.count("CKey()")
+    result.calls = sum(recorder.calls.values())
+    return result
+
+
+def run_benchmark(scenes=SCENES, deferred=False):
+    """builds all scenes and prints a report"""
+    print(f"{'scene':<20} {'objects':>8} {'nodes':>8} {'keys':>8} {'calls':>10} {'time':>10}")
+    results = []
+    for scene_class in scenes:
+        result = run_scene(scene_class, deferred=deferred)
+        print(result)
+        results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    sys.exit(1 if any(result.error is not None for result in results) else 0)
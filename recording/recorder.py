@@ -0,0 +1,73 @@
+"""
+this file holds the recorder of the in-memory stand-in for the c4d module
+the stand-in lives in recording/stubs and makes it possible to build scenes outside of cinema 4d:
+
+    from pydeation.recording.recorder import install, recorder
+    install()
+    from pydeation.scene import TwoDScene
+"""
+
+from collections import Counter
+import functools
+import os
+import sys
+
+STUBS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs")
+
+
+class Recorder:
+    """counts every call made into the c4d stand-in"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"Recorder: {sum(self.calls.values())} calls"
+
+    def record(self, name):
+        """records a single call"""
+        self.calls[name] += 1
+
+    def reset(self):
+        """forgets all recorded calls"""
+        self.calls = Counter()
+
+    def count(self, *names):
+        """returns the summed call count of the given names"""
+        return sum(self.calls[name] for name in names)
+
+    def get_summary(self, prefix=""):
+        """returns the recorded calls starting with the prefix sorted by frequency"""
+        return [(name, count) for name, count in self.calls.most_common() if name.startswith(prefix)]
+
+
+recorder = Recorder()
+
+
+def recorded(cls):
+    """class decorator which records every call of the public methods of a stand-in class"""
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attribute) or isinstance(attribute, (type, staticmethod, classmethod)):
+            continue
+        setattr(cls, name, record_calls(attribute, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def record_calls(function, name):
+    """wraps a function such that its calls are recorded under the given name"""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        recorder.record(name)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def install():
+    """makes the stand-in importable as c4d, has no effect inside cinema 4d"""
+    if "c4d" in sys.modules:
+        return sys.modules["c4d"]
+    if STUBS_PATH not in sys.path:
+        sys.path.insert(0, STUBS_PATH)
+    import c4d
+    return c4d
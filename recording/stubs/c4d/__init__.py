@@ -0,0 +1,901 @@
+"""
+in-memory stand-in for the parts of the c4d module used by pydeation
+every public method call is counted by pydeation.recording.recorder.recorder
+unknown constants resolve to stable integers derived from their name
+"""
+
+import copy
+import math
+import zlib
+from pydeation.recording.recorder import recorder, recorded
+
+# constants whose actual values matter for the library
+CONSTANTS = {
+    # data types
+    "DTYPE_NONE": 0,
+    "DTYPE_GROUP": 1,
+    "DTYPE_COLOR": 3,
+    "DTYPE_SUBCONTAINER": 5,
+    "DTYPE_LONG": 15,
+    "DTYPE_REAL": 19,
+    "DTYPE_TIME": 22,
+    "DTYPE_VECTOR": 23,
+    "DTYPE_MATRIX": 25,
+    "DTYPE_STRING": 130,
+    "DTYPE_FILENAME": 131,
+    "DTYPE_BASELISTLINK": 133,
+    "DTYPE_BOOL": 400006001,
+    # vector components
+    "VECTOR_X": 1000,
+    "VECTOR_Y": 1001,
+    "VECTOR_Z": 1002,
+    "COLOR_R": 1000,
+    "COLOR_G": 1001,
+    "COLOR_B": 1002,
+    # description ids
+    "ID_USERDATA": 700,
+    "ID_BASEOBJECT_POSITION": 903,
+    "ID_BASEOBJECT_ROTATION": 904,
+    "ID_BASEOBJECT_SCALE": 905,
+    "ID_BASEOBJECT_FROZEN_POSITION": 1100,
+    "ID_BASEOBJECT_FROZEN_ROTATION": 1101,
+    "ID_BASEOBJECT_FROZEN_SCALE": 1102,
+    "ID_BASEOBJECT_REL_POSITION": 903,
+    "ID_BASEOBJECT_REL_ROTATION": 904,
+    "ID_BASEOBJECT_REL_SCALE": 905,
+    # object types
+    "Onull": 5140,
+    "Ospline": 5101,
+    "Olight": 5102,
+    "Ocamera": 5103,
+    "Oloft": 5107,
+    "Oextrude": 5116,
+    "Osweep": 5118,
+    "Ometaball": 5125,
+    "Ocube": 5159,
+    "Osphere": 5160,
+    "Ocone": 5162,
+    "Oplane": 5168,
+    "Ocylinder": 5170,
+    "Osplinetext": 5178,
+    "Osplinenside": 5179,
+    "Osplinecircle": 5181,
+    "Osplinearc": 5182,
+    "Osplinehelix": 5185,
+    "Osplinerectangle": 5186,
+    # tag and material types
+    "Texpresso": 1001149,
+    "Ttexture": 5616,
+    "Mmaterial": 5703,
+    # ports
+    "GV_PORT_INPUT": 1,
+    "GV_PORT_OUTPUT": 2,
+    # commands
+    "MCOMMAND_MAKEEDITABLE": 12236,
+}
+
+# parameters holding vectors by default
+VECTOR_PARAMETERS = {903, 904, 905, 1100, 1101, 1102}
+
+
+def __getattr__(name):
+    """resolves unknown constants to stable integers"""
+    if name.startswith("_") or name.islower():  # leaves submodules to the import system
+        raise AttributeError(name)
+    value = CONSTANTS.get(name, zlib.crc32(name.encode()) % 2**30 + 2**30)
+    globals()[name] = value
+    return value
+
+
+for _name, _value in CONSTANTS.items():
+    globals()[_name] = _value
+
+
+class Vector:
+
+    def __init__(self, x=0.0, y=None, z=None):
+        if y is None and z is None:
+            y = z = x  # c4d.Vector(a) fills all components
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __repr__(self):
+        return f"Vector({self.x}, {self.y}, {self.z})"
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyz"[index], float(value))
+
+    def __eq__(self, other):
+        return isinstance(other, Vector) and tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __add__(self, other):
+        if isinstance(other, Vector):
+            return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+        return Vector(self.x + other, self.y + other, self.z + other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Vector):
+            return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+        return Vector(self.x - other, self.y - other, self.z - other)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        return Vector(-self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, Vector):  # dot product as in c4d
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        if isinstance(other, Matrix):
+            return other * self
+        return Vector(self.x * other, self.y * other, self.z * other)
+
+    def __rmul__(self, other):
+        return Vector(self.x * other, self.y * other, self.z * other)
+
+    def __truediv__(self, other):
+        return Vector(self.x / other, self.y / other, self.z / other)
+
+    def __xor__(self, other):  # cross product as in c4d
+        return Vector(self.y * other.z - self.z * other.y,
+                      self.z * other.x - self.x * other.z,
+                      self.x * other.y - self.y * other.x)
+
+    def GetLength(self):
+        return math.sqrt(self * self)
+
+    def GetLengthSquared(self):
+        return self * self
+
+    def GetNormalized(self):
+        length = self.GetLength()
+        return self / length if length else Vector()
+
+    def Normalize(self):
+        normalized = self.GetNormalized()
+        self.x, self.y, self.z = normalized.x, normalized.y, normalized.z
+
+
+class Matrix:
+
+    def __init__(self, off=None, v1=None, v2=None, v3=None):
+        self.off = off if off is not None else Vector(0, 0, 0)
+        self.v1 = v1 if v1 is not None else Vector(1, 0, 0)
+        self.v2 = v2 if v2 is not None else Vector(0, 1, 0)
+        self.v3 = v3 if v3 is not None else Vector(0, 0, 1)
+
+    def __repr__(self):
+        return f"Matrix({self.off}, {self.v1}, {self.v2}, {self.v3})"
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            return Matrix(self * other.off, self.rotate(other.v1), self.rotate(other.v2), self.rotate(other.v3))
+        return self.off + self.rotate(other)
+
+    def __invert__(self):
+        # inverse of the 3x3 part assuming an orthogonal basis
+        columns = [self.v1, self.v2, self.v3]
+        scales = [column * column or 1.0 for column in columns]
+        rows = [Vector(*(column[i] / scale for column, scale in zip(columns, scales))) for i in range(3)]
+        inverse = Matrix(Vector(), rows[0], rows[1], rows[2])
+        inverse.off = -inverse.rotate(self.off)
+        return inverse
+
+    def rotate(self, vector):
+        return self.v1 * vector.x + self.v2 * vector.y + self.v3 * vector.z
+
+
+@recorded
+class BaseTime:
+
+    def __init__(self, time=0.0, fps=None):
+        if fps is not None:  # BaseTime(frame, fps)
+            time = time / fps
+        self.time = float(time)
+
+    def __repr__(self):
+        return f"BaseTime({self.time})"
+
+    def _seconds(self, other):
+        return other.time if isinstance(other, BaseTime) else float(other)
+
+    def __add__(self, other):
+        return BaseTime(self.time + self._seconds(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return BaseTime(self.time - self._seconds(other))
+
+    def __eq__(self, other):
+        return isinstance(other, (BaseTime, int, float)) and abs(self.time - self._seconds(other)) < 1e-9
+
+    def __lt__(self, other):
+        return self.time < self._seconds(other)
+
+    def __le__(self, other):
+        return self.time <= self._seconds(other)
+
+    def __gt__(self, other):
+        return self.time > self._seconds(other)
+
+    def __ge__(self, other):
+        return self.time >= self._seconds(other)
+
+    def __hash__(self):
+        return hash(round(self.time, 9))
+
+    def Get(self):
+        return self.time
+
+    def GetFrame(self, fps):
+        return int(round(self.time * fps))
+
+
+class DescLevel:
+
+    def __init__(self, id, dtype=0, creator=0):
+        self.id = id
+        self.dtype = dtype
+        self.creator = creator
+
+    def __repr__(self):
+        return f"DescLevel({self.id}, {self.dtype}, {self.creator})"
+
+    def __eq__(self, other):
+        return isinstance(other, DescLevel) and self.id == other.id
+
+
+class DescID:
+
+    def __init__(self, *levels):
+        self.levels = [level if isinstance(level, DescLevel) else DescLevel(level) for level in levels]
+
+    def __repr__(self):
+        return f"DescID({', '.join(str(level.id) for level in self.levels)})"
+
+    def __getitem__(self, index):
+        return self.levels[index]
+
+    def __eq__(self, other):
+        return isinstance(other, DescID) and self.get_ids() == other.get_ids()
+
+    def __hash__(self):
+        return hash(self.get_ids())
+
+    def GetDepth(self):
+        return len(self.levels)
+
+    def get_ids(self):
+        return tuple(level.id for level in self.levels)
+
+
+class BaseContainer:
+
+    def __init__(self, id=0):
+        self.id = id
+        self.data = {}
+
+    def __getitem__(self, key):
+        return self.data.get(key)
+
+    def __setitem__(self, key, value):
+        self.data[key] = value
+
+    def __iter__(self):
+        return iter(self.data.items())
+
+    def __len__(self):
+        return len(self.data)
+
+    def GetId(self):
+        return self.id
+
+    def SetId(self, id):
+        self.id = id
+
+    def GetData(self, key):
+        return self.data.get(key)
+
+    def SetData(self, key, value):
+        self.data[key] = value
+
+
+class GenericData:
+    """holds arbitrary custom data types like field lists or spline data"""
+
+    def __init__(self, *args, **kwargs):
+        recorder.record(f"{self.__class__.__name__}()")
+        self.entries = []
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            recorder.record(f"{self.__class__.__name__}.{name}")
+            if name.startswith(("Insert", "Add")):
+                self.entries.append(args)
+        return method
+
+
+class FieldList(GenericData):
+    pass
+
+
+class InExcludeData(GenericData):
+
+    def GetObjectCount(self):
+        return len(self.entries)
+
+
+class PriorityData(GenericData):
+    pass
+
+
+class SplineData(GenericData):
+
+    def GetKnots(self):
+        recorder.record("SplineData.GetKnots")
+        return [{"vPos": Vector(0, 0, 0), "lFlagsSettings": 0}, {"vPos": Vector(1, 1, 0), "lFlagsSettings": 0}]
+
+
+def GetCustomDataTypeDefault(dtype):
+    """returns a description container for userdata of the given type"""
+    recorder.record("GetCustomDataTypeDefault")
+    bc = BaseContainer(dtype)
+    bc.dtype = dtype
+    return bc
+
+
+def default_value(dtype):
+    """returns the value an unset parameter of the given type holds"""
+    if dtype in (CONSTANTS["DTYPE_VECTOR"], CONSTANTS["DTYPE_COLOR"]):
+        return Vector(0, 0, 0)
+    if dtype == CONSTANTS["DTYPE_BOOL"]:
+        return False
+    if dtype == CONSTANTS["DTYPE_LONG"]:
+        return 0
+    if dtype in (CONSTANTS["DTYPE_STRING"], CONSTANTS["DTYPE_FILENAME"]):
+        return ""
+    if dtype in (CONSTANTS["DTYPE_REAL"], CONSTANTS["DTYPE_TIME"]):
+        return 0.0
+    return None
+
+
+def coerce_value(value, dtype):
+    """converts a value to the type of the parameter as c4d does on assignment"""
+    if dtype in (CONSTANTS["DTYPE_REAL"], CONSTANTS["DTYPE_TIME"]) and isinstance(value, (int, float)):
+        return float(value)
+    if dtype == CONSTANTS["DTYPE_LONG"] and isinstance(value, (int, float)):
+        return int(value)
+    if dtype == CONSTANTS["DTYPE_BOOL"] and isinstance(value, (int, float)):
+        return bool(value)
+    return value
+
+
+def parameter_key(key):
+    """converts ints, tuples and desc ids into a tuple of ids"""
+    if isinstance(key, DescID):
+        return key.get_ids()
+    if isinstance(key, tuple):
+        return tuple(key)
+    return (key,)
+
+
+@recorded
+class BaseList2D:
+
+    def __init__(self, type_id=0):
+        recorder.record(f"{self.__class__.__name__}()")
+        self.type_id = type_id
+        self.name = ""
+        self.parameters = {}
+        self.userdata = {}  # userdata id -> description container
+        self.tracks = []
+        self.document = None
+        self.dirty = 0  # counts the changes of parameters, points and segments regardless of the dirty flags
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name})"
+
+    def __getitem__(self, key):
+        recorder.record("BaseList2D.__getitem__")
+        key = parameter_key(key)
+        if key in self.parameters:
+            return self.parameters[key]
+        if key[0] == CONSTANTS["ID_USERDATA"]:
+            bc = self.userdata.get(key[1])
+            return default_value(getattr(bc, "dtype", None))
+        if len(key) > 1:  # vector component
+            return self.__getitem__(key[0])[key[1] - CONSTANTS["VECTOR_X"]]
+        if key[0] in VECTOR_PARAMETERS:
+            return Vector(1, 1, 1) if key[0] == CONSTANTS["ID_BASEOBJECT_SCALE"] else Vector(0, 0, 0)
+        return 0.0
+
+    def __setitem__(self, key, value):
+        recorder.record("BaseList2D.__setitem__")
+        self.dirty += 1
+        key = parameter_key(key)
+        if len(key) > 1 and key[0] != CONSTANTS["ID_USERDATA"]:  # vector component
+            vector = copy.copy(self.__getitem__(key[0]))
+            vector[key[1] - CONSTANTS["VECTOR_X"]] = value
+            self.parameters[key[:1]] = vector
+            return
+        if isinstance(value, Vector):
+            value = copy.copy(value)
+        elif key[0] == CONSTANTS["ID_USERDATA"] and len(key) > 1:
+            value = coerce_value(value, getattr(self.userdata.get(key[1]), "dtype", None))
+        self.parameters[key] = value
+
+    def GetType(self):
+        return self.type_id
+
+    def GetDirty(self, flags):
+        return self.dirty
+
+    def SetDirty(self, flags):
+        self.dirty += 1
+
+    def CheckType(self, type_id):
+        return self.type_id == type_id
+
+    def GetName(self):
+        return self.name
+
+    def SetName(self, name):
+        self.name = name
+
+    def GetDocument(self):
+        return self.document
+
+    def IsAlive(self):
+        return True
+
+    def Message(self, message_id, data=None):
+        return True
+
+    def AddUserData(self, bc):
+        userdata_id = len(self.userdata) + 1
+        self.userdata[userdata_id] = bc
+        return DescID(DescLevel(CONSTANTS["ID_USERDATA"], CONSTANTS["DTYPE_SUBCONTAINER"], 0),
+                      DescLevel(userdata_id, getattr(bc, "dtype", 0), 0))
+
+    def GetUserDataContainer(self):
+        return [(DescID(DescLevel(CONSTANTS["ID_USERDATA"]), DescLevel(userdata_id)), bc)
+                for userdata_id, bc in self.userdata.items()]
+
+    def GetCTracks(self):
+        return list(self.tracks)
+
+    def FindCTrack(self, desc_id):
+        for track in self.tracks:
+            if track.desc_id == desc_id:
+                return track
+        return None
+
+    def InsertTrackSorted(self, track):
+        self.tracks.append(track)
+        track.target = self
+
+
+@recorded
+class BaseObject(BaseList2D):
+
+    def __new__(cls, type_id=0):
+        if cls is BaseObject and type_id == CONSTANTS["Ospline"]:
+            return super().__new__(SplineObject)
+        return super().__new__(cls)
+
+    def __init__(self, type_id=0):
+        super().__init__(type_id)
+        self.parent = None
+        self.children = []
+        self.tags = []
+        self.cache = None
+
+    def GetUp(self):
+        return self.parent
+
+    def GetDown(self):
+        return self.children[0] if self.children else None
+
+    def GetDownLast(self):
+        return self.children[-1] if self.children else None
+
+    def GetChildren(self):
+        return list(self.children)
+
+    def get_siblings(self):
+        if self.parent is not None:
+            return self.parent.children
+        if self.document is not None:
+            return self.document.objects
+        return [self]
+
+    def GetNext(self):
+        siblings = self.get_siblings()
+        index = siblings.index(self)
+        return siblings[index + 1] if index + 1 < len(siblings) else None
+
+    def GetPred(self):
+        siblings = self.get_siblings()
+        index = siblings.index(self)
+        return siblings[index - 1] if index > 0 else None
+
+    def Remove(self):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+        elif self.document is not None and self in self.document.objects:
+            self.document.objects.remove(self)
+        self.parent = None
+        self.set_document(None)
+
+    def InsertUnder(self, parent):
+        self.Remove()
+        parent.children.insert(0, self)
+        self.parent = parent
+        self.set_document(parent.document)
+
+    def InsertUnderLast(self, parent):
+        self.Remove()
+        parent.children.append(self)
+        self.parent = parent
+        self.set_document(parent.document)
+
+    def set_document(self, document):
+        self.document = document
+        for child in self.children:
+            child.set_document(document)
+
+    def GetClone(self, flags=0):
+        clone = copy.copy(self)
+        clone.parameters = copy.deepcopy(self.parameters)
+        clone.userdata = dict(self.userdata)
+        clone.tracks = []
+        clone.tags = []
+        clone.parent = None
+        clone.document = None
+        clone.children = []
+        for child in self.children:
+            child_clone = child.GetClone(flags)
+            child_clone.parent = clone
+            clone.children.append(child_clone)
+        recorder.record(f"{self.__class__.__name__}()")
+        return clone
+
+    def InsertTag(self, tag, pred=None):
+        self.tags.append(tag)
+        tag.host = self
+        tag.document = self.document
+
+    def GetTags(self):
+        return list(self.tags)
+
+    def GetTag(self, type_id):
+        for tag in self.tags:
+            if tag.type_id == type_id:
+                return tag
+        return None
+
+    def GetCache(self):
+        return self.cache
+
+    def GetDeformCache(self):
+        return None
+
+    def GetMl(self):
+        position = self[CONSTANTS["ID_BASEOBJECT_POSITION"]]
+        scale = self[CONSTANTS["ID_BASEOBJECT_SCALE"]]
+        # rotation is not evaluated by the stand-in
+        return Matrix(position, Vector(scale.x, 0, 0), Vector(0, scale.y, 0), Vector(0, 0, scale.z))
+
+    def GetMg(self):
+        if self.parent is None:
+            return self.GetMl()
+        return self.parent.GetMg() * self.GetMl()
+
+    def SetMg(self, matrix):
+        if self.parent is not None:
+            matrix = ~self.parent.GetMg() * matrix
+        self.SetMl(matrix)
+
+    def SetMl(self, matrix):
+        self[CONSTANTS["ID_BASEOBJECT_POSITION"]] = matrix.off
+
+    def GetAbsPos(self):
+        return self[CONSTANTS["ID_BASEOBJECT_POSITION"]]
+
+    def SetAbsPos(self, position):
+        self[CONSTANTS["ID_BASEOBJECT_POSITION"]] = position
+
+    def get_points(self):
+        return []
+
+    def get_bounds(self):
+        """returns the minimum and maximum of the points in object space"""
+        points = self.get_points()
+        if not points:
+            return Vector(0, 0, 0), Vector(0, 0, 0)
+        minimum = Vector(*(min(point[i] for point in points) for i in range(3)))
+        maximum = Vector(*(max(point[i] for point in points) for i in range(3)))
+        return minimum, maximum
+
+    def GetMp(self):
+        minimum, maximum = self.get_bounds()
+        return (minimum + maximum) / 2
+
+    def GetRad(self):
+        minimum, maximum = self.get_bounds()
+        return (maximum - minimum) / 2
+
+
+@recorded
+class PointObject(BaseObject):
+
+    def __init__(self, type_id=0):
+        super().__init__(type_id)
+        self.points = []
+
+    def get_points(self):
+        return self.points
+
+    def GetAllPoints(self):
+        return [copy.copy(point) for point in self.points]
+
+    def SetAllPoints(self, points):
+        self.points = [copy.copy(point) for point in points]
+        self.dirty += 1
+
+    def GetPointCount(self):
+        return len(self.points)
+
+    def GetPoint(self, index):
+        return copy.copy(self.points[index])
+
+    def SetPoint(self, index, point):
+        self.points[index] = copy.copy(point)
+        self.dirty += 1
+
+    def ResizeObject(self, point_count, segment_count=None):
+        self.points = (self.points + [Vector(0, 0, 0)] * point_count)[:point_count]
+        self.dirty += 1
+        return True
+
+
+@recorded
+class SplineObject(PointObject):
+
+    def __init__(self, point_count=0, spline_type=0):
+        if point_count == CONSTANTS["Ospline"]:  # created via BaseObject(c4d.Ospline)
+            point_count = 0
+        super().__init__(CONSTANTS["Ospline"])
+        self.points = [Vector(0, 0, 0) for i in range(point_count)]
+        self.segments = []  # list of (point count, closed) pairs, empty for a single segment
+        self.tangents = [(Vector(0, 0, 0), Vector(0, 0, 0)) for i in range(point_count)]
+        self.closed = False
+
+    def GetClone(self, flags=0):
+        clone = super().GetClone(flags)
+        clone.points = [copy.copy(point) for point in self.points]
+        clone.segments = list(self.segments)
+        clone.tangents = list(self.tangents)
+        return clone
+
+    def ResizeObject(self, point_count, segment_count=None):
+        super().ResizeObject(point_count)
+        self.tangents = (self.tangents + [(Vector(0, 0, 0), Vector(0, 0, 0))] * point_count)[:point_count]
+        if segment_count:
+            self.segments = [(0, False)] * segment_count
+        return True
+
+    def GetSegmentCount(self):
+        return len(self.segments)
+
+    def GetSegment(self, index):
+        count, closed = self.segments[index]
+        return {"cnt": count, "closed": closed}
+
+    def SetSegment(self, index, count, closed):
+        self.segments[index] = (count, closed)
+        self.dirty += 1
+
+    def IsClosed(self):
+        return self.closed
+
+    def GetTangentCount(self):
+        return len(self.tangents)
+
+    def GetTangent(self, index):
+        left, right = self.tangents[index]
+        return {"vl": copy.copy(left), "vr": copy.copy(right)}
+
+    def SetTangent(self, index, left, right):
+        self.tangents[index] = (copy.copy(left), copy.copy(right))
+        self.dirty += 1
+
+    def get_segment_points(self):
+        """returns the points split into their segments"""
+        if not self.segments:
+            return [self.points]
+        segment_points = []
+        start = 0
+        for count, closed in self.segments:
+            segment_points.append(self.points[start:start + count])
+            start += count
+        return segment_points
+
+    def GetSplinePoint(self, t, segment=0):
+        points = self.get_segment_points()[segment]
+        return point_at(points, t)
+
+
+def point_at(points, t):
+    """returns the point at the parameter t along a polyline"""
+    if not points:
+        return Vector(0, 0, 0)
+    lengths = [(b - a).GetLength() for a, b in zip(points, points[1:])]
+    target = sum(lengths) * min(max(t, 0), 1)
+    for a, b, length in zip(points, points[1:], lengths):
+        if target <= length and length:
+            return a + (b - a) * (target / length)
+        target -= length
+    return copy.copy(points[-1])
+
+
+@recorded
+class BaseTag(BaseList2D):
+
+    def __init__(self, type_id=0):
+        super().__init__(type_id)
+        self.host = None
+        self.node_master = None
+        self.parameters[(__getattr__("EXPRESSION_PRIORITY"),)] = PriorityData()
+
+    def GetObject(self):
+        return self.host
+
+    def GetNodeMaster(self):
+        if self.node_master is None:
+            from c4d.modules.graphview import GvNodeMaster
+            self.node_master = GvNodeMaster(self)
+        return self.node_master
+
+    def SetMaterial(self, material):
+        self.material = material
+
+    def GetMaterial(self):
+        return getattr(self, "material", None)
+
+
+@recorded
+class BaseMaterial(BaseList2D):
+    pass
+
+
+@recorded
+class CKey:
+
+    def __init__(self, time):
+        recorder.record("CKey()")
+        self.time = time
+        self.value = 0.0
+        self.data = None
+        self.interpolation = None
+
+    def GetTime(self):
+        return self.time
+
+    def SetTime(self, curve, time):
+        self.time = time
+
+    def GetValue(self):
+        return self.value
+
+    def SetValue(self, curve, value):
+        self.value = value
+
+    def GetGeData(self):
+        return self.data
+
+    def SetGeData(self, curve, data):
+        self.data = data
+
+    def GetInterpolation(self):
+        return self.interpolation
+
+    def SetInterpolation(self, curve, interpolation):
+        self.interpolation = interpolation
+
+
+@recorded
+class CCurve:
+
+    def __init__(self, track=None):
+        self.track = track
+        self.keys = []
+
+    def GetKeyCount(self):
+        return len(self.keys)
+
+    def GetKey(self, index):
+        return self.keys[index]
+
+    def FindKey(self, time, match=0):
+        for index, key in enumerate(self.keys):
+            if key.time == time:
+                return {"key": key, "idx": index}
+        return None
+
+    def AddKey(self, time):
+        key = CKey(time)
+        index = len([other for other in self.keys if other.time <= time])
+        self.keys.insert(index, key)
+        return {"key": key, "nidx": index}
+
+    def InsertKey(self, key):
+        index = len([other for other in self.keys if other.time <= key.time])
+        self.keys.insert(index, key)
+        return True
+
+    def DelKey(self, index):
+        del self.keys[index]
+        return True
+
+    def FlushKeys(self):
+        self.keys = []
+
+
+@recorded
+class CTrack(BaseList2D):
+
+    def __init__(self, target=None, desc_id=None):
+        super().__init__()
+        self.target = target
+        self.desc_id = desc_id
+        self.curve = CCurve(self)
+
+    def GetCurve(self, type=0, bCreate=True):
+        return self.curve
+
+    def GetDescriptionID(self):
+        return self.desc_id
+
+    def GetObject(self):
+        return self.target
+
+    def Remove(self):
+        if self.target is not None and self in self.target.tracks:
+            self.target.tracks.remove(self)
+
+
+def CallCommand(command_id, subid=0):
+    recorder.record("CallCommand")
+
+
+def EventAdd(flags=0):
+    recorder.record("EventAdd")
+
+
+def GetC4DVersion():
+    return 26000
+
+
+from c4d import documents, utils, modules  # noqa: E402
+from c4d.modules import graphview, mograph  # noqa: E402
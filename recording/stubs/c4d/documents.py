@@ -0,0 +1,181 @@
+"""in-memory stand-in for c4d.documents"""
+
+from c4d import BaseList2D, BaseTime, recorded, recorder
+import pickle
+
+
+@recorded
+class BaseDocument(BaseList2D):
+
+    def __init__(self):
+        super().__init__()
+        self.objects = []  # top level objects
+        self.materials = []
+        self.time = BaseTime(0)
+        self.fps = 30
+        self.selection = None
+        self.render_data = RenderData()
+        self.base_draw = BaseDraw()
+
+    def InsertObject(self, obj, parent=None, pred=None, checknames=False):
+        if parent is not None:
+            obj.InsertUnder(parent)
+            return
+        obj.Remove()
+        self.objects.insert(0, obj)
+        obj.set_document(self)
+
+    def GetFirstObject(self):
+        return self.objects[0] if self.objects else None
+
+    def GetObjects(self):
+        return list(self.objects)
+
+    def iterate_objects(self):
+        """yields all objects of the document depth first"""
+        stack = list(reversed(self.objects))
+        while stack:
+            obj = stack.pop()
+            yield obj
+            stack += reversed(obj.children)
+
+    def SearchObject(self, name):
+        for obj in self.iterate_objects():
+            if obj.GetName() == name:
+                return obj
+        return None
+
+    def InsertMaterial(self, material, pred=None, checknames=False):
+        self.materials.insert(0, material)
+        material.document = self
+
+    def GetMaterials(self):
+        return list(self.materials)
+
+    def GetTime(self):
+        return self.time
+
+    def SetTime(self, time):
+        self.time = time
+
+    def GetFps(self):
+        return self.fps
+
+    def SetFps(self, fps):
+        self.fps = fps
+
+    def SetDocumentName(self, name):
+        self.name = name
+
+    def GetDocumentName(self):
+        return self.name
+
+    def SetSelection(self, obj, mode=0):
+        self.selection = obj
+
+    def SetActiveObject(self, obj, mode=0):
+        self.selection = obj
+
+    def GetActiveObject(self):
+        return self.selection
+
+    def GetActiveRenderData(self):
+        return self.render_data
+
+    def GetActiveBaseDraw(self):
+        return self.base_draw
+
+    def ExecutePasses(self, bt=None, animation=True, expressions=True, caches=True, flags=0):
+        return True
+
+    def StartUndo(self):
+        return True
+
+    def EndUndo(self):
+        return True
+
+    def AddUndo(self, type, data):
+        return True
+
+    def Remove(self):
+        global active_document
+        if active_document is self:
+            active_document = None
+
+
+@recorded
+class RenderData(BaseList2D):
+
+    def __init__(self):
+        super().__init__()
+        self.video_posts = []
+
+    def InsertVideoPost(self, video_post, pred=None):
+        self.video_posts.append(video_post)
+
+    def GetFirstVideoPost(self):
+        return self.video_posts[0] if self.video_posts else None
+
+
+@recorded
+class BaseVideoPost(BaseList2D):
+    pass
+
+
+@recorded
+class BaseDraw(BaseList2D):
+
+    def __init__(self):
+        super().__init__()
+        self.scene_camera = None
+
+    def SetSceneCamera(self, camera, animate=False):
+        self.scene_camera = camera
+
+    def GetSceneCamera(self, document):
+        return self.scene_camera
+
+
+active_document = BaseDocument()
+
+
+def GetActiveDocument():
+    global active_document
+    recorder.record("GetActiveDocument")
+    if active_document is None:
+        active_document = BaseDocument()
+    return active_document
+
+
+def SetActiveDocument(document):
+    global active_document
+    recorder.record("SetActiveDocument")
+    active_document = document
+
+
+def InsertBaseDocument(document):
+    global active_document
+    recorder.record("InsertBaseDocument")
+    active_document = document
+
+
+def KillDocument(document):
+    recorder.record("KillDocument")
+
+
+def MergeDocument(document, file_name, flags=0, thread=None):
+    recorder.record("MergeDocument")
+    return True
+
+
+def SaveDocument(document, name, saveflags=0, format=0):
+    recorder.record("SaveDocument")
+    with open(name, "wb") as file:
+        pickle.dump(document, file)
+    return True
+
+
+def LoadDocument(name, loadflags=0, thread=None):
+    recorder.record("LoadDocument")
+    with open(name, "rb") as file:
+        return pickle.load(file)
@@ -0,0 +1 @@
+"""in-memory stand-in for c4d.modules"""
@@ -0,0 +1,164 @@
+"""in-memory stand-in for c4d.modules.graphview"""
+
+from c4d import BaseList2D, recorded
+
+
+@recorded
+class GvPort:
+
+    def __init__(self, node, io, desc_id=None):
+        self.node = node
+        self.io = io
+        self.desc_id = desc_id
+        self.name = None
+        self.connections = []  # ports this port is connected to
+
+    def __repr__(self):
+        return f"GvPort({self.node}, {self.desc_id})"
+
+    def Connect(self, other):
+        self.connections.append(other)
+        other.connections.append(self)
+        self.node.master.connection_count += 1
+        return True
+
+    def Remove(self):
+        self.node.remove_port(self)
+
+    def GetName(self, node):
+        return self.name if self.name is not None else str(self.desc_id)
+
+    def SetName(self, name):
+        self.name = name
+
+    def GetMainID(self):
+        return self.desc_id
+
+    def GetNode(self):
+        return self.node
+
+    def GetIO(self):
+        return self.io
+
+    def GetNrOfConnections(self):
+        return len(self.connections)
+
+    def GetDestination(self):
+        return list(self.connections)
+
+
+@recorded
+class GvNode(BaseList2D):
+
+    def __init__(self, master, operator_id, parent=None):
+        super().__init__(operator_id)
+        self.master = master
+        self.parent = parent
+        self.children = []
+        self.in_ports = []
+        self.out_ports = []
+
+    def GetOperatorID(self):
+        return self.type_id
+
+    def GetUp(self):
+        return self.parent
+
+    def GetDown(self):
+        return self.children[0] if self.children else None
+
+    def GetChildren(self):
+        return list(self.children)
+
+    def GetNext(self):
+        if self.parent is None:
+            return None
+        siblings = self.parent.children
+        index = siblings.index(self)
+        return siblings[index + 1] if index + 1 < len(siblings) else None
+
+    def GetNodeMaster(self):
+        return self.master
+
+    def AddPort(self, io, id=None, flags=0, message=False):
+        port = GvPort(self, io, id)
+        self.get_ports(io).append(port)
+        return port
+
+    def get_ports(self, io):
+        return self.in_ports if io == 1 else self.out_ports
+
+    def remove_port(self, port):
+        ports = self.get_ports(port.io)
+        if port in ports:
+            ports.remove(port)
+
+    def GetInPort(self, index):
+        while len(self.in_ports) <= index:  # operators come with default ports
+            self.in_ports.append(GvPort(self, 1))
+        return self.in_ports[index]
+
+    def GetOutPort(self, index):
+        while len(self.out_ports) <= index:
+            self.out_ports.append(GvPort(self, 2))
+        return self.out_ports[index]
+
+    def GetInPorts(self):
+        return list(self.in_ports)
+
+    def GetOutPorts(self):
+        return list(self.out_ports)
+
+    def GetInPortCount(self):
+        return len(self.in_ports)
+
+    def GetOutPortCount(self):
+        return len(self.out_ports)
+
+    def RemoveUnusedPorts(self, message=False):
+        self.in_ports = [port for port in self.in_ports if port.connections]
+        self.out_ports = [port for port in self.out_ports if port.connections]
+
+    def Remove(self):
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent = None
+
+
+@recorded
+class GvNodeMaster(BaseList2D):
+
+    def __init__(self, owner=None):
+        super().__init__()
+        self.owner = owner
+        self.root = GvNode(self, 0)
+        self.connection_count = 0
+
+    def GetOwner(self):
+        return self.owner
+
+    def GetRoot(self):
+        return self.root
+
+    def CreateNode(self, parent, id, insert=None, x=-1, y=-1):
+        node = GvNode(self, id, parent)
+        parent.children.append(node)
+        return node
+
+    def InsertFirst(self, parent, node):
+        node.Remove()
+        parent.children.insert(0, node)
+        node.parent = parent
+
+    def InsertLast(self, parent, node):
+        node.Remove()
+        parent.children.append(node)
+        node.parent = parent
+
+    def iterate_nodes(self):
+        """yields all nodes below the root depth first"""
+        stack = list(reversed(self.root.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack += reversed(node.children)
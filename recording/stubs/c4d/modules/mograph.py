@@ -0,0 +1,26 @@
+"""in-memory stand-in for c4d.modules.mograph"""
+
+import zlib
+from c4d import BaseList2D, recorded
+
+
+@recorded
+class FieldLayer(BaseList2D):
+
+    def __init__(self, type_id=0):
+        super().__init__(type_id)
+        self.linked_object = None
+        self.unique_id = zlib.crc32(str(id(self)).encode())
+
+    def SetLinkedObject(self, obj):
+        self.linked_object = obj
+
+    def GetLinkedObject(self, document=None):
+        return self.linked_object
+
+    def GetUniqueID(self):
+        return self.unique_id
+
+
+def GeGetMoData(obj):
+    return None
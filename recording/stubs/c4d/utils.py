@@ -0,0 +1,94 @@
+"""in-memory stand-in for c4d.utils"""
+
+import math
+from c4d import BaseObject, Matrix, SplineObject, Vector, recorded, recorder
+import c4d
+
+
+def Rad(degrees):
+    return math.radians(degrees)
+
+
+def Deg(radians):
+    return math.degrees(radians)
+
+
+def GetBBox(obj, mg):
+    """returns the center and radius of the object and its children"""
+    recorder.record("GetBBox")
+    points = []
+    stack = [(obj, Matrix())]
+    while stack:
+        current, matrix = stack.pop()
+        points += [matrix * point for point in current.get_points()]
+        stack += [(child, matrix * child.GetMl()) for child in current.children]
+    if not points:
+        return mg.off, Vector(0, 0, 0)
+    minimum = Vector(*(min(point[i] for point in points) for i in range(3)))
+    maximum = Vector(*(max(point[i] for point in points) for i in range(3)))
+    return mg * ((minimum + maximum) / 2), (maximum - minimum) / 2
+
+
+def SendModelingCommand(command, list, mode=0, bc=None, doc=None, flags=0):
+    """returns editable copies of the given objects"""
+    recorder.record("SendModelingCommand")
+    return [make_editable(obj) for obj in list]
+
+
+def make_editable(obj):
+    """converts an object into a spline or a hierarchy of splines"""
+    if obj.GetType() == c4d.Osplinetext and obj[c4d.PRIM_TEXT_SEPARATE]:
+        # separated text becomes a null holding one spline per character
+        editable = BaseObject(c4d.Onull)
+        text = obj[c4d.PRIM_TEXT_TEXT] or ""
+        for index, character in enumerate(text):
+            if character.isspace():
+                continue
+            letter = letter_spline(index)
+            letter.SetName(character)
+            letter.InsertUnderLast(editable)
+        return editable
+    if isinstance(obj, SplineObject):
+        return obj.GetClone()
+    editable = SplineObject(0)
+    editable.parameters = dict(obj.parameters)
+    return editable
+
+
+def letter_spline(index):
+    """returns a rectangular placeholder spline for a character"""
+    spline = SplineObject(4)
+    spline.SetAllPoints([Vector(index * 10 + x, y, 0) for x, y in ((0, 0), (8, 0), (8, 12), (0, 12))])
+    spline.closed = True
+    return spline
+
+
+@recorded
+class SplineHelp:
+
+    def __init__(self):
+        recorder.record("SplineHelp()")
+        self.segments = []
+
+    def InitSplineWith(self, op, flags=0):
+        if not isinstance(op, SplineObject):
+            self.segments = [[]]
+            return True
+        self.segments = op.get_segment_points()
+        return True
+
+    def FreeSpline(self):
+        self.segments = []
+
+    def GetSegmentCount(self):
+        return len(self.segments)
+
+    def GetSegmentLength(self, segment):
+        points = self.segments[segment]
+        return sum((b - a).GetLength() for a, b in zip(points, points[1:]))
+
+    def GetSplineLength(self):
+        return sum(self.GetSegmentLength(segment) for segment in range(len(self.segments)))
+
+    def GetPosition(self, offset, segment=0, bSmooth=True, realoffset=False):
+        return c4d.point_at(self.segments[segment], offset)
@@ -3,7 +3,15 @@ import pydeation.animation.animation
 importlib.reload(pydeation.animation.animation)
 from pydeation.animation.animation import ScalarAnimation, VectorAnimation
 from pydeation.animation.abstract_animators import ProtoAnimator, AnimationGroup
+from pydeation.animation.timeline import Timeline
+from pydeation.animation.evaluator import TimelineEvaluator
+from pydeation.animation.intervals import AnimationIndex
 from pydeation.objects.camera_objects import TwoDCamera, ThreeDCamera
+from pydeation.events import EventQueue
+from pydeation.xpresso.graph import GraphRegistry
+from pydeation.xpresso.passes import fold_static_relations, fuse_actions, sort_xpressions, merge_object_nodes
+from pydeation.cache import SceneCache, CachedSceneError
+from pydeation.incremental import IncrementalBuild, get_previous_build, store_build
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from pydeation.constants import *
@@ -16,22 +24,31 @@ from pprint import pprint
 class Scene(ABC):
     """abstract class acting as blueprint for scenes"""
 
-    def __init__(self, resolution="default", alpha=True, save=False):
+    def __init__(self, resolution="default", alpha=True, save=False, deferred=False, headless=False, cache=False, cache_directory=None, incremental=False):
         self.resolution = resolution
         self.alpha = alpha
         self.save = save
+        self.deferred = deferred or incremental  # incremental builds compare the keys per track before writing them
+        self.headless = headless
+        self.incremental = incremental
         self.time_ini = None
         self.time_fin = None
-        self.kill_old_document()
-        self.create_new_document()
-        self.set_scene_name()
-        self.insert_document()
+        self.create_event_queue()
+        self.create_cache(cache, cache_directory)
+        self.create_incremental_build(incremental)
         self.clear_console()
-        self.set_camera()
-        self.construct()
+        if self.reuse_previous_document():
+            self.build()
+        else:
+            self.kill_old_document()
+            if not self.load_cached_document():
+                self.create_new_document()
+                self.set_scene_name()
+                self.insert_document()
+                self.build()
         self.set_interactive_render_region()
-        self.set_render_settings()
-        self.adjust_timeline()
+        self.set_render_settings()  # resolution, alpha and export are applied on top of cached documents
+        self.flush_events()
 
     def START(self):
         # writes current time to variable for later use in finish method
@@ -55,6 +72,163 @@ class Scene(ABC):
             self.document[c4d.DOCUMENT_MAXTIME] = self.time_fin
             self.document[c4d.DOCUMENT_LOOPMAXTIME] = self.time_fin
 
+    def create_event_queue(self):
+        """creates the event queue which defers update events and ui commands in headless mode"""
+        self.events = EventQueue(headless=self.headless)
+        self.events.activate()
+
+    def flush_events(self):
+        """calls the deferred ui commands and updates cinema once"""
+        self.events.flush()
+
+    def create_timeline(self):
+        """creates the timeline which collects the keyframes of the scene
+        in deferred mode the keyframes are only written in the compile step after construct()"""
+        previous_tracks = None
+        if self.incremental_build is not None:
+            previous_tracks = self.incremental_build.get_previous_tracks()
+        self.timeline = Timeline(document=self.document, deferred=self.deferred, previous_tracks=previous_tracks)
+        self.timeline.activate()
+
+    def create_graph_registry(self):
+        """creates the registry which defers the xpresso nodes built during construct()"""
+        self.graph_registry = GraphRegistry(passes=self.get_graph_passes())
+        self.graph_registry.activate()
+
+    def get_graph_passes(self):
+        """returns the passes optimizing the recorded xpresso graphs
+        relations are not folded in incremental builds as reused objects keep the values written by the fold"""
+        passes = [fuse_actions, sort_xpressions, merge_object_nodes]
+        if not self.incremental:
+            passes.insert(0, fold_static_relations)
+        return passes
+
+    def materialize_graphs(self):
+        """optimizes the recorded xpresso graphs and creates them in their tags in one pass per tag"""
+        self.graph_registry.deactivate()
+        self.graph_registry.materialize()
+
+    def build(self):
+        """constructs the scene and writes its keyframes"""
+        self.create_timeline()
+        self.create_graph_registry()
+        try:
+            self.set_camera()
+            self.construct()
+            self.compile_timeline()
+            self.materialize_graphs()  # after the tracks are written such that static relations can be folded
+            self.adjust_timeline()
+            self.finish_incremental_build()
+            self.store_cached_document()
+        finally:
+            # objects used after the build read and write their parameters directly again
+            self.timeline.deactivate()
+            self.graph_registry.deactivate()
+
+    def create_incremental_build(self, incremental):
+        """creates the opt-in incremental build which keeps the document of the previous run
+        and only creates, removes or rewrites the objects and tracks that changed"""
+        self.incremental_build = None
+        if incremental:
+            self.incremental_build = IncrementalBuild()
+            self.incremental_build.activate()
+
+    def reuse_previous_document(self):
+        """continues with the document of the previous incremental build if it is still active"""
+        if self.incremental_build is None:
+            return False
+        previous = get_previous_build(self.__class__.__name__, c4d.documents.GetActiveDocument())
+        if previous is None:
+            return False
+        self.incremental_build.previous = previous
+        self.document = previous.document
+        self.document.SetTime(c4d.BaseTime(0))
+        self.set_scene_name()
+        previous.restore_initial_values()
+        return True
+
+    def finish_incremental_build(self):
+        """removes stale objects of the previous build and remembers this build for the next run"""
+        if self.incremental_build is None:
+            return
+        plan = self.incremental_build.finish(self.document, self.timeline)
+        store_build(self.scene_name, plan)
+
+    def create_cache(self, cache, cache_directory):
+        """creates the opt-in cache which skips construct() if the scene was already built with identical inputs"""
+        self.cache = None
+        self.cache_key = None
+        self.cache_hit = False
+        if not cache:
+            return
+        if cache_directory is None:
+            cache_directory = os.path.join(os.path.dirname(os.path.abspath(inspect.getfile(self.__class__))), "cache")
+        self.cache = SceneCache(cache_directory)
+        self.cache_key = self.cache.get_key(self)
+        if self.cache_key is None:
+            self.cache = None  # scene source not available, e.g. defined in the console
+            return
+        self.cache.activate()
+
+    def get_cache_arguments(self):
+        """returns the constructor arguments that change the built document
+        scenes depending on further inputs should extend this"""
+        return {
+            "deferred": self.deferred,
+            "incremental": self.incremental,
+            "graph_passes": [graph_pass.__name__ for graph_pass in self.get_graph_passes()]
+        }
+
+    def load_cached_document(self):
+        """loads the document from the cache on a hit, returns whether construct() can be skipped
+        note that on a hit only the document is restored, not the python objects created in construct(),
+        methods depending on them raise a CachedSceneError"""
+        if self.cache is None:
+            return False
+        document = self.cache.load(self.cache_key)
+        if document is None:
+            return False
+        self.document = document
+        self.set_scene_name()
+        self.insert_document()
+        c4d.documents.SetActiveDocument(self.document)
+        self.cache_hit = True
+        self.timeline = None
+        self.graph_registry = None
+        self.camera = None
+        SceneCache.active = None
+        if self.incremental_build is not None:
+            IncrementalBuild.active = None  # nothing is constructed
+            self.incremental_build = None
+        return True
+
+    def store_cached_document(self):
+        """saves the built document to the cache"""
+        if self.cache is None:
+            return
+        self.cache.store(self.cache_key, self.document, scene_name=self.scene_name)
+        SceneCache.active = None
+
+    def compile_timeline(self):
+        """writes all recorded keyframes to the document grouped per track"""
+        self.timeline.compile()
+
+    def check_constructed(self, purpose):
+        """raises if the python objects of construct() are not available because the document was loaded from the cache"""
+        if self.cache_hit:
+            raise CachedSceneError(f"{self.scene_name} was loaded from the cache, {purpose} needs the objects of construct(), "
+                                   f"build the scene with cache=False")
+
+    def get_evaluator(self, interpolation="spline"):
+        """returns an evaluator of all animations played in the scene"""
+        self.check_constructed("the evaluator")
+        return TimelineEvaluator(self.timeline.animations, interpolation=interpolation)
+
+    def get_animation_index(self):
+        """returns an interval index over all animations played in the scene"""
+        self.check_constructed("the animation index")
+        return AnimationIndex(self.timeline.animations)
+
     def set_render_settings(self):
         self.render_settings = RenderSettings(alpha=self.alpha)
         self.render_settings.set_resolution(self.resolution)
@@ -77,7 +251,7 @@ class Scene(ABC):
 
     def clear_console(self):
         """clears the python console"""
-        c4d.CallCommand(13957)
+        self.events.call_command(13957)
 
     @abstractmethod
     def construct(self):
@@ -105,7 +279,7 @@ class Scene(ABC):
 
     def set_interactive_render_region(self):
         """creates an IRR window over the full size of the editor view"""
-        c4d.CallCommand(600000022)  # call IRR script by ID
+        self.events.call_command(600000022)  # call IRR script by ID
         # workaround because script needs to be executed from main thread not pydeation library
         # ID changes depending on machine
         # CHANGE THIS IN FUTURE TO MORE ROBUST SOLUTION
@@ -118,14 +292,14 @@ class Scene(ABC):
     def execute_animations(self, animations):
         """passes the run time to animations and executes them"""
         for animation in animations:
-            animation.execute()
+            animation.execute(timeline=self.timeline)
 
     def add_time(self, run_time):
         """passes the run time in the document timeline"""
         time_ini = self.document.GetTime()
         time_fin = time_ini + c4d.BaseTime(run_time)
         self.document.SetTime(time_fin)
-        c4d.EventAdd()  # update cinema
+        self.events.event_add()  # update cinema
 
     def flatten(self, animations):
         """flattens animations by wrapping them in animation group"""
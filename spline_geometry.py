@@ -0,0 +1,313 @@
+"""
+this file holds a numpy kernel measuring, resampling and querying bezier and linear splines given as point and tangent arrays
+it does not depend on cinema such that it can be benchmarked on the parsed svg assets:
+
+    python -m pydeation.spline_geometry assets/svg [number of queries]
+"""
+
+from pydeation.svg import parse_svg_file
+import numpy as np
+import os
+import sys
+import time
+
+TOLERANCE = 1e-12
+
+
+class SplineGeometry:
+    """holds the cubic curves of a spline with one row per point.
+    the curves are flattened into line pieces which measure the arc length and answer nearest point queries,
+    positions and tangents are evaluated on the curves themselves"""
+
+    def __init__(self, points, tangents_left=None, tangents_right=None, segment_counts=None, segment_closed=None,
+                 interpolation="bezier", subdivisions=16):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if interpolation == "linear" or tangents_left is None or tangents_right is None:
+            tangents_left = tangents_right = np.zeros_like(self.points)
+        if interpolation == "linear":
+            subdivisions = 1  # straight curves are measured exactly by a single piece
+        self.tangents_left = np.asarray(tangents_left, dtype=float).reshape(-1, 3)
+        self.tangents_right = np.asarray(tangents_right, dtype=float).reshape(-1, 3)
+        self.segment_counts = np.asarray([len(self.points)] if segment_counts is None else segment_counts, dtype=int)
+        self.segment_closed = np.asarray([False] * len(self.segment_counts) if segment_closed is None else segment_closed, dtype=bool)
+        self.interpolation = interpolation
+        self.subdivisions = subdivisions
+        self.bvh = None  # created by the first nearest point query
+        self.create_curves()
+        self.flatten_curves()
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"SplineGeometry: {len(self.points)} points, {self.get_segment_count()} segments, length {self.get_length():.2f}"
+
+    @classmethod
+    def from_spline_data(cls, spline_data, **kwargs):
+        """creates the geometry of the spline data parsed from an svg"""
+        return cls(spline_data.points, spline_data.tangents_left, spline_data.tangents_right,
+                   spline_data.segment_counts, spline_data.segment_closed, **kwargs)
+
+    def create_curves(self):
+        """collects the four control points of every curve connecting two consecutive points of a segment"""
+        starts, ends, curve_segments = [], [], []
+        first = 0
+        for segment, (count, closed) in enumerate(zip(self.segment_counts, self.segment_closed)):
+            indices = np.arange(first, first + count)
+            if closed and count > 1:
+                indices = np.append(indices, first)
+            starts.append(indices[:-1])
+            ends.append(indices[1:])
+            curve_segments.append(np.full(max(len(indices) - 1, 0), segment))  # empty segments have no curves
+            first += count
+        starts, ends = np.concatenate(starts), np.concatenate(ends)
+        self.curve_segments = np.concatenate(curve_segments)
+        if self.interpolation == "linear":
+            # evenly spaced control points keep the parameter proportional to the arc length
+            tangents_right = (self.points[ends] - self.points[starts]) / 3
+            tangents_left = -tangents_right
+        else:
+            tangents_right, tangents_left = self.tangents_right[starts], self.tangents_left[ends]
+        self.control_points = np.stack((
+            self.points[starts],
+            self.points[starts] + tangents_right,
+            self.points[ends] + tangents_left,
+            self.points[ends]), axis=1)  # (curves, 4, 3)
+
+    def flatten_curves(self):
+        """splits every curve into line pieces of equal parameter steps and accumulates their lengths"""
+        curve_count = len(self.control_points)
+        parameters = np.linspace(0, 1, self.subdivisions + 1)
+        positions = get_bezier_positions(
+            np.repeat(self.control_points, len(parameters), axis=0), np.tile(parameters, curve_count))
+        positions = positions.reshape(curve_count, len(parameters), 3)
+        self.piece_starts = positions[:, :-1].reshape(-1, 3)
+        self.piece_ends = positions[:, 1:].reshape(-1, 3)
+        self.piece_curves = np.repeat(np.arange(curve_count), self.subdivisions)
+        self.piece_parameters = np.tile(parameters[:-1], curve_count)  # curve parameter at the start of each piece
+        self.piece_segments = self.curve_segments[self.piece_curves]
+        self.piece_lengths = np.linalg.norm(self.piece_ends - self.piece_starts, axis=1)
+        segment_count = len(self.segment_counts)
+        self.segment_lengths = np.bincount(self.piece_segments, weights=self.piece_lengths, minlength=segment_count)
+        # arc length at the start of each segment and of each piece within its segment
+        self.segment_offsets = np.concatenate(([0], np.cumsum(self.segment_lengths)[:-1]))
+        self.spline_offsets = np.cumsum(self.piece_lengths) - self.piece_lengths  # measured from the start of the spline
+        self.piece_offsets = self.spline_offsets - self.segment_offsets[self.piece_segments]
+        # range of the pieces of each segment
+        self.segment_pieces = np.searchsorted(self.piece_segments, np.arange(segment_count + 1))
+
+    def get_segment_count(self):
+        return len(self.segment_counts)
+
+    def get_length(self, segment=None):
+        """returns the length of the spline or a specific segment"""
+        if segment is None:
+            return float(self.segment_lengths.sum())
+        return float(self.segment_lengths[segment])
+
+    def locate(self, segments, distances):
+        """returns the curves and curve parameters at the arc length distances along the segments"""
+        segments, distances = np.broadcast_arrays(np.asarray(segments, dtype=int), np.asarray(distances, dtype=float))
+        first, last = self.segment_pieces[segments], self.segment_pieces[segments + 1] - 1
+        if np.any(last < first):
+            raise ValueError("cannot locate a distance on a segment without curves")
+        pieces = np.searchsorted(self.spline_offsets, self.segment_offsets[segments] + distances, side="right") - 1
+        pieces = np.clip(pieces, first, last)
+        lengths = self.piece_lengths[pieces]
+        fractions = np.clip((distances - self.piece_offsets[pieces]) / np.maximum(lengths, TOLERANCE), 0, 1)
+        return self.piece_curves[pieces], self.piece_parameters[pieces] + fractions / self.subdivisions
+
+    def evaluate(self, offsets, segments=0):
+        """returns the positions and unit tangents at the offsets given as fractions of the length of their segments.
+        segments without curves, i.e. of a single point, evaluate to nan"""
+        segments, offsets = np.broadcast_arrays(np.asarray(segments, dtype=int), np.asarray(offsets, dtype=float))
+        positions = np.full(segments.shape + (3,), np.nan)
+        tangents = np.full(segments.shape + (3,), np.nan)
+        valid = self.segment_pieces[segments + 1] > self.segment_pieces[segments]
+        segments, offsets = segments[valid], offsets[valid]
+        curves, parameters = self.locate(segments, offsets * self.segment_lengths[segments])
+        positions[valid] = self.get_positions(curves, parameters)
+        tangents[valid] = self.get_tangents(curves, parameters)
+        return positions, tangents
+
+    def resample(self, count, segment=None):
+        """returns the positions and unit tangents of count points spaced evenly by arc length on every segment,
+        or on a specific segment, as arrays of shape (segments, count, 3). closed segments do not repeat their first point,
+        segments of a single point are filled with nan"""
+        segments = np.arange(self.get_segment_count()) if segment is None else np.array([segment])
+        offsets = np.linspace(0, 1, count)
+        closed_offsets = np.linspace(0, 1, count, endpoint=False)
+        offsets = np.where(self.segment_closed[segments, np.newaxis], closed_offsets, offsets)
+        positions, tangents = self.evaluate(offsets, segments[:, np.newaxis])
+        return positions, tangents
+
+    def get_nearest_points(self, points):
+        """returns the nearest positions on the spline to the points together with their segments,
+        offsets as fractions of the segment lengths and distances"""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self.bvh is None:
+            self.bvh = SegmentBVH(self.piece_starts, self.piece_ends)
+        pieces, fractions = self.bvh.query(points)
+        curves = self.piece_curves[pieces]
+        parameters = self.piece_parameters[pieces] + fractions / self.subdivisions
+        segments = self.piece_segments[pieces]
+        distances_along = self.piece_offsets[pieces] + fractions * self.piece_lengths[pieces]
+        offsets = distances_along / np.maximum(self.segment_lengths[segments], TOLERANCE)
+        positions = self.get_positions(curves, parameters)
+        return positions, segments, offsets, np.linalg.norm(positions - points, axis=1)
+
+    def get_positions(self, curves, parameters):
+        return get_bezier_positions(self.control_points[curves], parameters)
+
+    def get_tangents(self, curves, parameters):
+        """returns the unit tangents, falling back to the chord where the derivative vanishes as for linear curves"""
+        control_points = self.control_points[curves]
+        tangents = get_bezier_derivatives(control_points, parameters)
+        lengths = np.linalg.norm(tangents, axis=-1, keepdims=True)
+        chords = control_points[..., 3, :] - control_points[..., 0, :]
+        tangents = np.where(lengths > TOLERANCE, tangents, chords)
+        lengths = np.linalg.norm(tangents, axis=-1, keepdims=True)
+        return tangents / np.maximum(lengths, TOLERANCE)
+
+
+class SegmentBVH:
+    """bounding volume hierarchy over line pieces answering nearest point queries for many points at once.
+    all queries descend the tree together, pairs of queries and nodes are pruned once the box is farther than the best piece"""
+
+    def __init__(self, starts, ends, leaf_size=8):
+        self.starts = starts
+        self.ends = ends
+        self.leaf_size = leaf_size
+        self.centers = (starts + ends) / 2
+        self.order = np.arange(len(starts))  # pieces sorted such that every node covers a contiguous range
+        self.minimum, self.maximum, self.left, self.right, self.first, self.last = [], [], [], [], [], []
+        self.create_node(0, len(starts))
+        self.minimum, self.maximum = np.array(self.minimum), np.array(self.maximum)
+        self.left, self.right = np.array(self.left), np.array(self.right)
+        self.first, self.last = np.array(self.first), np.array(self.last)
+        self.sorted_starts, self.sorted_ends = starts[self.order], ends[self.order]
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"SegmentBVH: {len(self.starts)} pieces, {len(self.left)} nodes"
+
+    def create_node(self, first, last):
+        """creates the node covering the sorted pieces from first to last and its children, returns its index"""
+        indices = self.order[first:last]
+        node = len(self.left)
+        corners = np.concatenate((self.starts[indices], self.ends[indices]))
+        self.minimum.append(corners.min(axis=0))
+        self.maximum.append(corners.max(axis=0))
+        self.left.append(-1)
+        self.right.append(-1)
+        self.first.append(first)
+        self.last.append(last)
+        if last - first > self.leaf_size:
+            # split at the median along the axis of the largest extent of the piece centers
+            centers = self.centers[indices]
+            axis = np.argmax(centers.max(axis=0) - centers.min(axis=0))
+            self.order[first:last] = indices[np.argsort(centers[:, axis], kind="stable")]
+            middle = (first + last) // 2
+            self.left[node] = self.create_node(first, middle)
+            self.right[node] = self.create_node(middle, last)
+        return node
+
+    def get_box_distances(self, nodes, points):
+        """returns the squared distances of the points to the boxes of the nodes"""
+        offsets = np.maximum(self.minimum[nodes] - points, 0) + np.maximum(points - self.maximum[nodes], 0)
+        return np.einsum("ij,ij->i", offsets, offsets)
+
+    def query(self, points):
+        """returns the nearest piece to every point and the position on it as fraction of the piece"""
+        count = len(points)
+        self.best_distances = np.full(count, np.inf)
+        self.best_pieces = np.zeros(count, dtype=int)
+        self.best_fractions = np.zeros(count)
+        # descend to the closest leaf first such that its distance prunes most of the tree
+        nodes = np.zeros(count, dtype=int)
+        inner = self.left[nodes] >= 0
+        while inner.any():
+            left, right = self.left[nodes[inner]], self.right[nodes[inner]]
+            closer = self.get_box_distances(left, points[inner]) <= self.get_box_distances(right, points[inner])
+            nodes[inner] = np.where(closer, left, right)
+            inner = self.left[nodes] >= 0
+        queries = np.arange(count)
+        self.test_leaves(queries, nodes, points)
+        nodes = np.zeros(count, dtype=int)
+        while len(queries):
+            close = self.get_box_distances(nodes, points[queries]) <= self.best_distances[queries]
+            queries, nodes = queries[close], nodes[close]
+            leaves = self.left[nodes] < 0
+            self.test_leaves(queries[leaves], nodes[leaves], points)
+            queries, nodes = queries[~leaves], nodes[~leaves]
+            queries = np.concatenate((queries, queries))
+            nodes = np.concatenate((self.left[nodes], self.right[nodes]))
+        return self.order[self.best_pieces], self.best_fractions
+
+    def test_leaves(self, queries, nodes, points):
+        """measures the distances of the queried points to all pieces of their leaves and keeps the nearest"""
+        if not len(queries):
+            return
+        counts = self.last[nodes] - self.first[nodes]
+        pair_queries = np.repeat(queries, counts)
+        pieces = np.repeat(self.first[nodes] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        starts, ends = self.sorted_starts[pieces], self.sorted_ends[pieces]
+        directions = ends - starts
+        pair_points = points[pair_queries]
+        squared_lengths = np.maximum(np.einsum("ij,ij->i", directions, directions), TOLERANCE)
+        fractions = np.clip(np.einsum("ij,ij->i", pair_points - starts, directions) / squared_lengths, 0, 1)
+        offsets = starts + fractions[:, np.newaxis] * directions - pair_points
+        distances = np.einsum("ij,ij->i", offsets, offsets)
+        # keep the nearest piece per query
+        order = np.lexsort((distances, pair_queries))
+        nearest_queries, first_pairs = np.unique(pair_queries[order], return_index=True)
+        nearest = order[first_pairs]
+        closer = distances[nearest] < self.best_distances[nearest_queries]
+        nearest_queries, nearest = nearest_queries[closer], nearest[closer]
+        self.best_distances[nearest_queries] = distances[nearest]
+        self.best_pieces[nearest_queries] = pieces[nearest]
+        self.best_fractions[nearest_queries] = fractions[nearest]
+
+
+def get_bezier_positions(control_points, parameters):
+    """evaluates cubic bezier curves given as arrays of shape (..., 4, 3) at the parameters of shape (...)"""
+    t = np.asarray(parameters, dtype=float)[..., np.newaxis]
+    s = 1 - t
+    return (s ** 3 * control_points[..., 0, :] + 3 * s ** 2 * t * control_points[..., 1, :]
+            + 3 * s * t ** 2 * control_points[..., 2, :] + t ** 3 * control_points[..., 3, :])
+
+
+def get_bezier_derivatives(control_points, parameters):
+    """evaluates the derivatives of cubic bezier curves with respect to their parameter"""
+    t = np.asarray(parameters, dtype=float)[..., np.newaxis]
+    s = 1 - t
+    return (3 * s ** 2 * (control_points[..., 1, :] - control_points[..., 0, :])
+            + 6 * s * t * (control_points[..., 2, :] - control_points[..., 1, :])
+            + 3 * t ** 2 * (control_points[..., 3, :] - control_points[..., 2, :]))
+
+
+def benchmark(directory, query_count=10000):
+    """measures the kernel on all svg files of the directory"""
+    print(f"{'file':<32} {'points':>8} {'length':>10} {'build':>10} {'resample':>10} {'nearest':>10}")
+    random = np.random.default_rng(0)
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith(".svg"):
+            continue
+        spline_data = parse_svg_file(os.path.join(directory, file_name))
+        if not len(spline_data):
+            continue
+        start = time.perf_counter()
+        geometry = SplineGeometry.from_spline_data(spline_data)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        geometry.resample(100)
+        resample_time = time.perf_counter() - start
+        minimum, maximum = spline_data.points.min(axis=0), spline_data.points.max(axis=0)
+        points = random.uniform(minimum, maximum, size=(query_count, 3))
+        start = time.perf_counter()
+        geometry.get_nearest_points(points)
+        nearest_time = time.perf_counter() - start
+        print(f"{file_name:<32} {len(spline_data):>8} {geometry.get_length():>10.1f} "
+              f"{build_time:>9.4f}s {resample_time:>9.4f}s {nearest_time:>9.4f}s")
+
+
+if __name__ == "__main__":
+    benchmark(sys.argv[1], query_count=int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
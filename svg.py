@@ -0,0 +1,477 @@
+"""
+this file holds a parser for the paths of svg files which produces the points, tangents and segments of bezier splines
+it does not depend on cinema such that whole asset directories can be parsed and validated in parallel:
+
+    python -m pydeation.svg assets/svg [output directory]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import xml.etree.ElementTree as ElementTree
+import numpy as np
+import math
+import os
+import re
+import sys
+
+# lengths of svg units in user units
+UNITS = {"": 1, "px": 1, "pt": 4 / 3, "pc": 16, "mm": 96 / 25.4, "cm": 96 / 2.54, "in": 96}
+# number of parameters per path command
+PARAMETER_COUNTS = {"m": 2, "l": 2, "h": 1, "v": 1, "c": 6, "s": 4, "q": 4, "t": 2, "a": 7, "z": 0}
+# elements whose content is not drawn
+HIDDEN_ELEMENTS = ("defs", "clipPath", "mask", "symbol", "marker", "pattern", "style", "title", "desc", "metadata")
+IDENTITY = (1, 0, 0, 1, 0, 0)  # affine transforms as (a, b, c, d, e, f) mapping (x, y) to (ax + cy + e, bx + dy + f)
+KAPPA = 4 * (math.sqrt(2) - 1) / 3  # tangent length of a cubic bezier approximating a quarter circle
+TOLERANCE = 1e-9
+
+TOKEN = re.compile(r"([MmLlHhVvCcSsQqTtAaZz])|([-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?)|([\s,]+)")
+TRANSFORM = re.compile(r"(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)")
+NUMBER = re.compile(r"[-+]?(?:\d*\.\d+|\d+\.?)(?:[eE][-+]?\d+)?")
+
+
+class SVGParseError(ValueError):
+    """raised for svg files or path data which cannot be parsed"""
+
+
+class SplineData:
+    """holds the bezier knots of a spline with one row per point.
+    the tangents are relative to their point as in cinema, y points upwards"""
+
+    def __init__(self, points, tangents_left, tangents_right, segment_counts, segment_closed):
+        self.points = points  # (n, 3) array
+        self.tangents_left = tangents_left  # (n, 3) array
+        self.tangents_right = tangents_right  # (n, 3) array
+        self.segment_counts = segment_counts  # points per segment
+        self.segment_closed = segment_closed  # closed flag per segment
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"SplineData: {len(self)} points, {len(self.segment_counts)} segments"
+
+    def __len__(self):
+        return len(self.points)
+
+    def save(self, path):
+        """writes the arrays to a npz file"""
+        np.savez(path, points=self.points, tangents_left=self.tangents_left, tangents_right=self.tangents_right,
+                 segment_counts=self.segment_counts, segment_closed=self.segment_closed)
+
+
+def load_spline_data(path):
+    """reads spline data written by SplineData.save"""
+    with np.load(path) as arrays:
+        return SplineData(arrays["points"], arrays["tangents_left"], arrays["tangents_right"],
+                          arrays["segment_counts"], arrays["segment_closed"])
+
+
+def parse_svg_file(file_path):
+    """returns the spline data of all drawn shapes of the svg file"""
+    try:
+        root = ElementTree.parse(file_path).getroot()
+    except ElementTree.ParseError as error:
+        raise SVGParseError(f"{file_path} is not valid xml: {error}") from error
+    subpaths = []
+    try:
+        collect_subpaths(root, get_viewport_transform(root), subpaths)
+        return create_spline_data(subpaths)
+    except SVGParseError:
+        raise
+    except (ValueError, IndexError) as error:  # e.g. malformed numbers or attributes not covered by the parser
+        raise SVGParseError(f"{file_path} cannot be parsed: {error}") from error
+
+
+def parse_path(path_data, transform=IDENTITY):
+    """returns the spline data of svg path data"""
+    return create_spline_data([(apply_transform(transform, subpath[0]), subpath[1]) for subpath in parse_path_data(path_data)])
+
+
+def parse_svg_directory(directory, output_directory=None, processes=None):
+    """parses all svg files of the directory in a process pool and optionally writes their spline data as npz files.
+    returns the spline data per file name, files which failed to parse map to their error message"""
+    file_names = sorted(file_name for file_name in os.listdir(directory) if file_name.endswith(".svg"))
+    file_paths = [os.path.join(directory, file_name) for file_name in file_names]
+    if output_directory is not None:
+        os.makedirs(output_directory, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        results = executor.map(parse_svg_file_into, file_paths, [output_directory] * len(file_paths))
+        return dict(zip(file_names, results))
+
+
+def parse_svg_file_into(file_path, output_directory=None):
+    """parses the file in a worker process, errors are returned as messages to keep the batch going.
+    parse_svg_file raises unexpected errors of the parser as SVGParseError"""
+    try:
+        spline_data = parse_svg_file(file_path)
+    except (SVGParseError, OSError) as error:
+        return str(error)
+    if output_directory is not None:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        spline_data.save(os.path.join(output_directory, name + ".npz"))
+    return spline_data
+
+
+def collect_subpaths(element, transform, subpaths):
+    """appends the subpaths of the drawn shapes below the element with their transform applied"""
+    tag = get_tag(element)
+    if tag in HIDDEN_ELEMENTS or element.get("display") == "none" or "display:none" in element.get("style", "").replace(" ", ""):
+        return
+    transform = multiply_transforms(transform, parse_transform(element.get("transform", "")))
+    for subpath in get_shape_subpaths(element, tag):
+        subpaths.append((apply_transform(transform, subpath[0]), subpath[1]))
+    for child in element:
+        collect_subpaths(child, transform, subpaths)
+
+
+def get_shape_subpaths(element, tag):
+    """returns the subpaths of a shape element as (control polygon, closed) pairs"""
+    if tag == "path":
+        return parse_path_data(element.get("d", ""))
+    if tag in ("polyline", "polygon"):
+        numbers = [float(number) for number in NUMBER.findall(element.get("points", ""))]
+        if len(numbers) < 4:
+            return []
+        path_data = "M" + " ".join(map(repr, numbers[:2])) + " L" + " ".join(map(repr, numbers[2:]))
+        return parse_path_data(path_data + (" Z" if tag == "polygon" else ""))
+    if tag == "line":
+        x1, y1, x2, y2 = (get_length(element, key) for key in ("x1", "y1", "x2", "y2"))
+        return [(lines_to_control_polygon([(x1, y1), (x2, y2)]), False)]
+    if tag == "rect":
+        return get_rectangle_subpaths(element)
+    if tag in ("circle", "ellipse"):
+        radius_x = get_length(element, "r" if tag == "circle" else "rx")
+        radius_y = get_length(element, "r" if tag == "circle" else "ry")
+        if radius_x <= 0 or radius_y <= 0:
+            return []
+        return [get_ellipse_subpath(get_length(element, "cx"), get_length(element, "cy"), radius_x, radius_y)]
+    return []
+
+
+def get_rectangle_subpaths(element):
+    """returns the subpath of a rect element, rounded corners are drawn as arcs"""
+    x, y = get_length(element, "x"), get_length(element, "y")
+    width, height = get_length(element, "width"), get_length(element, "height")
+    if width <= 0 or height <= 0:
+        return []
+    radius_x_text, radius_y_text = element.get("rx"), element.get("ry")  # a single radius applies to both
+    radius_x = parse_length(radius_x_text if radius_x_text is not None else radius_y_text)
+    radius_y = parse_length(radius_y_text if radius_y_text is not None else radius_x_text)
+    radius_x, radius_y = min(radius_x, width / 2), min(radius_y, height / 2)
+    if radius_x <= 0 or radius_y <= 0:
+        return parse_path_data(f"M{x},{y} H{x + width} V{y + height} H{x} Z")
+    return parse_path_data(f"M{x + radius_x},{y} H{x + width - radius_x} A{radius_x},{radius_y} 0 0 1 {x + width},{y + radius_y} "
+                           f"V{y + height - radius_y} A{radius_x},{radius_y} 0 0 1 {x + width - radius_x},{y + height} "
+                           f"H{x + radius_x} A{radius_x},{radius_y} 0 0 1 {x},{y + height - radius_y} "
+                           f"V{y + radius_y} A{radius_x},{radius_y} 0 0 1 {x + radius_x},{y} Z")
+
+
+def get_ellipse_subpath(center_x, center_y, radius_x, radius_y):
+    """returns the closed subpath of an ellipse made of four cubic curves"""
+    tangent_x, tangent_y = KAPPA * radius_x, KAPPA * radius_y
+    right, bottom = (center_x + radius_x, center_y), (center_x, center_y + radius_y)
+    left, top = (center_x - radius_x, center_y), (center_x, center_y - radius_y)
+    polygon = [right,
+               (right[0], right[1] + tangent_y), (bottom[0] + tangent_x, bottom[1]), bottom,
+               (bottom[0] - tangent_x, bottom[1]), (left[0], left[1] + tangent_y), left,
+               (left[0], left[1] - tangent_y), (top[0] - tangent_x, top[1]), top,
+               (top[0] + tangent_x, top[1]), (right[0], right[1] - tangent_y), right]
+    return np.array(polygon, dtype=np.float64), True
+
+
+def parse_path_data(path_data):
+    """returns the subpaths of svg path data as (control polygon, closed) pairs.
+    a control polygon holds the start point followed by the two control points and the end point of every cubic curve,
+    lines and quadratic curves are raised to cubic curves and arcs are approximated by them"""
+    tokens = tokenize(path_data)
+    subpaths = []
+    polygon = None
+    current = start = (0.0, 0.0)
+    previous_control = None  # reflected by the smooth curve commands
+    previous_command = None
+    command = None
+    index = 0
+    while index < len(tokens):
+        if isinstance(tokens[index], str):
+            command = tokens[index]
+            index += 1
+        elif command is None:
+            raise SVGParseError(f"path data does not start with a command: {path_data[:40]!r}")
+        elif command in "Mm":
+            command = "L" if command == "M" else "l"  # coordinates after a move are implicit lines
+        elif command in "Zz":
+            raise SVGParseError(f"numbers after a closepath command: {path_data[:40]!r}")
+        lower = command.lower()
+        count = PARAMETER_COUNTS[lower]
+        parameters = tokens[index:index + count]
+        if len(parameters) < count or any(isinstance(parameter, str) for parameter in parameters):
+            raise SVGParseError(f"command {command} is missing parameters: {path_data[:40]!r}")
+        index += count
+        relative = command.islower()
+        origin = current if relative else (0.0, 0.0)
+        if lower == "z":
+            if polygon is not None:
+                if len(polygon) > 1 and math.dist(polygon[-1], start) > TOLERANCE:
+                    polygon += [polygon[-1], start, start]  # closing line
+                subpaths.append((polygon, True))
+                polygon = None
+            current = start
+            previous_control = None
+            previous_command = lower
+            continue
+        if lower == "m":
+            if polygon is not None:
+                subpaths.append((polygon, False))
+            current = start = (origin[0] + parameters[0], origin[1] + parameters[1])
+            polygon = [current]
+            previous_control = None
+            previous_command = lower
+            continue
+        if polygon is None:  # drawing after a closepath starts a new subpath at its start
+            polygon = [current]
+        if lower in "lhv":
+            if lower == "h":
+                end = (origin[0] + parameters[0], current[1])
+            elif lower == "v":
+                end = (current[0], origin[1] + parameters[0])
+            else:
+                end = (origin[0] + parameters[0], origin[1] + parameters[1])
+            polygon += [current, end, end]
+            previous_control = None
+        elif lower in "cs":
+            if lower == "c":
+                control_ini = (origin[0] + parameters[0], origin[1] + parameters[1])
+                parameters = parameters[2:]
+            else:
+                control_ini = reflect(previous_control, current) if previous_command in ("c", "s") else current
+            control_fin = (origin[0] + parameters[0], origin[1] + parameters[1])
+            end = (origin[0] + parameters[2], origin[1] + parameters[3])
+            polygon += [control_ini, control_fin, end]
+            previous_control = control_fin
+        elif lower in "qt":
+            if lower == "q":
+                control = (origin[0] + parameters[0], origin[1] + parameters[1])
+                parameters = parameters[2:]
+            else:
+                control = reflect(previous_control, current) if previous_command in ("q", "t") else current
+            end = (origin[0] + parameters[0], origin[1] + parameters[1])
+            polygon += [lerp(current, control, 2 / 3), lerp(end, control, 2 / 3), end]
+            previous_control = control
+        else:
+            end = (origin[0] + parameters[5], origin[1] + parameters[6])
+            polygon += get_arc_polygon(current, end, *parameters[:5])
+            previous_control = None
+        current = end
+        previous_command = lower
+    if polygon is not None and len(polygon) > 1:
+        subpaths.append((polygon, False))
+    return [(np.array(polygon, dtype=np.float64), closed) for polygon, closed in subpaths if len(polygon) > 1]
+
+
+def tokenize(path_data):
+    """splits path data into commands and numbers, arc flags may be written without separators"""
+    tokens = []
+    position = 0
+    arc_parameter = None  # index of the next parameter of an arc command
+    while position < len(path_data):
+        if arc_parameter in (3, 4) and path_data[position] in "01":
+            tokens.append(float(path_data[position]))
+            position += 1
+            arc_parameter = (arc_parameter + 1) % 7
+            continue
+        match = TOKEN.match(path_data, position)
+        if match is None:
+            raise SVGParseError(f"unexpected character {path_data[position]!r} in path data at {position}")
+        position = match.end()
+        if match.group(1):
+            tokens.append(match.group(1))
+            arc_parameter = 0 if match.group(1) in "Aa" else None
+        elif match.group(2):
+            tokens.append(float(match.group(2)))
+            if arc_parameter is not None:
+                arc_parameter = (arc_parameter + 1) % 7
+    return tokens
+
+
+def get_arc_polygon(start, end, radius_x, radius_y, rotation, large_arc, sweep):
+    """returns the control points and end points of cubic curves approximating an elliptical arc
+    following the endpoint to center conversion of the svg specification"""
+    if math.dist(start, end) < TOLERANCE:
+        return []
+    radius_x, radius_y = abs(radius_x), abs(radius_y)
+    if radius_x < TOLERANCE or radius_y < TOLERANCE:
+        return [start, end, end]
+    phi = math.radians(rotation)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    half_x, half_y = (start[0] - end[0]) / 2, (start[1] - end[1]) / 2
+    x1 = cos_phi * half_x + sin_phi * half_y
+    y1 = -sin_phi * half_x + cos_phi * half_y
+    scale = x1**2 / radius_x**2 + y1**2 / radius_y**2
+    if scale > 1:  # radii too small to reach the end point are scaled up
+        radius_x, radius_y = radius_x * math.sqrt(scale), radius_y * math.sqrt(scale)
+    numerator = radius_x**2 * radius_y**2 - radius_x**2 * y1**2 - radius_y**2 * x1**2
+    denominator = radius_x**2 * y1**2 + radius_y**2 * x1**2
+    factor = math.sqrt(max(numerator, 0) / denominator)
+    if bool(large_arc) == bool(sweep):
+        factor = -factor
+    center_x1, center_y1 = factor * radius_x * y1 / radius_y, -factor * radius_y * x1 / radius_x
+    center_x = cos_phi * center_x1 - sin_phi * center_y1 + (start[0] + end[0]) / 2
+    center_y = sin_phi * center_x1 + cos_phi * center_y1 + (start[1] + end[1]) / 2
+    angle_ini = math.atan2((y1 - center_y1) / radius_y, (x1 - center_x1) / radius_x)
+    angle_fin = math.atan2((-y1 - center_y1) / radius_y, (-x1 - center_x1) / radius_x)
+    delta = angle_fin - angle_ini
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    curve_count = max(1, math.ceil(abs(delta) / (math.pi / 2) - TOLERANCE))
+    step = delta / curve_count
+    tangent_length = 4 / 3 * math.tan(step / 4)
+
+    def get_point(angle):
+        x, y = radius_x * math.cos(angle), radius_y * math.sin(angle)
+        return (center_x + cos_phi * x - sin_phi * y, center_y + sin_phi * x + cos_phi * y)
+
+    def get_derivative(angle):
+        x, y = -radius_x * math.sin(angle), radius_y * math.cos(angle)
+        return (cos_phi * x - sin_phi * y, sin_phi * x + cos_phi * y)
+
+    polygon = []
+    for curve in range(curve_count):
+        angle_a, angle_b = angle_ini + curve * step, angle_ini + (curve + 1) * step
+        point_a, point_b = get_point(angle_a), get_point(angle_b)
+        derivative_a, derivative_b = get_derivative(angle_a), get_derivative(angle_b)
+        polygon += [(point_a[0] + tangent_length * derivative_a[0], point_a[1] + tangent_length * derivative_a[1]),
+                    (point_b[0] - tangent_length * derivative_b[0], point_b[1] - tangent_length * derivative_b[1]),
+                    point_b]
+    polygon[-1] = end  # avoids drift of the end point
+    return polygon
+
+
+def create_spline_data(subpaths):
+    """converts the control polygons into knots with relative tangents, curves ending where a closed subpath starts are merged"""
+    points, tangents_left, tangents_right, segment_counts, segment_closed = [], [], [], [], []
+    for polygon, closed in subpaths:
+        knots = polygon[0::3]
+        left = np.zeros_like(knots)
+        right = np.zeros_like(knots)
+        right[:-1] = polygon[1::3] - knots[:-1]
+        left[1:] = polygon[2::3] - knots[1:]
+        if closed and len(knots) > 2 and np.allclose(knots[0], knots[-1], atol=TOLERANCE):
+            left[0] = left[-1]
+            knots, left, right = knots[:-1], left[:-1], right[:-1]
+        points.append(knots)
+        tangents_left.append(left)
+        tangents_right.append(right)
+        segment_counts.append(len(knots))
+        segment_closed.append(closed)
+    if not points:
+        raise SVGParseError("no drawn shapes found")
+    flip = np.array([1.0, -1.0])  # svg y points downwards
+    return SplineData(to_vectors(np.concatenate(points) * flip), to_vectors(np.concatenate(tangents_left) * flip),
+                      to_vectors(np.concatenate(tangents_right) * flip), np.array(segment_counts, dtype=np.int64),
+                      np.array(segment_closed, dtype=bool))
+
+
+def to_vectors(coordinates):
+    """appends the z coordinate to the 2d coordinates"""
+    return np.column_stack([coordinates, np.zeros(len(coordinates))])
+
+
+def get_viewport_transform(root):
+    """returns the transform mapping the viewbox of the svg to its width and height"""
+    view_box = [float(number) for number in NUMBER.findall(root.get("viewBox", ""))]
+    if len(view_box) != 4 or view_box[2] <= 0 or view_box[3] <= 0:
+        return IDENTITY
+    min_x, min_y, width, height = view_box
+    viewport_width = parse_length(root.get("width"), default=width)
+    viewport_height = parse_length(root.get("height"), default=height)
+    scale_x, scale_y = viewport_width / width, viewport_height / height
+    aspect_ratio = [word for word in root.get("preserveAspectRatio", "").split() if word != "defer"] or ["xMidYMid", "meet"]
+    if aspect_ratio[0] == "none":
+        return (scale_x, 0, 0, scale_y, -min_x * scale_x, -min_y * scale_y)
+    scale = max(scale_x, scale_y) if aspect_ratio[-1] == "slice" else min(scale_x, scale_y)
+    align = aspect_ratio[0]
+    offset_x = {"xMin": 0, "xMax": 1}.get(align[:4], 0.5) * (viewport_width - width * scale)
+    offset_y = {"YMin": 0, "YMax": 1}.get(align[4:], 0.5) * (viewport_height - height * scale)
+    return (scale, 0, 0, scale, offset_x - min_x * scale, offset_y - min_y * scale)
+
+
+def parse_transform(text):
+    """returns the affine transform of a transform attribute"""
+    transform = IDENTITY
+    for name, arguments in TRANSFORM.findall(text):
+        values = [float(number) for number in NUMBER.findall(arguments)]
+        if name == "matrix" and len(values) == 6:
+            step = tuple(values)
+        elif name == "translate" and values:
+            step = (1, 0, 0, 1, values[0], values[1] if len(values) > 1 else 0)
+        elif name == "scale" and values:
+            step = (values[0], 0, 0, values[1] if len(values) > 1 else values[0], 0, 0)
+        elif name == "rotate" and values:
+            angle = math.radians(values[0])
+            step = (math.cos(angle), math.sin(angle), -math.sin(angle), math.cos(angle), 0, 0)
+            if len(values) == 3:  # rotation around a point
+                step = multiply_transforms(multiply_transforms((1, 0, 0, 1, values[1], values[2]), step), (1, 0, 0, 1, -values[1], -values[2]))
+        elif name == "skewX" and values:
+            step = (1, 0, math.tan(math.radians(values[0])), 1, 0, 0)
+        elif name == "skewY" and values:
+            step = (1, math.tan(math.radians(values[0])), 0, 1, 0, 0)
+        else:
+            raise SVGParseError(f"invalid transform {name}({arguments})")
+        transform = multiply_transforms(transform, step)
+    return transform
+
+
+def multiply_transforms(first, second):
+    """returns the transform applying the second transform and then the first"""
+    a1, b1, c1, d1, e1, f1 = first
+    a2, b2, c2, d2, e2, f2 = second
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2, a1 * c2 + c1 * d2,
+            b1 * c2 + d1 * d2, a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+def apply_transform(transform, coordinates):
+    """returns the (n, 2) coordinates mapped by the transform"""
+    a, b, c, d, e, f = transform
+    return coordinates @ np.array([[a, b], [c, d]]) + np.array([e, f])
+
+
+def lines_to_control_polygon(points):
+    polygon = [points[0]]
+    for point in points[1:]:
+        polygon += [polygon[-1], point, point]
+    return np.array(polygon, dtype=np.float64)
+
+
+def reflect(point, center):
+    return (2 * center[0] - point[0], 2 * center[1] - point[1])
+
+
+def lerp(point_a, point_b, weight):
+    return (point_a[0] + (point_b[0] - point_a[0]) * weight, point_a[1] + (point_b[1] - point_a[1]) * weight)
+
+
+def get_tag(element):
+    """returns the tag of the element without its namespace"""
+    return element.tag.rsplit("}", 1)[-1] if isinstance(element.tag, str) else ""
+
+
+def get_length(element, key):
+    return parse_length(element.get(key), default=0.0)
+
+
+def parse_length(text, default=0.0):
+    """converts a length attribute into user units, percentages fall back to the default"""
+    if text is None:
+        return default
+    match = re.fullmatch(r"\s*(" + NUMBER.pattern + r")\s*([a-z]*)\s*", text)
+    if match is None or match.group(2) not in UNITS:
+        return default
+    return float(match.group(1)) * UNITS[match.group(2)]
+
+
+if __name__ == "__main__":
+    results = parse_svg_directory(sys.argv[1], output_directory=sys.argv[2] if len(sys.argv) > 2 else None)
+    failures = 0
+    for file_name, result in results.items():
+        print(f"{file_name:<32} {result}")
+        failures += isinstance(result, str)
+    sys.exit(1 if failures else 0)
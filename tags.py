@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from pydeation.constants import WHITE
+from pydeation.xpresso.graph import XGraph
 import c4d
 
 
@@ -107,6 +108,7 @@ class XPressoTag(Tag):
     def __init__(self, priority=0, priority_mode="animation", **kwargs):
         super().__init__(**kwargs)
         self.set_priority(priority, mode=priority_mode)
+        self.graph = XGraph(self.obj, host=self.linked_object.obj, owner=self.linked_object)  # holds the nodes of the tag until they are materialized
 
     def specify_tag_type(self):
         self.obj = c4d.BaseTag(c4d.Texpresso)
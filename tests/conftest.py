@@ -0,0 +1,14 @@
+import os
+import sys
+import types
+
+# the repository is the pydeation package itself, make it importable under its name
+PACKAGE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "pydeation" not in sys.modules:
+    package = types.ModuleType("pydeation")
+    package.__path__ = [PACKAGE_PATH]
+    sys.modules["pydeation"] = package
+
+# outside of cinema 4d the recording stand-in is imported as c4d
+from pydeation.recording.recorder import install
+install()
@@ -0,0 +1,103 @@
+from pydeation.animation.animation import BoolAnimation
+from pydeation.animation.evaluator import TimelineEvaluator
+from pydeation.animation.timeline import desc_id_key
+import numpy as np
+import c4d
+
+POSITION_X = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0),
+                        c4d.DescLevel(c4d.VECTOR_X, c4d.DTYPE_REAL, 0))
+VISIBILITY = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_VISIBILITY_EDITOR, c4d.DTYPE_LONG, 0))
+
+
+class PlayedAnimation:
+    """holds what the evaluator reads from an executed scalar animation"""
+
+    def __init__(self, target, desc_id, start, stop, value_ini, value_fin):
+        self.target = target
+        self.desc_id = desc_id
+        self.global_start = start
+        self.global_stop = stop
+        self.value_ini = value_ini
+        self.value_fin = value_fin
+
+
+class PlayedStep(BoolAnimation):
+    """holds what the evaluator reads from an executed bool animation"""
+
+    def __init__(self, target, desc_id, time, value):
+        self.target = target
+        self.desc_id = desc_id
+        self.global_start = self.global_stop = time
+        self.value = value
+
+
+def evaluate_brute_force(animations, track, time, interpolation):
+    """returns the value of the track at the time from the latest animation started at or before it"""
+    track_animations = sorted((animation for animation in animations if (animation.target, desc_id_key(animation.desc_id)) == track),
+                              key=lambda animation: animation.global_start)
+    started = [animation for animation in track_animations if animation.global_start <= time]
+    if not started:
+        first = track_animations[0]
+        return first.value if isinstance(first, BoolAnimation) else first.value_ini
+    animation = started[-1]
+    if isinstance(animation, BoolAnimation):
+        return animation.value
+    duration = animation.global_stop - animation.global_start
+    progress = 1 if duration <= 0 else min(max((time - animation.global_start) / duration, 0), 1)
+    if interpolation == "spline":
+        progress = progress * progress * (3 - 2 * progress)
+    return animation.value_ini + (animation.value_fin - animation.value_ini) * progress
+
+
+def get_animations():
+    circle, square = object(), object()
+    return [
+        PlayedAnimation(circle, POSITION_X, 0, 2, 0, 10),
+        PlayedAnimation(circle, POSITION_X, 1, 3, 10, 20),  # overlaps the previous animation
+        PlayedAnimation(circle, POSITION_X, 5, 5, 20, 30),  # no duration
+        PlayedAnimation(square, POSITION_X, 2, 4, -5, 5),
+        PlayedStep(circle, VISIBILITY, 0.5, 1),
+        PlayedStep(circle, VISIBILITY, 1.5, 0),
+        PlayedStep(circle, VISIBILITY, 1.5, 1),  # later state change at the same time wins
+    ]
+
+
+def get_times(animations):
+    """returns times before, at and between the boundaries of the animations and outside of the timeline"""
+    boundaries = sorted({time for animation in animations for time in (animation.global_start, animation.global_stop)})
+    middles = [(start + stop) / 2 for start, stop in zip(boundaries, boundaries[1:])]
+    return np.array(sorted(boundaries + middles + [-100, -1, 0.25, 4.999, 100]))
+
+
+def test_evaluator_matches_brute_force():
+    animations = get_animations()
+    times = get_times(animations)
+    for interpolation in ("spline", "linear"):
+        evaluator = TimelineEvaluator(animations, interpolation=interpolation)
+        assert len(evaluator) == 3
+        values = evaluator.evaluate(times)
+        expected = [[evaluate_brute_force(animations, track, time, interpolation) for time in times] for track in evaluator.tracks]
+        assert np.allclose(values, expected)
+
+
+def test_evaluator_holds_steps_from_their_time_on():
+    animations = get_animations()
+    evaluator = TimelineEvaluator(animations)
+    circle = animations[0].target
+    values = evaluator.evaluate_track(circle, VISIBILITY, [0, 0.5, 1, 1.5, 10])
+    assert list(values) == [1, 1, 1, 1, 1]
+    values = evaluator.evaluate_track(circle, VISIBILITY, [0.5, 1.49])
+    assert list(values) == [1, 1]
+    evaluator = TimelineEvaluator(animations[4:6])
+    assert list(evaluator.evaluate_track(circle, VISIBILITY, [0, 0.5, 1.49, 1.5, 10])) == [1, 1, 1, 0, 0]
+
+
+def test_evaluator_reports_overlaps_on_the_same_track():
+    evaluator = TimelineEvaluator(get_animations())
+    overlaps = evaluator.find_overlaps()
+    assert [(start, stop) for track, start, stop in overlaps] == [(1, 2)]
+
+
+def test_evaluator_without_animations():
+    evaluator = TimelineEvaluator([])
+    assert evaluator.evaluate([0, 1]).shape == (0, 2)
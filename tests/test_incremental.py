@@ -0,0 +1,104 @@
+from pydeation.scene import TwoDScene
+from pydeation.objects.line_objects import Circle, Rectangle
+from pydeation.animation.abstract_animators import Create, Move
+from pydeation.incremental import previous_builds
+import importlib
+import textwrap
+import c4d
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_previous_builds():
+    previous_builds.clear()
+    yield
+    previous_builds.clear()
+
+
+class ArgumentScene(TwoDScene):
+    """constructs one object depending on a class attribute and one that does not"""
+
+    radius = 100
+
+    def construct(self):
+        self.circle = Circle(radius=self.radius)
+        self.rectangle = Rectangle()
+        self.play(Create(self.circle), Move(self.rectangle, x=10))
+
+
+def get_objects(document):
+    return [obj.GetName() for obj in document.iterate_objects()]
+
+
+def test_changed_construction_arguments_rebuild_only_the_affected_object():
+    first = ArgumentScene(incremental=True)
+    assert first.incremental_build is not None
+    assert first.incremental_build.created == [first.camera, first.circle, first.rectangle]
+    ArgumentScene.radius = 150
+    try:
+        second = ArgumentScene(incremental=True)
+    finally:
+        ArgumentScene.radius = 100
+    assert second.document is first.document
+    assert second.rectangle is first.rectangle  # reused including its c4d object
+    assert second.circle is not first.circle
+    assert second.incremental_build.reused == [first.camera, first.rectangle]
+    assert second.incremental_build.created == [second.circle]
+    assert second.incremental_build.removed == [first.circle]
+    assert first.circle.obj.GetDocument() is None
+    assert second.circle.obj[c4d.PRIM_CIRCLE_RADIUS] == 150
+    assert sorted(get_objects(second.document)) == sorted(get_objects(first.document))
+
+
+def test_unchanged_scene_reuses_every_object():
+    first = ArgumentScene(incremental=True)
+    second = ArgumentScene(incremental=True)
+    assert second.incremental_build.created == []
+    assert second.incremental_build.removed == []
+    assert second.incremental_build.reused == [first.camera, first.circle, first.rectangle]
+
+
+BASE_SOURCE = """
+from pydeation.objects.line_objects import Circle
+
+
+class BaseShape(Circle):
+
+    def __init__(self, **kwargs):
+        super().__init__(radius={radius}, **kwargs)
+"""
+
+DERIVED_SOURCE = """
+from incremental_base import BaseShape
+
+
+class Shape(BaseShape):
+    pass
+"""
+
+
+def test_changed_base_class_source_rebuilds_the_derived_objects(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr("sys.dont_write_bytecode", True)
+    base_path = tmp_path / "incremental_base.py"
+    base_path.write_text(textwrap.dedent(BASE_SOURCE.format(radius=100)))
+    (tmp_path / "incremental_derived.py").write_text(textwrap.dedent(DERIVED_SOURCE))
+    import incremental_base
+    import incremental_derived
+
+    class ShapeScene(TwoDScene):
+
+        def construct(self):
+            self.shape = incremental_derived.Shape()
+            self.rectangle = Rectangle()
+
+    first = ShapeScene(incremental=True)
+    base_path.write_text(textwrap.dedent(BASE_SOURCE.format(radius=1000)))  # the derived source is unchanged
+    importlib.reload(incremental_base)
+    importlib.reload(incremental_derived)
+    second = ShapeScene(incremental=True)
+    assert second.rectangle is first.rectangle
+    assert second.shape is not first.shape
+    assert second.incremental_build.created == [second.shape]
+    assert second.incremental_build.removed == [first.shape]
+    assert second.shape.obj[c4d.PRIM_CIRCLE_RADIUS] == 1000
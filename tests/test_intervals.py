@@ -0,0 +1,118 @@
+from pydeation.animation.intervals import Interval, IntervalTree, AnimationIndex
+from pydeation.animation.timeline import desc_id_key
+import random
+import c4d
+
+POSITION_X = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0),
+                        c4d.DescLevel(c4d.VECTOR_X, c4d.DTYPE_REAL, 0))
+POSITION_Y = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0),
+                        c4d.DescLevel(c4d.VECTOR_Y, c4d.DTYPE_REAL, 0))
+
+
+class PlayedAnimation:
+    """holds what the index reads from an executed animation"""
+
+    def __init__(self, target, desc_id, start, stop):
+        self.target = target
+        self.desc_id = desc_id
+        self.global_start = start
+        self.global_stop = stop
+
+
+def get_intervals(count=300, seed=0):
+    """returns random intervals on integer times such that many queries hit their boundaries, some without duration"""
+    generator = random.Random(seed)
+    intervals = []
+    for index in range(count):
+        start = generator.randint(0, 50)
+        stop = start if index % 5 == 0 else start + generator.randint(1, 10)
+        intervals.append(Interval(start, stop, index=index))
+    return intervals
+
+
+def get_indices(intervals):
+    return sorted(interval.index for interval in intervals)
+
+
+def test_point_queries_match_a_linear_scan():
+    intervals = get_intervals()
+    tree = IntervalTree(intervals)
+    assert len(tree) == len(intervals)
+    for time in [-1, 0, 0.5, 7, 25, 25.5, 60, 61]:
+        expected = [interval for interval in intervals if interval.start <= time <= interval.stop]
+        assert get_indices(tree.query_point(time)) == get_indices(expected)
+
+
+def test_range_queries_match_a_linear_scan():
+    intervals = get_intervals()
+    tree = IntervalTree(intervals)
+    for start, stop in [(-5, -1), (-5, 0), (0, 0), (3, 3), (10, 12.5), (20, 40), (59, 70), (61, 70)]:
+        expected = [interval for interval in intervals if interval.start <= stop and start <= interval.stop]
+        assert get_indices(tree.query_range(start, stop)) == get_indices(expected)
+
+
+def test_empty_tree():
+    tree = IntervalTree([])
+    assert tree.query_point(0) == []
+    assert tree.query_range(0, 1) == []
+
+
+def get_animations(count=120, seed=1):
+    generator = random.Random(seed)
+    targets = [object() for i in range(3)]
+    animations = []
+    for index in range(count):
+        start = generator.randint(0, 40)
+        stop = start if index % 7 == 0 else start + generator.randint(1, 6)
+        animations.append(PlayedAnimation(generator.choice(targets), generator.choice([POSITION_X, POSITION_Y]), start, stop))
+    return animations
+
+
+def get_track(animation):
+    return (animation.target, desc_id_key(animation.desc_id))
+
+
+def test_conflicts_match_a_linear_scan():
+    animations = get_animations()
+    index = AnimationIndex(animations)
+    expected = set()
+    for i, animation in enumerate(animations):
+        for other in animations[i + 1:]:
+            interval = Interval(animation.global_start, animation.global_stop)
+            other_interval = Interval(other.global_start, other.global_stop)
+            if get_track(animation) == get_track(other) and interval.overlaps(other_interval):
+                expected.add((id(animation), id(other)))
+    conflicts = {(id(animation), id(other)) for track, animation, other in index.find_conflicts()}
+    assert expected
+    assert conflicts == expected
+
+
+def test_active_animations_match_a_linear_scan():
+    animations = get_animations()
+    index = AnimationIndex(animations)
+    for time in [0, 3, 3.5, 20, 46, 47]:
+        expected = {id(animation) for animation in animations if animation.global_start <= time <= animation.global_stop}
+        assert {id(animation) for animation in index.get_active(time)} == expected
+        animation = animations[0]
+        expected_on_track = {id(other) for other in animations
+                             if get_track(other) == get_track(animation) and other.global_start <= time <= other.global_stop}
+        assert {id(other) for other in index.get_active_on_track(animation.target, animation.desc_id, time)} == expected_on_track
+    expected = {id(animation) for animation in animations if animation.global_start <= 12 and 10 <= animation.global_stop}
+    assert {id(animation) for animation in index.get_active_in_range(10, 12)} == expected
+
+
+def test_overlaps_only_share_more_than_a_boundary():
+    assert not Interval(0, 1).overlaps(Interval(1, 2))
+    assert Interval(0, 2).overlaps(Interval(1, 3))
+    assert Interval(0, 2).overlaps(Interval(1, 1))  # state change inside an animation
+    assert not Interval(0, 2).overlaps(Interval(2, 2))  # state change at the stop
+    assert Interval(1, 1).overlaps(Interval(1, 1))
+
+
+def test_activity_and_idle_spans():
+    target = object()
+    animations = [PlayedAnimation(target, POSITION_X, 0, 2), PlayedAnimation(target, POSITION_Y, 1, 3),
+                  PlayedAnimation(target, POSITION_X, 5, 6)]
+    index = AnimationIndex(animations)
+    assert index.get_activity_spans(target) == [(0, 3), (5, 6)]
+    assert index.get_idle_spans(target, 0, 10) == [(3, 5), (6, 10)]
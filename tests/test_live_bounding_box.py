@@ -0,0 +1,23 @@
+import pydeation.scene
+from pydeation.objects.custom_objects import Node
+from pydeation.objects.line_objects import Circle
+
+
+def test_live_bounding_box_is_created_on_first_access():
+    circle = Circle()
+    assert "live_bounding_box_parameters" not in circle.__dict__
+    width_parameter = circle.width_parameter
+    assert circle.get_live_bounding_box_parameters()["width_parameter"] is width_parameter
+    assert circle.center_parameter is circle.get_live_bounding_box_parameters()["center_parameter"]
+
+
+def test_live_bounding_box_keeps_parameters_of_subclasses():
+    node = Node(text="Node")
+    width_parameter = node.width_parameter
+    height_parameter = node.height_parameter
+    center_parameter = node.center_parameter  # creates the live bounding box
+    assert node.width_parameter is width_parameter
+    assert node.height_parameter is height_parameter
+    live_parameters = node.get_live_bounding_box_parameters()
+    assert live_parameters["center_parameter"] is center_parameter
+    assert live_parameters["width_parameter"] is not width_parameter
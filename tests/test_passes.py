@@ -0,0 +1,128 @@
+import pydeation.scene
+from pydeation.objects.abstract_objects import CustomObject
+from pydeation.objects.line_objects import Circle
+from pydeation.xpresso.userdata import UAngle
+from pydeation.xpresso.xpressions import XRelation
+from pydeation.xpresso.graph import GraphRegistry
+from pydeation.xpresso.passes import fold_static_relations, get_descendants
+from pydeation.animation.timeline import Timeline
+from pydeation.constants import ROT_B
+import c4d
+
+
+class Lever(CustomObject):
+    """turns its arm by half of its angle"""
+
+    def __init__(self, formula="Angle/2", **kwargs):
+        self.formula = formula
+        super().__init__(**kwargs)
+
+    def specify_parts(self):
+        self.arm = Circle(name="Arm")
+        self.parts += [self.arm]
+
+    def specify_parameters(self):
+        self.angle_parameter = UAngle(name="Angle", default_value=1.0)
+        self.parameters += [self.angle_parameter]
+
+    def specify_relations(self):
+        self.arm_relation = XRelation(part=self.arm, whole=self, desc_ids=[ROT_B],
+                                      parameters=[self.angle_parameter], formula=self.formula)
+
+
+class ChainedLever(CustomObject):
+    """turns its arm by an angle derived from its own angle in two relations"""
+
+    def specify_parts(self):
+        self.arm = Circle(name="Arm")
+        self.parts += [self.arm]
+
+    def specify_parameters(self):
+        self.angle_parameter = UAngle(name="Angle", default_value=1.0)
+        self.half_angle_parameter = UAngle(name="HalfAngle", default_value=0.0)
+        self.parameters += [self.angle_parameter, self.half_angle_parameter]
+
+    def specify_relations(self):
+        # the relation reading the half angle comes first such that it can only be folded in a second round
+        self.arm_relation = XRelation(part=self.arm, whole=self, desc_ids=[ROT_B],
+                                      parameters=[self.half_angle_parameter], formula="HalfAngle*3")
+        self.half_angle_relation = XRelation(part=self, whole=self, desc_ids=[self.half_angle_parameter.desc_id],
+                                             parameters=[self.angle_parameter], formula="Angle/2")
+
+
+def construct(create):
+    """returns the result of create and the graphs recorded while calling it"""
+    registry = GraphRegistry()
+    registry.activate()
+    try:
+        result = create()
+    finally:
+        registry.deactivate()
+    return result, registry.graphs
+
+
+def is_folded(relation):
+    graph = relation.xgroup.graph
+    nodes = set(get_descendants(relation.xgroup.obj))
+    return relation not in graph.relations and not nodes & set(graph.nodes)
+
+
+def test_relations_of_static_parameters_are_folded():
+    lever, graphs = construct(Lever)
+    assert not is_folded(lever.arm_relation)
+    assert fold_static_relations(graphs) > 0
+    assert is_folded(lever.arm_relation)
+    assert lever.arm.obj[ROT_B] == 0.5
+    assert type(lever.arm.obj[ROT_B]) is float
+
+
+def test_relations_of_animated_parameters_are_kept():
+    lever, graphs = construct(Lever)
+    Timeline(deferred=False).add_key(lever, lever.angle_parameter.desc_id, c4d.BaseTime(1), 2.0)
+    fold_static_relations(graphs)
+    assert not is_folded(lever.arm_relation)
+    assert lever.arm.obj[ROT_B] == 0.0
+
+
+def test_parameters_written_by_other_object_nodes_are_kept():
+    def create():
+        lever = Lever()
+        same_tag_relation = XRelation(part=lever.arm, whole=lever, desc_ids=[ROT_B],
+                                      parameters=[lever.angle_parameter], formula="Angle")
+        return lever, same_tag_relation
+
+    (lever, same_tag_relation), graphs = construct(create)
+    fold_static_relations(graphs)
+    assert not is_folded(lever.arm_relation)
+    assert not is_folded(same_tag_relation)
+
+    def create():
+        lever = Lever()
+        other_lever = Lever()
+        other_tag_relation = XRelation(part=lever.arm, whole=other_lever, desc_ids=[ROT_B],
+                                       parameters=[other_lever.angle_parameter], formula="Angle")
+        return lever, other_lever, other_tag_relation
+
+    (lever, other_lever, other_tag_relation), graphs = construct(create)
+    assert other_tag_relation.xgroup.graph is not lever.arm_relation.xgroup.graph
+    fold_static_relations(graphs)
+    assert not is_folded(lever.arm_relation)
+    assert not is_folded(other_tag_relation)
+    assert is_folded(other_lever.arm_relation)
+    assert lever.arm.obj[ROT_B] == 0.0
+
+
+def test_chained_relations_are_folded_in_turn():
+    lever, graphs = construct(ChainedLever)
+    fold_static_relations(graphs)
+    assert is_folded(lever.half_angle_relation)
+    assert is_folded(lever.arm_relation)
+    assert lever.obj[lever.half_angle_parameter.desc_id] == 0.5
+    assert lever.arm.obj[ROT_B] == 1.5
+
+
+def test_relations_failing_to_evaluate_are_kept():
+    lever, graphs = construct(lambda: Lever(formula="Angle/(Angle-Angle)"))
+    fold_static_relations(graphs)
+    assert not is_folded(lever.arm_relation)
+    assert lever.arm.obj[ROT_B] == 0.0
@@ -0,0 +1,78 @@
+import pydeation.scene
+from pydeation.objects.custom_objects import Group
+from pydeation.objects.helper_objects import Null
+from pydeation.objects.line_objects import Spline
+from pydeation.spline_geometry import SplineGeometry, SegmentBVH
+import c4d
+import numpy as np
+
+KAPPA = 0.5522847498  # tangent length of the bezier approximation of a quarter circle
+
+
+def get_circle(radius=100):
+    """returns the geometry of a closed bezier circle of four points"""
+    angles = np.arange(4) * np.pi / 2
+    points = np.stack((np.cos(angles), np.sin(angles), np.zeros(4)), axis=1) * radius
+    directions = np.stack((-np.sin(angles), np.cos(angles), np.zeros(4)), axis=1) * radius * KAPPA
+    return SplineGeometry(points, -directions, directions, segment_closed=[True])
+
+
+def get_point_distances(points, starts, ends):
+    """returns the distances of the points to their nearest piece by brute force"""
+    directions = ends - starts
+    fractions = np.einsum("qpi,pi->qp", points[:, np.newaxis] - starts, directions) / np.einsum("pi,pi->p", directions, directions)
+    nearest = starts + np.clip(fractions, 0, 1)[..., np.newaxis] * directions
+    return np.linalg.norm(nearest - points[:, np.newaxis], axis=-1).min(axis=1)
+
+
+def test_circle_length():
+    assert np.isclose(get_circle(radius=100).get_length(), 2 * np.pi * 100, rtol=1e-3)
+
+
+def test_resample_spaces_points_evenly():
+    positions, tangents = get_circle(radius=100).resample(32)
+    assert positions.shape == (1, 32, 3)
+    radii = np.linalg.norm(positions[0], axis=1)
+    assert np.allclose(radii, 100, rtol=1e-3)
+    gaps = np.linalg.norm(np.roll(positions[0], -1, axis=0) - positions[0], axis=1)
+    assert np.allclose(gaps, gaps.mean(), rtol=1e-3)
+    assert np.allclose(np.einsum("ij,ij->i", tangents[0], positions[0] / radii[:, np.newaxis]), 0, atol=1e-2)
+
+
+def test_resample_skips_segments_of_a_single_point():
+    circle = get_circle()
+    points = np.concatenate((circle.points, [(300, 0, 0)]))
+    tangents_left = np.concatenate((circle.tangents_left, np.zeros((1, 3))))
+    tangents_right = np.concatenate((circle.tangents_right, np.zeros((1, 3))))
+    geometry = SplineGeometry(points, tangents_left, tangents_right, segment_counts=[4, 1], segment_closed=[True, False])
+    positions, tangents = geometry.resample(8)
+    assert np.isfinite(positions[0]).all() and np.isfinite(tangents[0]).all()
+    assert np.isnan(positions[1]).all()
+
+
+def test_nearest_pieces_match_brute_force():
+    random = np.random.default_rng(0)
+    points = np.cumsum(random.normal(size=(200, 3)), axis=0)
+    geometry = SplineGeometry(points, interpolation="linear")
+    queries = random.uniform(points.min(axis=0), points.max(axis=0), size=(500, 3))
+    pieces, fractions = SegmentBVH(geometry.piece_starts, geometry.piece_ends).query(queries)
+    starts, ends = geometry.piece_starts[pieces], geometry.piece_ends[pieces]
+    distances = np.linalg.norm(starts + fractions[:, np.newaxis] * (ends - starts) - queries, axis=1)
+    assert np.allclose(distances, get_point_distances(queries, geometry.piece_starts, geometry.piece_ends))
+    positions, segments, offsets, nearest_distances = geometry.get_nearest_points(queries)
+    assert np.allclose(nearest_distances, distances)
+
+
+def test_segments_without_points_have_no_curves():
+    geometry = SplineGeometry(np.zeros((0, 3)), segment_counts=[0], segment_closed=[False], interpolation="linear")
+    assert geometry.get_length() == 0
+    assert np.isnan(geometry.evaluate([0, 0.5])[0]).all()
+
+
+def test_group_is_positioned_evenly_along_a_spline():
+    spline = Spline(points=[(0, 0, 0), (100, 0, 0), (100, 300, 0)], spline_type="linear")
+    group = Group(*[Null() for i in range(4)])
+    group.position_on_spline(spline)
+    positions = [child.obj[c4d.ID_BASEOBJECT_POSITION] for child in group.children]
+    assert np.allclose([(position.x, position.y, position.z) for position in positions],
+                       [(0, 0, 0), (100, 0, 0), (100, 100, 0), (100, 200, 0)])
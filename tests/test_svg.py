@@ -0,0 +1,142 @@
+from pydeation.svg import parse_path, parse_svg_file, parse_svg_file_into, parse_svg_directory, load_spline_data, SVGParseError
+import numpy as np
+import pytest
+import os
+
+ASSETS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "svg")
+
+
+def get_points(spline_data):
+    """returns the 2d points in svg coordinates where y points downwards"""
+    return spline_data.points[:, :2] * (1, -1)
+
+
+def assert_same_spline(spline_data, other):
+    assert np.allclose(spline_data.points, other.points)
+    assert np.allclose(spline_data.tangents_left, other.tangents_left)
+    assert np.allclose(spline_data.tangents_right, other.tangents_right)
+    assert list(spline_data.segment_counts) == list(other.segment_counts)
+    assert list(spline_data.segment_closed) == list(other.segment_closed)
+
+
+def write_svg(directory, content, attributes='viewBox="0 0 10 10" width="100" height="50"', name="drawing.svg"):
+    path = directory / name
+    path.write_text(f'<svg xmlns="http://www.w3.org/2000/svg" {attributes}>{content}</svg>')
+    return str(path)
+
+
+@pytest.mark.parametrize("absolute, relative", [
+    ("M10 20 L30 40 H50 V60 Z", "m10 20 l20 20 h20 v20 z"),
+    ("M0 0 C10 0 20 10 20 20 S30 40 40 40", "m0 0 c10 0 20 10 20 20 s10 20 20 20"),
+    ("M0 0 Q10 10 20 0 T40 0", "m0 0 q10 10 20 0 t20 0"),
+    ("M0 0 A10 10 0 0 1 20 0", "m0 0 a10 10 0 0 1 20 0"),
+    ("M0 0 L10 0 L10 10", "m0 0 10 0 0 10"),  # coordinates after a move are lines
+])
+def test_relative_commands_match_absolute_ones(absolute, relative):
+    assert_same_spline(parse_path(relative), parse_path(absolute))
+
+
+def test_lines_and_closepath():
+    spline_data = parse_path("M10 20 L30 40 H50 V60 Z")
+    assert np.allclose(get_points(spline_data), [(10, 20), (30, 40), (50, 40), (50, 60)])
+    assert list(spline_data.segment_closed) == [True]
+    assert np.allclose(spline_data.tangents_left, 0) and np.allclose(spline_data.tangents_right, 0)
+
+
+def test_smooth_curves_reflect_the_previous_control_point():
+    cubic = parse_path("M0 0 C10 0 20 10 20 20 S30 40 40 40")
+    assert np.allclose(get_points(cubic), [(0, 0), (20, 20), (40, 40)])
+    assert np.allclose(cubic.tangents_left[1, :2] * (1, -1), (0, -10))
+    assert np.allclose(cubic.tangents_right[1, :2] * (1, -1), (0, 10))
+    quadratic = parse_path("M0 0 Q10 10 20 0 T40 0")
+    assert np.allclose(get_points(quadratic), [(0, 0), (20, 0), (40, 0)])
+    assert np.allclose(quadratic.tangents_left[1, :2] * (1, -1), (-20 / 3, 20 / 3))
+    assert np.allclose(quadratic.tangents_right[1, :2] * (1, -1), (20 / 3, -20 / 3))
+
+
+def test_relative_move_after_closepath_starts_at_the_subpath_start():
+    spline_data = parse_path("M10 10 h10 v10 z m5 5 h1 v1 z")
+    assert list(spline_data.segment_counts) == [3, 3]
+    assert list(spline_data.segment_closed) == [True, True]
+    assert np.allclose(get_points(spline_data), [(10, 10), (20, 10), (20, 20), (15, 15), (16, 15), (16, 16)])
+
+
+def test_drawing_after_closepath_continues_from_the_subpath_start():
+    spline_data = parse_path("M10 10 h10 v10 z l5 0")
+    assert list(spline_data.segment_closed) == [True, False]
+    assert np.allclose(get_points(spline_data)[3:], [(10, 10), (15, 10)])
+
+
+def test_arc_flags():
+    semicircle = get_points(parse_path("M0 0 A10 10 0 0 1 20 0"))
+    assert np.allclose(semicircle, [(0, 0), (10, -10), (20, 0)])
+    assert np.allclose(get_points(parse_path("M0 0 A10 10 0 0 0 20 0")), [(0, 0), (10, 10), (20, 0)])
+    small_arc = get_points(parse_path("M0 0 A20 20 0 0 1 20 0"))
+    large_arc = get_points(parse_path("M0 0 A20 20 0 1 1 20 0"))
+    assert np.abs(small_arc[:, 1]).max() < 20 - np.sqrt(300) + 1e-9
+    assert np.isclose(np.abs(large_arc[:, 1]).max(), 20 + np.sqrt(300))
+    center = (10, -np.sqrt(300))  # the large arc sweeping in positive angle direction bulges upwards
+    assert np.allclose(np.linalg.norm(large_arc - center, axis=1), 20)
+    assert_same_spline(parse_path("M0 0 A20 20 0 1120 0"), parse_path("M0 0 A20 20 0 1 1 20 0"))  # flags without separators
+
+
+@pytest.mark.parametrize("aspect_ratio, points", [
+    (None, [(40, 10), (50, 10)]),
+    ('preserveAspectRatio=""', [(40, 10), (50, 10)]),
+    ('preserveAspectRatio="xMidYMid meet"', [(40, 10), (50, 10)]),
+    ('preserveAspectRatio="none"', [(30, 10), (50, 10)]),
+    ('preserveAspectRatio="xMinYMin slice"', [(30, 20), (50, 20)]),
+    ('preserveAspectRatio="xMaxYMax meet"', [(65, 10), (75, 10)]),
+])
+def test_nested_transforms_and_viewbox(tmp_path, aspect_ratio, points):
+    attributes = 'viewBox="0 0 10 10" width="100" height="50"'
+    if aspect_ratio is not None:
+        attributes += " " + aspect_ratio
+    content = '<g transform="translate(1 0)"><path transform="scale(2)" d="M1 1 L2 1"/></g>'
+    assert np.allclose(get_points(parse_svg_file(write_svg(tmp_path, content, attributes=attributes))), points)
+
+
+def test_shapes(tmp_path):
+    content = ('<rect x="0" y="0" width="10" height="20"/>'
+               '<rect x="0" y="0" width="10" height="20" rx="2"/>'
+               '<circle cx="5" cy="5" r="5"/>'
+               '<ellipse cx="0" cy="0" rx="4" ry="2"/>'
+               '<polyline points="0,0 10,0 10,10"/>'
+               '<polygon points="0,0 10,0 10,10"/>'
+               '<defs><rect width="10" height="10"/></defs>'
+               '<rect width="10" height="10" display="none"/>')
+    spline_data = parse_svg_file(write_svg(tmp_path, content, attributes=""))
+    assert list(spline_data.segment_counts) == [4, 8, 4, 4, 3, 3]
+    assert list(spline_data.segment_closed) == [True, True, True, True, False, True]
+    points = np.split(get_points(spline_data), np.cumsum(spline_data.segment_counts)[:-1])
+    assert np.allclose(points[0], [(0, 0), (10, 0), (10, 20), (0, 20)])
+    assert np.allclose(points[1], [(2, 0), (8, 0), (10, 2), (10, 18), (8, 20), (2, 20), (0, 18), (0, 2)])
+    assert np.allclose(np.linalg.norm(points[2] - (5, 5), axis=1), 5)
+    assert np.allclose(points[3], [(4, 0), (0, 2), (-4, 0), (0, -2)])
+    assert np.allclose(points[4], [(0, 0), (10, 0), (10, 10)])
+    assert np.allclose(points[5], points[4])
+
+
+@pytest.mark.parametrize("path_data", ["10 10", "M10", "M0 0 Z 5", "M0 0 L1 #", "M0 0 C1 1 2 L3 3"])
+def test_malformed_path_data_raises(path_data):
+    with pytest.raises(SVGParseError):
+        parse_path(path_data)
+
+
+@pytest.mark.parametrize("content", ['<path d="M0 0 L', '<path d="M0 0 Q1"/>', '<g transform="rotate()"><path d="M0 0 L1 1"/></g>', ""])
+def test_malformed_files_raise(tmp_path, content):
+    file_path = write_svg(tmp_path, content)
+    with pytest.raises(SVGParseError):
+        parse_svg_file(file_path)
+    assert isinstance(parse_svg_file_into(file_path), str)
+
+
+def test_all_assets_parse(tmp_path):
+    results = parse_svg_directory(ASSETS_PATH, output_directory=str(tmp_path), processes=2)
+    assert len(results) == 32
+    failures = {file_name: result for file_name, result in results.items() if isinstance(result, str)}
+    assert failures == {}
+    file_name, spline_data = next(iter(results.items()))
+    assert len(spline_data) > 0
+    saved = load_spline_data(os.path.join(tmp_path, os.path.splitext(file_name)[0] + ".npz"))
+    assert_same_spline(saved, spline_data)
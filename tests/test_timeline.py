@@ -0,0 +1,198 @@
+from pydeation.scene import TwoDScene
+from pydeation.objects.line_objects import Circle, Rectangle
+from pydeation.animation.abstract_animators import Create, UnCreate, Move
+from pydeation.animation.animation import ScalarAnimation
+from pydeation.animation.timeline import Timeline, TimelineKey, ParameterState, desc_id_key, prune_keys
+import c4d
+
+POSITION_X = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0),
+                        c4d.DescLevel(c4d.VECTOR_X, c4d.DTYPE_REAL, 0))
+POSITION_Y = c4d.DescID(c4d.DescLevel(c4d.ID_BASEOBJECT_POSITION, c4d.DTYPE_VECTOR, 0),
+                        c4d.DescLevel(c4d.VECTOR_Y, c4d.DTYPE_REAL, 0))
+
+
+class AnimatedScene(TwoDScene):
+    """plays overlapping and consecutive animations on two objects"""
+
+    def construct(self):
+        circle = Circle()
+        rectangle = Rectangle()
+        self.play(Create(circle), Move(rectangle, x=10))
+        self.play(Move(circle, y=5), Move(rectangle, x=10), run_time=2)
+        self.play(UnCreate(circle))
+
+
+def get_curves(document):
+    """returns the keys of every track of the document per object name and desc id"""
+    curves = {}
+    for obj in document.iterate_objects():
+        for track in obj.GetCTracks():
+            keys = track.GetCurve().keys
+            curves[(obj.GetName(), track.GetDescriptionID().get_ids())] = [
+                (round(key.GetTime().Get(), 6), key.GetValue(), key.GetGeData(), key.GetInterpolation()) for key in keys]
+    return curves
+
+
+def get_key_times(curve):
+    return [key.GetTime().Get() for key in curve.keys]
+
+
+def test_deferred_and_immediate_builds_write_identical_curves():
+    immediate_curves = get_curves(AnimatedScene().document)
+    deferred_curves = get_curves(AnimatedScene(deferred=True).document)
+    assert immediate_curves
+    assert deferred_curves == immediate_curves
+
+
+def test_compile_groups_and_sorts_keys_per_track():
+    circle = Circle()
+    rectangle = Rectangle()
+    timeline = Timeline(deferred=True, prune=False)
+    for time, value in ((2, 20.0), (0, 0.0), (1, 10.0)):
+        timeline.add_key(circle, POSITION_X, c4d.BaseTime(time), value)
+        timeline.add_key(rectangle, POSITION_X, c4d.BaseTime(time), -value)
+    timeline.add_key(circle, POSITION_Y, c4d.BaseTime(1), 5.0)
+    tracks = timeline.get_tracks()
+    assert len(tracks) == 3
+    assert [key.value for key in tracks[(circle, desc_id_key(POSITION_X))]] == [20.0, 0.0, 10.0]  # grouped in order of recording
+    assert not circle.obj.GetCTracks()  # nothing is written before compiling
+    timeline.compile()
+    assert len(timeline) == 0
+    curve_x = circle.obj.FindCTrack(POSITION_X).GetCurve()
+    assert get_key_times(curve_x) == [0, 1, 2]
+    assert [key.GetValue() for key in curve_x.keys] == [0.0, 10.0, 20.0]
+    assert [key.GetValue() for key in rectangle.obj.FindCTrack(POSITION_X).GetCurve().keys] == [0.0, -10.0, -20.0]
+    assert [key.GetValue() for key in circle.obj.FindCTrack(POSITION_Y).GetCurve().keys] == [5.0]
+    assert len(circle.obj.GetCTracks()) == 2
+
+
+def test_immediate_timeline_writes_keys_right_away():
+    circle = Circle()
+    timeline = Timeline(deferred=False)
+    timeline.add_key(circle, POSITION_X, c4d.BaseTime(1), 10.0)
+    assert len(timeline) == 0
+    assert [key.GetValue() for key in circle.obj.FindCTrack(POSITION_X).GetCurve().keys] == [10.0]
+
+
+def test_validate_reports_conflicting_keys():
+    circle = Circle()
+    timeline = Timeline(deferred=True)
+    timeline.add_key(circle, POSITION_X, c4d.BaseTime(1), 10.0)
+    timeline.add_key(circle, POSITION_X, c4d.BaseTime(1), 10.0)  # same value is no conflict
+    timeline.add_key(circle, POSITION_Y, c4d.BaseTime(1), 0.0)
+    assert timeline.validate() == []
+    timeline.add_key(circle, POSITION_X, c4d.BaseTime(1), 20.0)
+    conflicts = timeline.validate()
+    assert len(conflicts) == 1
+    track_id, time, value, other_value = conflicts[0]
+    assert track_id[0] is circle
+    assert (time, value, other_value) == (1, 10.0, 20.0)
+
+
+class ChainedScene(TwoDScene):
+    """chains relative and multiplicative animations of the same parameters"""
+
+    def construct(self):
+        circle = Circle()
+        for i in range(3):
+            self.play(Move(circle, x=10))
+        for i in range(3):
+            descriptor = (c4d.ID_BASEOBJECT_SCALE, c4d.VECTOR_X)
+            animation = ScalarAnimation(target=circle, descriptor=descriptor, value_fin=2, relative=True, multiplicative=True)
+            circle.set_parameter(descriptor, animation.value_fin)
+            self.play(animation)
+
+
+def get_track_values(curves, parameter, component):
+    return [key[1] for key in curves[("Circle", (parameter, component))]]
+
+
+def test_relative_animations_chain_in_deferred_mode():
+    curves = get_curves(ChainedScene(deferred=True).document)
+    assert get_track_values(curves, c4d.ID_BASEOBJECT_POSITION, c4d.VECTOR_X) == [0, 10, 10, 20, 20, 30]
+    assert get_track_values(curves, c4d.ID_BASEOBJECT_SCALE, c4d.VECTOR_X) == [1, 2, 2, 4, 4, 8]
+    assert curves == get_curves(ChainedScene().document)
+
+
+def test_ints_written_to_real_parameters_stay_float():
+    circle = Circle()
+    circle.obj[c4d.PRIM_CIRCLE_RADIUS] = 100.0
+    state = ParameterState(write_through=False)
+    state.set(circle, c4d.PRIM_CIRCLE_RADIUS, 50)
+    assert type(state.get(circle, c4d.PRIM_CIRCLE_RADIUS)) is float
+    state.flush()
+    assert type(circle.obj[c4d.PRIM_CIRCLE_RADIUS]) is float
+
+
+def test_pending_values_are_shadowed_until_flushed():
+    circle = Circle()
+    state = ParameterState(write_through=False)
+    state.set(circle, c4d.PRIM_CIRCLE_RADIUS, 50.0)
+    assert circle.obj[c4d.PRIM_CIRCLE_RADIUS] == 200
+    assert state.get(circle, c4d.PRIM_CIRCLE_RADIUS) == 50.0
+    state.flush()
+    assert circle.obj[c4d.PRIM_CIRCLE_RADIUS] == 50.0
+    assert len(state) == 0
+
+
+def test_direct_writes_are_not_hidden_by_the_shadow():
+    circle = Circle()
+    for state in (ParameterState(write_through=True), ParameterState(write_through=False)):
+        state.set(circle, c4d.PRIM_CIRCLE_RADIUS, 50.0)
+        state.flush()
+        circle.obj[c4d.PRIM_CIRCLE_RADIUS] = 70.0  # e.g. folded relations writing the object directly
+        assert state.get(circle, c4d.PRIM_CIRCLE_RADIUS) == 70.0
+        state.set(circle, (c4d.ID_BASEOBJECT_POSITION, c4d.VECTOR_X), 5.0, immediate=True)
+        circle.obj[c4d.ID_BASEOBJECT_POSITION] = c4d.Vector(1, 2, 3)
+        assert state.get(circle, c4d.ID_BASEOBJECT_POSITION) == c4d.Vector(1, 2, 3)
+        assert state.get(circle, (c4d.ID_BASEOBJECT_POSITION, c4d.VECTOR_Y)) == 2
+
+
+def get_keys(values, interpolations=None):
+    """returns keys holding the values one second apart"""
+    if interpolations is None:
+        interpolations = [None] * len(values)
+    return [TimelineKey(None, POSITION_X, time, value, interpolation=interpolation)
+            for time, (value, interpolation) in enumerate(zip(values, interpolations))]
+
+
+def get_pruned(values, interpolations=None):
+    return [(key.time, key.value) for key in prune_keys(get_keys(values, interpolations))]
+
+
+def test_prune_keeps_a_single_key_of_constant_tracks():
+    assert get_pruned([5.0]) == [(0, 5.0)]
+    assert get_pruned([5.0, 5.0, 5.0]) == [(2, 5.0)]
+
+
+def test_prune_drops_leading_and_trailing_duplicates():
+    assert get_pruned([5.0, 5.0, 7.0]) == [(1, 5.0), (2, 7.0)]
+    assert get_pruned([5.0, 7.0, 7.0, 7.0]) == [(0, 5.0), (1, 7.0)]
+
+
+def test_prune_drops_interior_flat_runs():
+    assert get_pruned([1.0, 5.0, 5.0, 5.0, 9.0]) == [(0, 1.0), (1, 5.0), (3, 5.0), (4, 9.0)]
+    assert get_pruned([1.0, 5.0, 5.0 + 1e-12, 5.0, 9.0]) == [(0, 1.0), (1, 5.0), (3, 5.0), (4, 9.0)]  # float noise is flat
+
+
+def test_prune_keeps_keys_of_different_interpolation():
+    interpolations = [c4d.CINTERPOLATION_LINEAR, c4d.CINTERPOLATION_STEP, c4d.CINTERPOLATION_LINEAR]
+    assert get_pruned([5.0, 5.0, 5.0], interpolations) == [(0, 5.0), (1, 5.0), (2, 5.0)]
+
+
+def test_prune_compares_bool_keys_by_value():
+    assert get_pruned([True, True, False, False, True]) == [(1, True), (2, False), (3, False), (4, True)]
+
+
+class MoveXScene(TwoDScene):
+    """moves an object along x only"""
+
+    def construct(self):
+        circle = Circle()
+        self.play(Move(circle, x=10))
+
+
+def test_move_along_x_writes_no_y_and_z_keys():
+    curves = get_curves(MoveXScene(deferred=True).document)
+    position_tracks = [key for key in curves if key[1][0] == c4d.ID_BASEOBJECT_POSITION]
+    assert position_tracks == [("Circle", (c4d.ID_BASEOBJECT_POSITION, c4d.VECTOR_X))]
@@ -1,5 +1,13 @@
 import c4d
+import c4d.utils
 from c4d.modules import mograph as mg
+from pydeation.spline_geometry import SplineGeometry
+import numpy as np
+
+# changes of these invalidate the cached bounding box of an object
+BOUNDING_BOX_DIRTY_FLAGS = c4d.DIRTYFLAGS_MATRIX | c4d.DIRTYFLAGS_DATA | c4d.DIRTYFLAGS_CACHE
+# changes of these invalidate the measured lengths of a spline
+SPLINE_DIRTY_FLAGS = c4d.DIRTYFLAGS_DATA | c4d.DIRTYFLAGS_CACHE
 
 
 def average_color(color1, color2):
@@ -92,3 +100,208 @@ def connect_nearest_clones(*matrices, n=5, max_distance=False):
     clones = get_clones(*matrices)
     delete_previous_splines()
     create_connection_splines(clones, n, max_distance)
+
+
+def map_movements(completion, movements):
+    # evaluates the range mappers of an action for the given completion in a single python node
+    return [map_movement(completion, *movement) for movement in movements]
+
+
+def map_movement(value, input_ini, input_fin, output_ini, output_fin, tangent_ini, tangent_fin):
+    # maps the value from the input to the output range clamping it and applying the easing of the range mapper
+    if input_fin == input_ini:
+        progress = 1.0 if value >= input_fin else 0.0
+    else:
+        progress = min(max((value - input_ini) / (input_fin - input_ini), 0.0), 1.0)
+    return output_ini + ease(progress, tangent_ini, tangent_fin) * (output_fin - output_ini)
+
+
+def ease(progress, tangent_ini, tangent_fin):
+    # evaluates the bezier spline of the range mapper running from (0, 0) to (1, 1)
+    # with horizontal tangents of the given lengths at its knots
+    if not tangent_ini and not tangent_fin:
+        return progress
+    control_ini = tangent_ini
+    control_fin = 1 - tangent_fin
+    lower, upper = 0.0, 1.0
+    for i in range(40):  # the x coordinate grows monotonically along the spline
+        u = (lower + upper) / 2
+        x = 3 * (1 - u)**2 * u * control_ini + 3 * (1 - u) * u**2 * control_fin + u**3
+        if x < progress:
+            lower = u
+        else:
+            upper = u
+    u = (lower + upper) / 2
+    return 3 * (1 - u) * u**2 + u**3
+
+
+def get_input_values(node, namespace):
+    # yields the values of the input ports of a python node which are stored in the globals of its code by port name
+    return (namespace[port.GetName(node)] for port in node.GetInPorts())
+
+
+def switch_condition(node, namespace):
+    # returns the one based index of the first input port of the python node holding 1 or 0 if there is none
+    for i, value in enumerate(get_input_values(node, namespace)):
+        if value == 1:
+            return i + 1
+    return 0
+
+
+def get_delta(value, previous):
+    # returns the difference of the values or 1 if they are equal
+    return value - previous or 1
+
+
+def get_bounding_box(node, namespace, cache=None):
+    # returns the center and diameter of the bounding box enclosing the objects at the input ports of the python node
+    # and their descendants, descendants without extent and mospline helpers are skipped.
+    # the cache holds the bounds per object of the previous evaluation such that only changed subtrees are measured again
+    if cache is None:
+        cache = {}
+    visited = {}
+    bounds = None
+    for root in get_input_values(node, namespace):
+        subtree_bounds = get_subtree_bounds(root, get_ancestor_checksum(root), True, cache, visited)[1]
+        bounds = merge_bounds(bounds, subtree_bounds)
+    cache.clear()  # forgets objects which left the hierarchies
+    cache.update(visited)
+    if bounds is None:
+        return c4d.Vector(0), c4d.Vector(0)
+    min_x, max_x, min_y, max_y, min_z, max_z = bounds
+    center = c4d.Vector((min_x + max_x) / 2, (min_y + max_y) / 2, (min_z + max_z) / 2)
+    diameter = c4d.Vector(max_x - min_x, max_y - min_y, max_z - min_z)
+    return center, diameter
+
+
+def get_subtree_bounds(obj, parent_checksum, is_root, cache, visited):
+    # returns the checksum and the bounds of the object and its descendants as (min x, max x, min y, max y, min z, max z)
+    # the bounds of the object are measured again when its dirty checksum or one of its ancestors changed,
+    # the bounds of the subtree are merged again when any of its objects changed
+    checksum = hash((parent_checksum, obj.GetDirty(BOUNDING_BOX_DIRTY_FLAGS), is_root))
+    subtree_checksums = [checksum]
+    child_bounds = []
+    child = obj.GetDown()
+    while child:
+        child_checksum, bounds = get_subtree_bounds(child, checksum, False, cache, visited)
+        subtree_checksums.append(child_checksum)
+        child_bounds.append(bounds)
+        child = child.GetNext()
+    subtree_checksum = hash(tuple(subtree_checksums))
+    cached = cache.get(obj)
+    if cached is not None and cached[2] == subtree_checksum:
+        visited[obj] = cached
+        return subtree_checksum, cached[3]
+    if cached is not None and cached[0] == checksum:
+        bounds = cached[1]
+    else:
+        bounds = get_object_bounds(obj, is_root)
+    subtree_bounds = bounds
+    for bounds_of_child in child_bounds:
+        subtree_bounds = merge_bounds(subtree_bounds, bounds_of_child)
+    visited[obj] = (checksum, bounds, subtree_checksum, subtree_bounds)
+    return subtree_checksum, subtree_bounds
+
+
+def get_object_bounds(obj, is_root):
+    # returns the bounds of the object alone, descendants without extent and mospline helpers have none
+    radius = obj.GetRad()
+    if not is_root and (not (radius.x or radius.y or radius.z) or obj.GetName() == "MoSpline"):
+        return None
+    center = obj.GetMp() * obj.GetMg()
+    radius_x, radius_y, radius_z = abs(radius.x), abs(radius.y), abs(radius.z)
+    return (center.x - radius_x, center.x + radius_x, center.y - radius_y,
+            center.y + radius_y, center.z - radius_z, center.z + radius_z)
+
+
+def get_ancestor_checksum(obj):
+    # returns a checksum of the matrices of the ancestors which move the global bounds of the object
+    checksum = 0
+    parent = obj.GetUp()
+    while parent:
+        checksum = hash((checksum, parent.GetDirty(c4d.DIRTYFLAGS_MATRIX)))
+        parent = parent.GetUp()
+    return checksum
+
+
+def merge_bounds(bounds, other):
+    # returns the bounds enclosing both bounds, either of which may be None
+    if bounds is None:
+        return other
+    if other is None:
+        return bounds
+    return (min(bounds[0], other[0]), max(bounds[1], other[1]), min(bounds[2], other[2]),
+            max(bounds[3], other[3]), min(bounds[4], other[4]), max(bounds[5], other[5]))
+
+
+class SplineMetrics:
+    """holds the lengths of a spline measured with a single spline help, valid until the spline changes"""
+
+    def __init__(self, spline):
+        self.spline = spline
+        self.dirty = spline.GetDirty(SPLINE_DIRTY_FLAGS)
+        spline_help = c4d.utils.SplineHelp()
+        spline_help.InitSplineWith(spline)
+        self.segment_count = spline_help.GetSegmentCount()
+        self.segment_lengths = [spline_help.GetSegmentLength(segment) for segment in range(self.segment_count)]
+        self.length = spline_help.GetSplineLength()
+        spline_help.FreeSpline()
+        self.geometry = None  # arrays of the numpy spline kernel converted on first access
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"SplineMetrics: {self.segment_count} segments, length {self.length:.2f}"
+
+    def is_valid(self, spline):
+        """checks whether the metrics still describe the spline"""
+        return spline is self.spline and spline.GetDirty(SPLINE_DIRTY_FLAGS) == self.dirty
+
+    def get_geometry(self):
+        """returns the points, tangents and segments of the spline as geometry of the numpy spline kernel"""
+        if self.geometry is None:
+            self.geometry = get_spline_geometry(self.spline)
+        return self.geometry
+
+
+def get_spline_geometry(spline, subdivisions=16):
+    """converts the points, tangents and segments of a spline object in object space into the numpy spline kernel.
+    linear and bezier splines are converted exactly, the other interpolations are sampled into polylines"""
+    if not spline.CheckType(c4d.Ospline):
+        spline = spline.GetRealSpline()  # spline primitives
+    points = np.array([(point.x, point.y, point.z) for point in spline.GetAllPoints()], dtype=float)
+    tangents = [spline.GetTangent(index) for index in range(spline.GetTangentCount())]
+    tangents_left = tangents_right = None
+    if tangents:
+        tangents_left = np.array([(tangent["vl"].x, tangent["vl"].y, tangent["vl"].z) for tangent in tangents], dtype=float)
+        tangents_right = np.array([(tangent["vr"].x, tangent["vr"].y, tangent["vr"].z) for tangent in tangents], dtype=float)
+    segments = [spline.GetSegment(index) for index in range(spline.GetSegmentCount())]
+    if segments:
+        segment_counts = [segment["cnt"] for segment in segments]
+        segment_closed = [segment["closed"] for segment in segments]
+    else:
+        segment_counts, segment_closed = [len(points)], [spline.IsClosed()]
+    spline_type = spline[c4d.SPLINEOBJECT_TYPE]
+    if spline_type == c4d.SPLINEOBJECT_TYPE_LINEAR:
+        interpolation = "linear"
+    elif spline_type == c4d.SPLINEOBJECT_TYPE_BEZIER:
+        interpolation = "bezier"
+    else:  # cubic, akima and b-splines do not store their curves as tangents
+        return get_sampled_spline_geometry(spline, segment_counts, segment_closed, subdivisions=subdivisions)
+    return SplineGeometry(points, tangents_left, tangents_right, segment_counts, segment_closed,
+                          interpolation=interpolation, subdivisions=subdivisions)
+
+
+def get_sampled_spline_geometry(spline, segment_counts, segment_closed, subdivisions=16):
+    """converts a spline into a linear geometry of points sampled with the interpolation of cinema,
+    each curve between two points of a segment is sampled the given number of times"""
+    points, sampled_counts = [], []
+    for segment, (count, closed) in enumerate(zip(segment_counts, segment_closed)):
+        closed = closed and count > 1
+        curve_count = count if closed else max(count - 1, 0)
+        sample_count = curve_count * subdivisions + (0 if closed or count == 0 else 1)
+        for parameter in np.linspace(0, 1, sample_count, endpoint=not closed):
+            point = spline.GetSplinePoint(parameter, segment)
+            points.append((point.x, point.y, point.z))
+        sampled_counts.append(sample_count)
+    return SplineGeometry(np.array(points, dtype=float).reshape(-1, 3), segment_counts=sampled_counts,
+                          segment_closed=segment_closed, interpolation="linear")
@@ -0,0 +1,64 @@
+import math
+import re
+
+# functions of the formula node, names are case insensitive in cinema
+FUNCTIONS = {
+    "if": lambda condition, value_true, value_false: value_true if condition else value_false,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "ln": math.log,
+    "log": math.log10,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "round": lambda value: math.floor(value + 0.5),
+    "pi": math.pi,
+}
+
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z_0-9]*")
+
+
+class FormulaError(Exception):
+    """raised for formulas which cannot be evaluated in python"""
+    pass
+
+
+def compile_formula(formula, variables):
+    """translates a formula of the formula node into a python function taking the variables as keyword arguments"""
+    names = {}
+
+    def translate_identifier(match):
+        identifier = match.group(0)
+        if identifier in variables:
+            names[identifier] = identifier
+            return identifier
+        if identifier.lower() in FUNCTIONS:
+            name = "_" + identifier.lower()
+            names[name] = FUNCTIONS[identifier.lower()]
+            return name
+        raise FormulaError(f"unknown identifier {identifier} in {formula}")
+
+    if re.search(r"[^\w\s.+\-*/%()<>=!;,]", formula):
+        raise FormulaError(f"unsupported operator in {formula}")
+    expression = IDENTIFIER.sub(translate_identifier, formula).replace(";", ",")
+    try:
+        code = compile(expression, "<formula>", "eval")
+    except SyntaxError as error:
+        raise FormulaError(f"invalid formula {formula}") from error
+    constants = {name: value for name, value in names.items() if name not in variables}
+
+    def evaluate(**values):
+        return eval(code, {"__builtins__": {}}, {**constants, **values})
+
+    return evaluate
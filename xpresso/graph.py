@@ -0,0 +1,317 @@
+from collections import Counter
+import c4d
+
+
+class GraphRegistry:
+    """collects the xpresso graphs built while a scene is constructed and materializes them in one pass per tag"""
+
+    active = None  # the registry of the scene currently being constructed
+
+    def __init__(self, passes=()):
+        self.graphs = []
+        self.passes = passes  # optimizations applied to the recorded graphs before they are materialized
+        self.statistics = {}  # pass name -> number of nodes removed or moved by the pass
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"GraphRegistry: {len(self.graphs)} graphs, {self.get_node_count()} nodes"
+
+    def activate(self):
+        """makes new graphs defer their nodes until materialization"""
+        GraphRegistry.active = self
+
+    def deactivate(self):
+        """lets graphs created from now on write their nodes immediately"""
+        if GraphRegistry.active is self:
+            GraphRegistry.active = None
+
+    def register(self, graph):
+        self.graphs.append(graph)
+
+    def get_node_count(self):
+        """returns the number of nodes of all pending graphs"""
+        return sum(len(graph) for graph in self.graphs if not graph.materialized)
+
+    def materialize(self):
+        """creates the nodes, ports and connections of all pending graphs"""
+        self.optimize()
+        for graph in self.graphs:
+            graph.materialize()  # materialized graphs are kept such that reports can attribute their tags
+
+    def optimize(self):
+        """applies the optimization passes to the registered graphs, passes only rewrite graphs which are not yet materialized"""
+        for graph_pass in self.passes:
+            self.statistics[graph_pass.__name__] = graph_pass(self.graphs)
+
+
+class XGraph:
+    """python side representation of the node graph of a single xpresso tag.
+    nodes, ports and connections are recorded and only created in the tag once the graph is materialized,
+    afterwards the graph is live and forwards every operation to cinema immediately"""
+
+    def __init__(self, tag, host=None, owner=None):
+        self.tag = tag  # the xpresso tag owning the graph
+        self.host = host  # the object carrying the tag as referenced by the python objects
+        self.owner = owner  # the python object the graph was built for
+        self.master = None
+        self.root = GraphNode(self, None)
+        self.nodes = []
+        self.edges = []  # (port out, port in) pairs
+        self.operations = []  # port operations replayed in order after the nodes are created
+        self.aliases = {}  # ports removed by optimizations -> ports replacing them
+        self.xpressions = []  # custom xpressions built into the graph, ordered by their dependencies
+        self.relations = []  # relations built into the graph, candidates for constant folding
+        self.actions = []  # actions built into the graph, candidates for fusing their range mappers
+        self.materialized = False
+        if GraphRegistry.active is None:
+            self.materialize()
+        else:
+            GraphRegistry.active.register(self)
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"XGraph: {len(self.nodes)} nodes, {len(self.edges)} edges"
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get_operator_counts(self):
+        """returns the number of nodes per operator id"""
+        return Counter(node.operator_id for node in self.nodes)
+
+    def create_node(self, parent, operator_id):
+        """creates a node as last child of the parent node"""
+        node = GraphNode(self, operator_id, parent=parent)
+        parent.children.append(node)
+        self.nodes.append(node)
+        if self.materialized:
+            node.node = self.get_master().CreateNode(parent.node, id=operator_id)
+        return node
+
+    def insert_first(self, parent, node):
+        """moves the node to the first position under the parent node"""
+        node.parent.children.remove(node)
+        parent.children.insert(0, node)
+        node.parent = parent
+        if self.materialized:
+            self.get_master().InsertFirst(parent.node, node.node)
+
+    def execute(self, operation):
+        """runs a port operation immediately or records it for materialization"""
+        if self.materialized:
+            apply_operation(operation)
+        else:
+            self.operations.append(operation)
+
+    def rebuild_edges(self):
+        """recomputes the edges and port connections from the recorded operations"""
+        self.edges = []
+        for node in [self.root] + self.nodes:
+            for port in node.in_ports + node.out_ports:
+                port.connections = []
+        for operation in self.operations:
+            if operation[0] == "connect":
+                port, other = operation[1], operation[2]
+                port.connections.append(other)
+                other.connections.append(port)
+                self.edges.append((port, other))
+
+    def get_host(self):
+        """returns the object carrying the tag which object nodes without link point to"""
+        if self.host is None:
+            return self.tag.GetObject()
+        return self.host
+
+    def get_master(self):
+        """returns the node master of the tag which is only created on first access"""
+        if self.master is None:
+            self.master = self.tag.GetNodeMaster()
+            self.root.node = self.master.GetRoot()
+        return self.master
+
+    def materialize(self):
+        """creates all recorded nodes parents first, sets their parameters and replays the port operations"""
+        if self.materialized:
+            return
+        self.materialized = True
+        if not self.nodes:
+            return  # leave the tag untouched
+        self.get_master()
+        stack = list(reversed(self.root.children))
+        while stack:
+            node = stack.pop()
+            node.node = self.master.CreateNode(node.parent.node, id=node.operator_id)
+            if node.name is not None:
+                node.node.SetName(node.name)
+            for parameter, value in node.parameters.items():
+                node.node[parameter] = value
+            stack += reversed(node.children)
+        for operation in self.operations:
+            apply_operation(operation)
+        self.operations = []
+        for port, alias in self.aliases.items():
+            port.port = alias.port
+
+
+class GraphNode:
+    """a node of an xpresso graph mirroring the interface of GvNode used by the xpressions"""
+
+    def __init__(self, graph, operator_id, parent=None):
+        self.graph = graph
+        self.operator_id = operator_id
+        self.parent = parent
+        self.children = []
+        self.name = None
+        self.parameters = {}  # parameters set before the node has ports
+        self.in_ports = []
+        self.out_ports = []
+        self.node = None  # the GvNode once materialized
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"GraphNode: {self.name}, {self.operator_id}"
+
+    def __getattr__(self, name):
+        """falls back to the GvNode for operations the graph does not record"""
+        if name.startswith("_") or name in ("node", "graph"):
+            raise AttributeError(name)
+        return getattr(self.get_node(), name)
+
+    def get_node(self):
+        """returns the GvNode materializing the graph if necessary"""
+        self.graph.materialize()
+        return self.node
+
+    def __setitem__(self, parameter, value):
+        if self.node is not None:
+            self.node[parameter] = value
+            self.parameters[parameter] = value  # remembered such that the linked object of live graphs is known
+        elif not self.in_ports and not self.out_ports:
+            self.parameters[parameter] = value
+        else:
+            # parameters like the data type can change ports so keep their order relative to the port operations
+            self.parameters.pop(parameter, None)
+            self.graph.execute(("set_parameter", self, parameter, value))
+
+    def __getitem__(self, parameter):
+        return self.get_node()[parameter]
+
+    def SetName(self, name):
+        self.name = name
+        if self.node is not None:
+            self.node.SetName(name)
+
+    def GetName(self):
+        return self.name
+
+    def GetOperatorID(self):
+        return self.operator_id
+
+    def GetUp(self):
+        return self.parent
+
+    def get_ports(self, io):
+        return self.in_ports if io == c4d.GV_PORT_INPUT else self.out_ports
+
+    def AddPort(self, io, id=None, flags=0, message=False):
+        port = GraphPort(self, io, desc_id=id)
+        self.get_ports(io).append(port)
+        self.graph.execute(("add_port", port))
+        return port
+
+    def get_port(self, io, index):
+        """returns the port at the index, ports beyond the known ones are default ports of the operator"""
+        ports = self.get_ports(io)
+        while len(ports) <= index:
+            port = GraphPort(self, io, index=len(ports))
+            ports.append(port)
+            self.graph.execute(("get_port", port))
+        return ports[index]
+
+    def GetInPort(self, index):
+        return self.get_port(c4d.GV_PORT_INPUT, index)
+
+    def GetOutPort(self, index):
+        return self.get_port(c4d.GV_PORT_OUTPUT, index)
+
+    def GetInPorts(self):
+        return list(self.in_ports)
+
+    def GetOutPorts(self):
+        return list(self.out_ports)
+
+    def GetInPortCount(self):
+        return len(self.in_ports)
+
+    def GetOutPortCount(self):
+        return len(self.out_ports)
+
+    def RemoveUnusedPorts(self, message=False):
+        self.in_ports = [port for port in self.in_ports if port.connections]
+        self.out_ports = [port for port in self.out_ports if port.connections]
+        self.graph.execute(("remove_unused_ports", self))
+
+
+class GraphPort:
+    """a port of a graph node, bound to its GvPort once the graph is materialized"""
+
+    def __init__(self, node, io, desc_id=None, index=None):
+        self.node = node
+        self.io = io
+        self.desc_id = desc_id  # ports added by description id
+        self.index = index  # default ports accessed by index
+        self.name = None
+        self.connections = []
+        self.port = None  # the GvPort once materialized
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"GraphPort: {self.node}, {self.desc_id if self.index is None else self.index}"
+
+    def Connect(self, other):
+        self.connections.append(other)
+        other.connections.append(self)
+        self.node.graph.edges.append((self, other))
+        self.node.graph.execute(("connect", self, other))
+        return True
+
+    def SetName(self, name):
+        self.name = name
+        self.node.graph.execute(("set_port_name", self, name))
+
+    def GetName(self, node=None):
+        return self.name
+
+    def GetMainID(self):
+        return self.desc_id
+
+    def GetNode(self):
+        return self.node
+
+    def GetIO(self):
+        return self.io
+
+    def GetNrOfConnections(self):
+        return len(self.connections)
+
+
+def apply_operation(operation):
+    """writes a single recorded port operation to the materialized nodes"""
+    kind = operation[0]
+    if kind == "add_port":
+        port = operation[1]
+        port.port = port.node.node.AddPort(port.io, port.desc_id)
+    elif kind == "get_port":
+        port = operation[1]
+        if port.io == c4d.GV_PORT_INPUT:
+            port.port = port.node.node.GetInPort(port.index)
+        else:
+            port.port = port.node.node.GetOutPort(port.index)
+    elif kind == "connect":
+        operation[1].port.Connect(operation[2].port)
+    elif kind == "set_port_name":
+        operation[1].port.SetName(operation[2])
+    elif kind == "remove_unused_ports":
+        operation[1].node.RemoveUnusedPorts()
+    elif kind == "set_parameter":
+        operation[1].node[operation[2]] = operation[3]
@@ -0,0 +1,547 @@
+from pydeation.xpresso.graph import GraphPort
+from pydeation.xpresso.formula import FormulaError
+from pydeation.xpresso.xpresso import XMovementMapper
+from pydeation.constants import *
+from collections import defaultdict, Counter
+import heapq
+import c4d
+
+# interface ports used to route a parameter of the given data type through a group
+GROUP_PORTS = {
+    c4d.DTYPE_REAL: (REAL_DESCID_IN, REAL_DESCID_OUT),
+    c4d.DTYPE_BOOL: (BOOL_DESCID_IN, BOOL_DESCID_OUT),
+    c4d.DTYPE_LONG: (INTEGER_DESCID_IN, INTEGER_DESCID_OUT),
+    c4d.DTYPE_COLOR: (COLOR_DESCID_IN, COLOR_DESCID_OUT),
+    c4d.DTYPE_VECTOR: (COLOR_DESCID_IN, COLOR_DESCID_OUT),
+    c4d.DTYPE_STRING: (STRING_DESCID_IN, STRING_DESCID_OUT),
+}
+
+# data types of the built in parameters which are addressed by plain ids
+PARAMETER_DTYPES = {
+    c4d.ID_BASEOBJECT_VISIBILITY_EDITOR: c4d.DTYPE_LONG,
+    c4d.ID_BASEOBJECT_VISIBILITY_RENDER: c4d.DTYPE_LONG,
+}
+
+
+class XPressoCycleError(Exception):
+    """raised if the groups of an xpresso tag depend on each other in a cycle"""
+    pass
+
+
+def sort_xpressions(graphs):
+    """orders the groups of each graph by their data dependencies, returns the number of moved groups"""
+    return sum(sort_graph_xpressions(graph) for graph in graphs if not graph.materialized)
+
+
+def sort_graph_xpressions(graph):
+    """orders the nodes at the root of the graph such that each one is evaluated after the ones writing the parameters it reads
+    or feeding its ports. independent nodes keep their order with higher priorities first, returns the number of moved nodes"""
+    units = list(graph.root.children)
+    if len(units) < 2:
+        return 0
+    dependencies = get_unit_dependencies(graph, units)
+    priorities = {xpression.xgroup.obj: xpression.priority for xpression in graph.xpressions}
+    dependents = defaultdict(list)
+    indegrees = {unit: len(dependencies[unit]) for unit in units}
+    for unit in units:
+        for dependency in dependencies[unit]:
+            dependents[dependency].append(unit)
+    positions = {unit: position for position, unit in enumerate(units)}
+    ready = [(-priorities.get(unit, 0), positions[unit]) for unit in units if not indegrees[unit]]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        priority, position = heapq.heappop(ready)
+        unit = units[position]
+        order.append(unit)
+        for dependent in dependents[unit]:
+            indegrees[dependent] -= 1
+            if not indegrees[dependent]:
+                heapq.heappush(ready, (-priorities.get(dependent, 0), positions[dependent]))
+    if len(order) < len(units):
+        cycle = [unit.name or str(unit.operator_id) for unit in units if indegrees[unit]]
+        raise XPressoCycleError(f"the groups {', '.join(cycle)} in the xpresso tag of {graph.get_host().GetName()} depend on each other in a cycle")
+    if graph.materialized:
+        for unit in reversed(order):
+            graph.insert_first(graph.root, unit)
+    else:
+        graph.root.children = order
+    return sum(unit is not other for unit, other in zip(order, units))
+
+
+def get_unit_dependencies(graph, units):
+    """returns the set of root nodes each root node depends on through parameters or connections"""
+    unit_of = get_units(graph)
+    dependencies = {unit: set() for unit in units}
+    accesses = get_parameter_accesses(graph)
+    for (obj_id, io, top_id), entries in accesses.items():
+        if io != c4d.GV_PORT_OUTPUT:
+            continue
+        writers = accesses.get((obj_id, c4d.GV_PORT_INPUT, top_id), ())
+        for desc_key, reader in entries:
+            for other_key, writer in writers:
+                if unit_of[writer] is not unit_of[reader] and keys_overlap(desc_key, other_key):
+                    dependencies[unit_of[reader]].add(unit_of[writer])
+    for node in graph.nodes:
+        for port in node.out_ports:
+            for peer in port.connections:
+                if peer.node in unit_of and unit_of[peer.node] is not unit_of[node]:
+                    dependencies[unit_of[peer.node]].add(unit_of[node])
+    return dependencies
+
+
+def get_units(graph):
+    """maps each node to the node at the root containing it"""
+    unit_of = {}
+    for unit in graph.root.children:
+        for node in get_descendants(unit):
+            unit_of[node] = unit
+    return unit_of
+
+
+def merge_object_nodes(graphs):
+    """merges the object nodes pointing to the same object per graph, returns the number of removed nodes"""
+    return sum(merge_graph_object_nodes(graph) for graph in graphs if not graph.materialized)
+
+
+def merge_graph_object_nodes(graph):
+    """merges the object nodes of a graph which point to the same object into one node per direction.
+    the shared node is placed at the root and its ports are routed into the groups through interface ports.
+    nodes that only read and nodes that only write are merged separately so no cycles are introduced.
+    shared reading nodes are placed after the last group writing what they read, shared writing nodes at the end
+    so the order established by sort_xpressions is kept"""
+    candidates = defaultdict(list)
+    # nodes whose parameters or ports change after creation are kept
+    modified_nodes = {operation[1] for operation in graph.operations if operation[0] in ("set_parameter", "remove_unused_ports")}
+    accesses = get_parameter_accesses(graph)
+    unit_of = get_units(graph)
+    positions = {unit: position for position, unit in enumerate(graph.root.children)}
+    for node in graph.nodes:
+        if node in modified_nodes:
+            continue
+        key = get_merge_key(graph, node, accesses, unit_of, positions)
+        if key is not None:
+            candidates[key].append(node)
+    merges = [(key, nodes) for key, nodes in candidates.items() if len(nodes) > 1]
+    merged_nodes = {node for key, nodes in merges for node in nodes}
+    # single nodes only connected to merged nodes are moved to the root as well such that their group can be removed
+    merges += [(key, nodes) for key, nodes in candidates.items() if len(nodes) == 1 and is_connected_to(nodes[0], merged_nodes)]
+    if not merges:
+        return 0
+    shared_ports = {}  # port of a merged node -> port of the shared node
+    for (link_id, read_only, anchor), nodes in merges:
+        shared_node = graph.create_node(graph.root, c4d.ID_OPERATOR_OBJECT)
+        shared_node.parameters = dict(nodes[0].parameters)
+        shared_node.name = nodes[0].name
+        place_shared_node(graph, shared_node, read_only, anchor)
+        ports_by_desc_id = {}
+        for node in nodes:
+            for port in node.in_ports + node.out_ports:
+                desc_key = (port.io, get_desc_id_key(port.desc_id))
+                if desc_key not in ports_by_desc_id:
+                    shared_port = GraphPort(shared_node, port.io, desc_id=port.desc_id)
+                    shared_node.get_ports(port.io).append(shared_port)
+                    ports_by_desc_id[desc_key] = shared_port
+                shared_ports[port] = ports_by_desc_id[desc_key]
+            merged_nodes.add(node)
+    remove_nodes(graph, merged_nodes)
+    rewrite_operations(graph, shared_ports)
+    remove_empty_groups(graph)
+    return sum(len(nodes) - 1 for key, nodes in merges)
+
+
+def fold_static_relations(graphs):
+    """replaces the relations whose driving parameters are never animated by their result written once in python.
+    a parameter is static if it has no track after the timeline was compiled and no object node writes it.
+    folding a relation removes it as a writer so relations fed by folded relations are folded in turn"""
+    writers = get_parameter_writers(graphs)
+    tracks = {}  # id of object -> desc id keys of its tracks
+    relations = [relation for graph in graphs if not graph.materialized for relation in graph.relations]
+    folded_graphs = set()
+    removed_nodes = 0
+    folded = True
+    while folded:
+        folded = False
+        for relation in list(relations):
+            values = get_static_values(relation, writers, tracks)
+            if values is None:
+                continue
+            for desc_id, value in values:
+                relation.part.obj[desc_id] = value
+                writers[id(relation.part.obj)][get_desc_id_key(desc_id)] -= 1
+            removed_nodes += remove_relation(relation)
+            relations.remove(relation)
+            folded_graphs.add(relation.xgroup.graph)
+            folded = True
+    for graph in folded_graphs:
+        remove_empty_groups(graph)
+    return removed_nodes
+
+
+def fuse_actions(graphs):
+    """replaces the range mappers of each action by a single python node evaluating all movements of the action"""
+    removed_nodes = 0
+    for graph in graphs:
+        if graph.materialized:
+            continue
+        for action in graph.actions:
+            if len(action.movements) > 1 and is_fusable(action):
+                removed_nodes += fuse_action(action)
+    return removed_nodes
+
+
+def is_fusable(action):
+    """checks whether the range mappers of the action are still only connected as constructed"""
+    for range_mapper_node, parameter_port in zip(action.range_mapper_nodes, action.parameter_ports):
+        node = range_mapper_node.obj
+        if node.graph is not action.xgroup.graph or node.children:
+            return False
+        if [port.connections for port in node.in_ports] != [[action.completion_port]]:
+            return False
+        if [port.connections for port in node.out_ports] != [[parameter_port]]:
+            return False
+    return True
+
+
+def fuse_action(action):
+    """creates the python node of the action and removes its range mappers, returns the number of removed nodes"""
+    graph = action.xgroup.graph
+    movement_mapper = XMovementMapper(action.target, movements=action.movements, parent=action.xgroup.obj)
+    action.completion_port.Connect(movement_mapper.completion_port_in)
+    for output_port, parameter_port in zip(movement_mapper.output_ports, action.parameter_ports):
+        output_port.Connect(parameter_port)
+    nodes = {range_mapper_node.obj for range_mapper_node in action.range_mapper_nodes}
+    remove_nodes(graph, nodes)
+    graph.operations = [operation for operation in graph.operations if not get_operation_nodes(operation) & nodes]
+    graph.rebuild_edges()
+    action.range_mapper_nodes = []
+    action.movement_mapper_node = movement_mapper
+    return len(nodes) - 1
+
+
+def get_static_values(relation, writers, tracks):
+    """returns the (desc id, value) pairs the relation writes if all its parameters are static, otherwise None"""
+    whole, part = relation.whole.obj, relation.part.obj
+    desc_keys = [get_desc_id_key(parameter.desc_id) for parameter in relation.parameters]
+    if any(is_animated(whole, desc_key, writers, tracks) for desc_key in desc_keys):
+        return None
+    own_writes = Counter(get_desc_id_key(desc_id) for desc_id in relation.desc_ids)
+    for desc_key, count in own_writes.items():
+        if is_animated(part, desc_key, writers, tracks, own_writes=count):
+            return None
+    if not is_isolated(relation):
+        return None
+    try:
+        value = relation.evaluate([whole[parameter.desc_id] for parameter in relation.parameters])
+        return [(desc_id, get_port_value(value, get_port_dtype(desc_id))) for desc_id in relation.desc_ids]
+    except FormulaError:
+        return None
+
+
+def is_animated(obj, desc_key, writers, tracks, own_writes=0):
+    """checks whether a parameter of the object has a track or is written by object nodes other than the own ones"""
+    if id(obj) not in tracks:
+        tracks[id(obj)] = [get_desc_id_key(track.GetDescriptionID()) for track in obj.GetCTracks()]
+    if any(keys_overlap(desc_key, track_key) for track_key in tracks[id(obj)]):
+        return True
+    write_count = sum(count for key, count in writers[id(obj)].items() if keys_overlap(desc_key, key))
+    return write_count > own_writes
+
+
+def keys_overlap(desc_key, other):
+    """checks whether two desc id keys address the same parameter or one contains the other"""
+    length = min(len(desc_key), len(other))
+    return desc_key[:length] == other[:length]
+
+
+def is_isolated(relation):
+    """checks whether the nodes of the relation are only connected among each other"""
+    nodes = set(get_descendants(relation.xgroup.obj))
+    for node in nodes:
+        for port in node.in_ports + node.out_ports:
+            if any(peer.node not in nodes for peer in port.connections):
+                return False
+    return True
+
+
+def get_port_value(value, dtype):
+    """converts the result of a relation to the value the input port of the given data type would receive"""
+    if dtype == c4d.DTYPE_REAL and type(value) in (int, float, bool):
+        return float(value)
+    if dtype in (c4d.DTYPE_LONG, c4d.DTYPE_BOOL) and type(value) in (int, float, bool) and float(value).is_integer():
+        return bool(value) if dtype == c4d.DTYPE_BOOL else int(value)
+    if dtype in (c4d.DTYPE_VECTOR, c4d.DTYPE_COLOR) and type(value) is c4d.Vector:
+        return c4d.Vector(value.x, value.y, value.z)
+    raise FormulaError(f"cannot write {value} to a port of data type {dtype}")
+
+
+def get_parameter_writers(graphs):
+    """counts the connected input ports of object nodes per object and parameter over all graphs"""
+    writers = defaultdict(Counter)  # id of object -> desc id key -> number of writing ports
+    for graph in graphs:
+        for node, link, port in get_parameter_ports(graph):
+            if port.io == c4d.GV_PORT_INPUT:
+                writers[id(link)][get_desc_id_key(port.desc_id)] += 1
+    return writers
+
+
+def get_parameter_ports(graph):
+    """returns the object node, the linked object and the port for each connected parameter port of the object nodes"""
+    links = {operation[1]: operation[3] for operation in graph.operations
+             if operation[0] == "set_parameter" and operation[2] == c4d.GV_OBJECT_OBJECT_ID}
+    parameter_ports = []
+    for node in graph.nodes:
+        if node.operator_id != c4d.ID_OPERATOR_OBJECT:
+            continue
+        link = links.get(node, node.parameters.get(c4d.GV_OBJECT_OBJECT_ID))
+        if link is None:
+            link = graph.get_host()
+        for port in node.in_ports + node.out_ports:
+            if port.connections and port.desc_id is not None:
+                parameter_ports.append((node, link, port))
+    return parameter_ports
+
+
+def get_parameter_accesses(graph):
+    """indexes the parameters read and written by the object nodes of the graph by object, direction and top level id"""
+    accesses = defaultdict(list)  # (id of object, io, top level id) -> (desc id key, node)
+    for node, link, port in get_parameter_ports(graph):
+        desc_key = get_desc_id_key(port.desc_id)
+        accesses[(id(link), port.io, desc_key[0])].append((desc_key, node))
+    return accesses
+
+
+def is_accessed(accesses, link, io, desc_key, node=None):
+    """checks whether a node other than the given one reads or writes an overlapping parameter of the object"""
+    for other_key, other_node in accesses.get((id(link), io, desc_key[0]), ()):
+        if other_node is not node and keys_overlap(desc_key, other_key):
+            return True
+    return False
+
+
+def remove_relation(relation):
+    """removes the nodes of the relation and the port operations referring to them, returns the number of removed nodes"""
+    graph = relation.xgroup.graph
+    nodes = set(get_descendants(relation.xgroup.obj))
+    remove_nodes(graph, nodes)
+    graph.relations.remove(relation)
+    graph.operations = [operation for operation in graph.operations if not get_operation_nodes(operation) & nodes]
+    graph.rebuild_edges()
+    return len(nodes)
+
+
+def get_descendants(node):
+    """returns the node and all nodes nested in it"""
+    nodes = [node]
+    for child in node.children:
+        nodes += get_descendants(child)
+    return nodes
+
+
+def get_operation_nodes(operation):
+    """returns the nodes a recorded port operation refers to"""
+    if operation[0] in ("set_parameter", "remove_unused_ports"):
+        return {operation[1]}
+    if operation[0] == "connect":
+        return {operation[1].node, operation[2].node}
+    return {operation[1].node}
+
+
+def is_connected_to(node, nodes):
+    """checks whether the node has connections and all of them lead to the given nodes"""
+    peers = [peer.node for port in node.in_ports + node.out_ports for peer in port.connections]
+    return bool(peers) and all(peer in nodes for peer in peers)
+
+
+def place_shared_node(graph, shared_node, read_only, anchor):
+    """moves the shared node next to the root node it has to be evaluated after or before.
+    shared nodes without such a root node read at the beginning and write at the end of the graph"""
+    if anchor is None:
+        if read_only:
+            graph.insert_first(graph.root, shared_node)
+        return
+    children = graph.root.children
+    children.remove(shared_node)
+    position = children.index(anchor)
+    children.insert(position + 1 if read_only else position, shared_node)
+
+
+def get_merge_key(graph, node, accesses, unit_of, positions):
+    """returns the key under which object nodes can be merged or None if the node has to stay as it is"""
+    if node.operator_id != c4d.ID_OPERATOR_OBJECT or node.children:
+        return None
+    if set(node.parameters) - {c4d.GV_OBJECT_OBJECT_ID}:
+        return None
+    if bool(node.in_ports) == bool(node.out_ports):
+        return None  # nodes without ports or with both directions are kept
+    for port in node.in_ports + node.out_ports:
+        if port.index is not None or get_port_dtype(port.desc_id) not in GROUP_PORTS:
+            return None
+    if any(len(port.connections) > 1 for port in node.in_ports):
+        return None
+    groups = get_groups(node)
+    for port in node.in_ports + node.out_ports:
+        if any(peer.node in groups for peer in port.connections):
+            return None  # connected to the interface of its own group
+    desc_keys = [get_desc_id_key(port.desc_id) for port in node.in_ports]
+    if len(desc_keys) != len(set(desc_keys)):
+        return None
+    link = node.parameters.get(c4d.GV_OBJECT_OBJECT_ID)
+    if link is graph.get_host():
+        link = None  # object nodes without link point to the host of the tag
+    obj = graph.get_host() if link is None else link
+    anchor = None
+    if node.out_ports:
+        anchor = get_read_anchor(node, obj, accesses, unit_of, positions)
+    elif not is_movable_write(node, obj, accesses, unit_of, positions):
+        return None
+    if anchor is False:
+        return None
+    return (id(link), bool(node.out_ports), anchor)
+
+
+def get_read_anchor(node, obj, accesses, unit_of, positions):
+    """returns the last root node before the node writing a parameter the node reads, None if there is none
+    and False if the parameter is written within the own root node such that the node cannot be moved"""
+    anchor = None
+    unit = unit_of[node]
+    for port in node.out_ports:
+        desc_key = get_desc_id_key(port.desc_id)
+        for other_key, writer in accesses.get((id(obj), c4d.GV_PORT_INPUT, desc_key[0]), ()):
+            if not keys_overlap(desc_key, other_key):
+                continue
+            if unit_of[writer] is unit:
+                return False
+            if positions[unit_of[writer]] < positions[unit] and (anchor is None or positions[unit_of[writer]] > positions[anchor]):
+                anchor = unit_of[writer]
+    return anchor
+
+
+def is_movable_write(node, obj, accesses, unit_of, positions):
+    """checks whether the writes of the node can move to the end of the graph,
+    which is not the case if the parameters are written by other nodes as well or read within or after the own root node"""
+    unit = unit_of[node]
+    for port in node.in_ports:
+        desc_key = get_desc_id_key(port.desc_id)
+        if is_accessed(accesses, obj, c4d.GV_PORT_INPUT, desc_key, node=node):
+            return False
+        for other_key, reader in accesses.get((id(obj), c4d.GV_PORT_OUTPUT, desc_key[0]), ()):
+            if keys_overlap(desc_key, other_key) and positions[unit_of[reader]] >= positions[unit]:
+                return False
+    return True
+
+
+def get_port_dtype(desc_id):
+    """returns the data type of the parameter a port reads or writes"""
+    if type(desc_id) is c4d.DescID:
+        return desc_id[desc_id.GetDepth() - 1].dtype
+    return PARAMETER_DTYPES.get(desc_id)
+
+
+def get_desc_id_key(desc_id):
+    """converts a desc id or plain id into a hashable key"""
+    if type(desc_id) is c4d.DescID:
+        return tuple(desc_id[i].id for i in range(desc_id.GetDepth()))
+    return (desc_id,)
+
+
+def remove_nodes(graph, nodes):
+    """removes the given nodes from the graph"""
+    for node in nodes:
+        node.parent.children.remove(node)
+    graph.nodes = [node for node in graph.nodes if node not in nodes]
+
+
+def get_groups(node):
+    """returns the groups containing the node from the outermost to the innermost"""
+    groups = []
+    parent = node.parent
+    while parent is not None and parent.operator_id is not None:
+        groups.insert(0, parent)
+        parent = parent.parent
+    return groups
+
+
+def remove_empty_groups(graph):
+    """removes the groups left without nodes and interface ports"""
+    used_nodes = {operation[1].node for operation in graph.operations if operation[0] in ("add_port", "get_port")}
+    empty_groups = set()
+
+    def collect_empty_groups(node):
+        for child in node.children:
+            collect_empty_groups(child)  # inner groups are visited before their parents
+        if node.operator_id == c4d.ID_GV_OPERATOR_GROUP and node not in used_nodes:
+            if all(child in empty_groups for child in node.children):
+                empty_groups.add(node)
+
+    collect_empty_groups(graph.root)
+    remove_nodes(graph, empty_groups)
+
+
+def rewrite_operations(graph, shared_ports):
+    """replaces the port operations of merged nodes by the ports of the shared nodes routed through the groups"""
+    operations = []
+    added_ports = set()
+    interface_ports = {}  # (group, shared port) -> interface port of the group
+
+    def add_port(port):
+        if port not in added_ports:
+            added_ports.add(port)
+            operations.append(("add_port", port))
+
+    def route(shared_port, groups):
+        """returns the innermost port carrying the shared port into or out of the given groups"""
+        outer_port = shared_port
+        add_port(shared_port)
+        for group in groups:
+            interface_key = (group, shared_port)
+            interface_port = interface_ports.get(interface_key)
+            if interface_port is None:
+                port_in, port_out = GROUP_PORTS[get_port_dtype(shared_port.desc_id)]
+                if shared_port.io == c4d.GV_PORT_OUTPUT:
+                    interface_port = GraphPort(group, c4d.GV_PORT_INPUT, desc_id=port_in)
+                    group.in_ports.append(interface_port)
+                else:
+                    interface_port = GraphPort(group, c4d.GV_PORT_OUTPUT, desc_id=port_out)
+                    group.out_ports.append(interface_port)
+                interface_ports[interface_key] = interface_port
+                operations.append(("add_port", interface_port))
+                if shared_port.io == c4d.GV_PORT_OUTPUT:
+                    operations.append(("connect", outer_port, interface_port))
+                else:
+                    operations.append(("connect", interface_port, outer_port))
+            outer_port = interface_port
+        return outer_port
+
+    for operation in graph.operations:
+        kind = operation[0]
+        if kind == "add_port" and operation[1] in shared_ports:
+            continue  # shared ports are added on first use
+        if kind == "set_port_name" and operation[1] in shared_ports:
+            add_port(shared_ports[operation[1]])
+            operations.append(("set_port_name", shared_ports[operation[1]], operation[2]))
+            continue
+        if kind == "connect" and (operation[1] in shared_ports or operation[2] in shared_ports):
+            port, other = operation[1], operation[2]
+            if port in shared_ports and other in shared_ports:
+                # both nodes were merged so the shared nodes are connected directly at the root
+                add_port(shared_ports[port])
+                add_port(shared_ports[other])
+                operations.append(("connect", shared_ports[port], shared_ports[other]))
+                continue
+            if other in shared_ports:
+                port, other = other, port
+            # the merged port lived next to its peer so the peer sits inside the same groups
+            inner_port = route(shared_ports[port], get_groups(port.node))
+            if shared_ports[port].io == c4d.GV_PORT_OUTPUT:
+                operations.append(("connect", inner_port, other))
+            else:
+                operations.append(("connect", other, inner_port))
+            continue
+        operations.append(operation)
+    graph.operations = operations
+    # merged ports resolve to their shared port for code still holding them
+    for port, shared_port in shared_ports.items():
+        graph.aliases[port] = shared_port
+    graph.rebuild_edges()
+
@@ -0,0 +1,260 @@
+from pydeation.xpresso.xpresso import NODE_TYPES
+from collections import Counter
+import json
+import c4d
+
+# operator ids -> node types of the xpressions
+OPERATOR_NAMES = {operator_id: node_type for node_type, operator_id in NODE_TYPES.items()}
+
+# estimated evaluation cost per frame of a node in units of a math node, ports and python lines are added on top
+OPERATOR_COSTS = {
+    "group": 0,
+    "object": 2,
+    "constant": 0.5,
+    "formula": 3,
+    "rangemapper": 2,
+    "spline": 4,
+    "nearest_point_on_spline": 10,
+    "bounding_box": 5,
+    "falloff": 8,
+    "python": 20
+}
+DEFAULT_OPERATOR_COST = 1
+PORT_COST = 0.1  # copying a value through a port
+PYTHON_LINE_COST = 0.5  # interpreting a line of the code of a python node
+
+
+class TagReport:
+    """holds the statistics of the node graph of a single xpresso tag"""
+
+    def __init__(self, tag, owner=None):
+        self.object_name = tag.GetObject().GetName()
+        self.tag_name = tag.GetName()
+        self.class_name = "unknown" if owner is None else owner.__class__.__name__  # e.g. cached documents
+        self.node_counts = Counter()  # node type -> number of nodes
+        self.in_ports = 0
+        self.out_ports = 0
+        self.connections = 0
+        self.python_nodes = 0
+        self.python_code_size = 0  # characters of code of all python nodes
+        self.cost = 0
+        self.root = tag.GetNodeMaster().GetRoot()
+        self.collect()
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"TagReport: {self.object_name} ({self.class_name}), {self.get_node_count()} nodes, cost {self.cost:.1f}"
+
+    def collect(self):
+        """walks the nodes of the tag and sums up their statistics"""
+        for node in iterate_nodes(self.root):
+            node_type = get_node_type(node)
+            self.node_counts[node_type] += 1
+            in_ports = node.GetInPortCount()
+            out_ports = node.GetOutPortCount()
+            self.in_ports += in_ports
+            self.out_ports += out_ports
+            self.connections += sum(port.GetNrOfConnections() for port in node.GetOutPorts())
+            self.cost += OPERATOR_COSTS.get(node_type, DEFAULT_OPERATOR_COST) + PORT_COST * (in_ports + out_ports)
+            if node_type == "python":
+                code = node[c4d.GV_PYTHON_CODE] or ""
+                self.python_nodes += 1
+                self.python_code_size += len(code)
+                self.cost += PYTHON_LINE_COST * len(code.splitlines())
+
+    def get_node_count(self):
+        return sum(self.node_counts.values())
+
+    def to_dict(self):
+        return {
+            "object": self.object_name,
+            "class": self.class_name,
+            "tag": self.tag_name,
+            "nodes": self.get_node_count(),
+            "node_counts": dict(self.node_counts),
+            "in_ports": self.in_ports,
+            "out_ports": self.out_ports,
+            "connections": self.connections,
+            "python_nodes": self.python_nodes,
+            "python_code_size": self.python_code_size,
+            "cost": round(self.cost, 3)
+        }
+
+
+class XPressoReport:
+    """reports the xpresso nodes, ports and python code of every xpresso tag of a built scene per object and per class.
+    the estimated cost is a relative measure for deciding which objects to optimize first, not a timing"""
+
+    def __init__(self, scene):
+        scene.check_constructed("the xpresso report")
+        self.scene_name = scene.scene_name
+        self.tags = []
+        self.collect(scene)
+
+    def __repr__(self):
+        """sets the string representation for printing"""
+        return f"XPressoReport: {self.scene_name}, {len(self.tags)} tags, {self.get_node_count()} nodes"
+
+    def collect(self, scene):
+        """creates the reports of all xpresso tags holding nodes.
+        the graphs of the registry know the python object of their tag, without registry the tags are found in the document"""
+        for tag, owner in get_xpresso_tags(scene):
+            if tag.GetNodeMaster().GetRoot().GetDown() is None:
+                continue  # tags without nodes do not cost anything
+            self.tags.append(TagReport(tag, owner=owner))
+
+    def get_node_count(self):
+        return sum(tag_report.get_node_count() for tag_report in self.tags)
+
+    def get_class_totals(self):
+        """returns the summed statistics of the tags per class of their objects, most expensive first"""
+        totals = {}
+        for tag_report in self.tags:
+            tag_statistics = tag_report.to_dict()
+            if tag_report.class_name not in totals:
+                totals[tag_report.class_name] = {"class": tag_report.class_name, "tags": 0, "node_counts": Counter()}
+            total = totals[tag_report.class_name]
+            total["tags"] += 1
+            total["node_counts"].update(tag_report.node_counts)
+            for key in ("nodes", "in_ports", "out_ports", "connections", "python_nodes", "python_code_size", "cost"):
+                total[key] = total.get(key, 0) + tag_statistics[key]
+        for total in totals.values():
+            total["node_counts"] = dict(total["node_counts"])
+            total["cost"] = round(total["cost"], 3)
+        return sorted(totals.values(), key=lambda total: total["cost"], reverse=True)
+
+    def to_dict(self):
+        return {
+            "scene": self.scene_name,
+            "nodes": self.get_node_count(),
+            "classes": self.get_class_totals(),
+            "objects": [tag_report.to_dict() for tag_report in self.tags]
+        }
+
+    def to_json(self, path=None):
+        """returns the report as json and optionally writes it to the path"""
+        report = json.dumps(self.to_dict(), indent=4)
+        if path is not None:
+            with open(path, "w") as report_file:
+                report_file.write(report)
+        return report
+
+    def to_dot(self, path=None):
+        """returns the node graphs as graphviz dot with one cluster per tag and group and optionally writes it to the path"""
+        lines = [f'digraph "{self.scene_name}" {{', "    rankdir=LR;", "    node [shape=box];"]
+        edges = []
+        for index, tag_report in enumerate(self.tags):
+            names = []  # (node, dot identifier) of the nodes of the tag, connections never leave their tag
+            label = escape(f"{tag_report.object_name} ({tag_report.class_name})")
+            lines.append(f'    subgraph cluster_{index} {{')
+            lines.append(f'        label="{label}";')
+            lines += get_cluster_lines(tag_report.root, names, f"n{index}_", depth=2)
+            lines.append("    }")
+            for node, name in names:
+                for port in node.GetOutPorts():
+                    for destination in port.GetDestination():
+                        # the python wrappers of a node differ per access, nodes are only comparable with ==
+                        destination_name = find_name(names, destination.GetNode())
+                        if destination_name is not None:
+                            edges.append(f"    {name} -> {destination_name};")
+        lines += edges
+        lines.append("}")
+        graph = "\n".join(lines) + "\n"
+        if path is not None:
+            with open(path, "w") as graph_file:
+                graph_file.write(graph)
+        return graph
+
+    def compare(self, previous, threshold=1.5):
+        """returns the classes whose node count grew by more than the threshold factor
+        compared to a previous report or its loaded json"""
+        if isinstance(previous, XPressoReport):
+            previous = previous.to_dict()
+        previous_nodes = {total["class"]: total["nodes"] for total in previous["classes"]}
+        regressions = {}
+        for total in self.get_class_totals():
+            nodes = previous_nodes.get(total["class"])
+            if nodes and total["nodes"] > threshold * nodes:
+                regressions[total["class"]] = (nodes, total["nodes"])
+        return regressions
+
+    def print_summary(self, count=10):
+        """prints the most expensive classes"""
+        print(f"{'class':<24} {'tags':>6} {'nodes':>8} {'ports':>8} {'python':>8} {'cost':>10}")
+        for total in self.get_class_totals()[:count]:
+            print(f"{total['class']:<24} {total['tags']:>6} {total['nodes']:>8} "
+                  f"{total['in_ports'] + total['out_ports']:>8} {total['python_nodes']:>8} {total['cost']:>10.1f}")
+
+
+def get_xpresso_tags(scene):
+    """returns the xpresso tags of the scene together with the python objects owning them.
+    the graph registry knows the owner of each tag, tags of removed objects are skipped"""
+    graph_registry = getattr(scene, "graph_registry", None)
+    if graph_registry is None:
+        return [(tag, None) for obj in iterate_objects(scene.document) for tag in obj.GetTags() if tag.GetType() == c4d.Texpresso]
+    return [(graph.tag, graph.owner) for graph in graph_registry.graphs if is_inserted(graph.tag)]
+
+
+def is_inserted(tag):
+    """checks whether the object carrying the tag is part of a document"""
+    obj = tag.GetObject()
+    return obj is not None and obj.GetDocument() is not None
+
+
+def get_node_type(node):
+    return OPERATOR_NAMES.get(node.GetOperatorID(), str(node.GetOperatorID()))
+
+
+def iterate_objects(document):
+    """yields all objects of the document depth first"""
+    stack = [document.GetFirstObject()]
+    while stack:
+        obj = stack.pop()
+        if obj is None:
+            continue
+        yield obj
+        stack += [obj.GetNext(), obj.GetDown()]
+
+
+def iterate_nodes(root):
+    """yields all nodes below the root depth first"""
+    stack = [root.GetDown()]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        yield node
+        stack += [node.GetNext(), node.GetDown()]
+
+
+def get_cluster_lines(parent, names, prefix, depth):
+    """returns the dot lines of the children of the node, groups become nested clusters"""
+    indent = "    " * depth
+    lines = []
+    node = parent.GetDown()
+    while node is not None:
+        name = f"{prefix}{len(names)}"
+        names.append((node, name))
+        label = escape(node.GetName() or get_node_type(node))
+        if node.GetOperatorID() == c4d.ID_GV_OPERATOR_GROUP:
+            lines.append(f"{indent}subgraph cluster_{name} {{")
+            lines.append(f'{indent}    label="{label}";')
+            lines.append(f'{indent}    {name} [label="{label}", shape=point];')  # anchors the interface connections
+            lines += get_cluster_lines(node, names, prefix, depth + 1)
+            lines.append(f"{indent}}}")
+        else:
+            lines.append(f'{indent}{name} [label="{label}\\n{get_node_type(node)}"];')
+        node = node.GetNext()
+    return lines
+
+
+def find_name(names, node):
+    """returns the dot identifier of the node, None if it is not part of the names"""
+    for known_node, name in names:
+        if known_node == node:
+            return name
+    return None
+
+
+def escape(text):
+    return str(text).replace("\\", "\\\\").replace('"', '\\"')
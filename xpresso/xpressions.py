@@ -1,5 +1,6 @@
 from pydeation.xpresso.xpresso import *
 from pydeation.xpresso.userdata import *
+from pydeation.xpresso.formula import compile_formula, FormulaError
 from pydeation.constants import *
 from abc import ABC, abstractmethod
 import c4d
@@ -593,6 +594,7 @@ class CustomXPression(XPression):
         super().__init__(target, **kwargs)
         self.group_nodes()
         self.connect_ports()
+        self.xgroup.graph.xpressions.append(self)
 
     def group_nodes(self):
         self.xgroup = XGroup(*self.nodes, custom_tag=True,
@@ -610,6 +612,7 @@ class XRelation(CustomXPression):
         self.part = part
         self.whole = whole
         super().__init__(self.whole, **kwargs)
+        self.xgroup.graph.relations.append(self)
 
     def construct(self):
         self.create_whole_node()
@@ -639,6 +642,18 @@ class XRelation(CustomXPression):
         for part_node_port in self.part_node.obj.GetInPorts():
             self.formula_node.obj.GetOutPort(0).Connect(part_node_port)
 
+    def evaluate(self, values):
+        """evaluates the formula in python for the given parameter values, used to fold static relations"""
+        for value in values:
+            if type(value) not in (int, float, bool):
+                raise FormulaError(f"cannot evaluate {self.formula} for {value}")
+        variables = [parameter.name for parameter in self.parameters]
+        evaluate = compile_formula(self.formula or "t", variables)
+        try:
+            return evaluate(**{name: float(value) for name, value in zip(variables, values)})
+        except (ArithmeticError, ValueError, TypeError) as error:
+            raise FormulaError(f"cannot evaluate {self.formula}") from error
+
 
 class XIdentity(XRelation):
     """creates a direct connection between a parameter of a part and the whole of a CustomObject"""
@@ -654,6 +669,9 @@ class XIdentity(XRelation):
         self.create_whole_node()
         self.create_part_node()
 
+    def evaluate(self, values):
+        return values[0]
+
 
 class XInheritPosition(object):
     """relates the """
@@ -1140,6 +1158,7 @@ class XAction(CustomXPression):
         self.completion_parameter = completion_parameter
         self.target = target
         super().__init__(self.target, priority=priority, **kwargs)
+        self.xgroup.graph.actions.append(self)
 
     def construct(self):
         self.create_object_node_out()
@@ -2,39 +2,52 @@ from pydeation.constants import *
 from c4d.modules.mograph import FieldLayer
 import c4d
 
+# easing of the range mapper -> lengths of the right tangent of the first knot and the left tangent of the last knot
+EASING_TANGENTS = {
+    True: (0.25, 0.25),
+    "strong": (0.5, 0.5),
+    "soft": (0.125, 0.125),
+    "in": (0.25, None),
+    "strong_in": (0.5, None),
+    "out": (None, 0.25),
+    "strong_out": (None, 0.5)
+}
+
+# node types of the xpressions -> operator ids
+NODE_TYPES = {
+    "group": c4d.ID_GV_OPERATOR_GROUP,
+    "bool": c4d.ID_OPERATOR_BOOL,
+    "not": c4d.ID_OPERATOR_NOT,
+    "compare": c4d.ID_OPERATOR_CMP,
+    "condition": c4d.ID_OPERATOR_CONDITION,
+    "constant": c4d.ID_OPERATOR_CONST,
+    "formula": c4d.ID_OPERATOR_FORMULA,
+    "freeze": c4d.ID_OPERATOR_FREEZE,
+    "math": c4d.ID_OPERATOR_MATH,
+    "matrix2vect": c4d.ID_OPERATOR_MATRIX2VECT,
+    "memory": c4d.ID_OPERATOR_MEMORY,
+    "object": c4d.ID_OPERATOR_OBJECT,
+    "python": 1022471,
+    "rangemapper": c4d.ID_OPERATOR_RANGEMAPPER,
+    "reals2vect": c4d.ID_OPERATOR_REAL2VECT,
+    "vect2reals": c4d.ID_OPERATOR_VECT2REAL,
+    "nearest_point_on_spline": c4d.ID_OPERATOR_NEARESTPOINTONSPLINE,
+    "mix": c4d.ID_OPERATOR_MIX,
+    "distance": c4d.ID_OPERATOR_DISTANCE,
+    "matrix_mul_vector": c4d.ID_OPERATOR_MATRIXMULVECTOR,
+    "invert": c4d.ID_OPERATOR_INV,
+    "spline": c4d.ID_OPERATOR_SPLINE,
+    "matrix2hpb": c4d.ID_OPERATOR_MATRIXCALCHPB,
+    "vect2matrix": c4d.ID_OPERATOR_VECTCALCMATRIX,
+    "falloff": 1019302,
+    "bounding_box": c4d.ID_OPERATOR_BOX
+}
+
 
 class XNode:
     """creates a node inside the xpresso tag of a given target"""
 
     def __init__(self, target, node_type, parent=None, name=None, custom_tag=False, freeze_tag=False, composition_level=None):
-        node_types = {
-            "group": c4d.ID_GV_OPERATOR_GROUP,
-            "bool": c4d.ID_OPERATOR_BOOL,
-            "not": c4d.ID_OPERATOR_NOT,
-            "compare": c4d.ID_OPERATOR_CMP,
-            "condition": c4d.ID_OPERATOR_CONDITION,
-            "constant": c4d.ID_OPERATOR_CONST,
-            "formula": c4d.ID_OPERATOR_FORMULA,
-            "freeze": c4d.ID_OPERATOR_FREEZE,
-            "math": c4d.ID_OPERATOR_MATH,
-            "matrix2vect": c4d.ID_OPERATOR_MATRIX2VECT,
-            "memory": c4d.ID_OPERATOR_MEMORY,
-            "object": c4d.ID_OPERATOR_OBJECT,
-            "python": 1022471,
-            "rangemapper": c4d.ID_OPERATOR_RANGEMAPPER,
-            "reals2vect": c4d.ID_OPERATOR_REAL2VECT,
-            "vect2reals": c4d.ID_OPERATOR_VECT2REAL,
-            "nearest_point_on_spline": c4d.ID_OPERATOR_NEARESTPOINTONSPLINE,
-            "mix": c4d.ID_OPERATOR_MIX,
-            "distance": c4d.ID_OPERATOR_DISTANCE,
-            "matrix_mul_vector": c4d.ID_OPERATOR_MATRIXMULVECTOR,
-            "invert": c4d.ID_OPERATOR_INV,
-            "spline": c4d.ID_OPERATOR_SPLINE,
-            "matrix2hpb": c4d.ID_OPERATOR_MATRIXCALCHPB,
-            "vect2matrix": c4d.ID_OPERATOR_VECTCALCMATRIX,
-            "falloff": 1019302,
-            "bounding_box": c4d.ID_OPERATOR_BOX
-        }
         # define data types
         self.data_types = {
             "integer": 0,
@@ -59,13 +72,14 @@ class XNode:
         """
         if True:  # custom_tag:
             self.xtag = target.custom_tag.obj
-        self.master = self.xtag.GetNodeMaster()
+        # nodes are recorded in the graph of the tag and created in cinema when the graph is materialized
+        self.graph = target.custom_tag.graph
         # get parent xgroup/root
         if parent is None:
-            parent = self.master.GetRoot()
+            parent = self.graph.root
         # create node as child of parent
-        self.obj = self.master.CreateNode(
-            parent, id=node_types[node_type])
+        self.obj = self.graph.create_node(
+            parent, NODE_TYPES[node_type])
         self.name = name
         # set name
         if name is not None:
@@ -94,7 +108,7 @@ class XGroup(XNode):
         """add node to xgroup"""
         for node in nodes:
             # insert node under group
-            self.master.InsertFirst(self.obj, node.obj)
+            self.graph.insert_first(self.obj, node.obj)
 
     def set_params(self):
         # makes sure inputs are updated before being fed into xgroup
@@ -217,7 +231,7 @@ class XConditionSwitch(XPython):
         super().__init__(target, name=name, **kwargs)
 
     def set_params(self):
-        self.obj[c4d.GV_PYTHON_CODE] = 'import c4d\n\ndef main():\n    global Output1\n    Output1 = 0\n    for i in range(op.GetInPortCount()):\n        port = op.GetInPort(i)\n        value = globals()[port.GetName(op)]\n        if value == 1:\n            Output1 = i+1\n            return'
+        self.obj[c4d.GV_PYTHON_CODE] = 'from pydeation.utils import switch_condition\n\n\ndef main():\n    global Output1\n    Output1 = switch_condition(op, globals())\n'
 
 
 class XDelta(XPython):
@@ -227,7 +241,7 @@ class XDelta(XPython):
         super().__init__(target, name=name, **kwargs)
 
     def set_params(self):
-        self.obj[c4d.GV_PYTHON_CODE] = 'import c4d\n\ndef main():\n    global Output1\n    Output1 = 1\n    delta_t = Input1 - Input2\n    if delta_t:\n        Output1 = delta_t'
+        self.obj[c4d.GV_PYTHON_CODE] = 'from pydeation.utils import get_delta\n\n\ndef main():\n    global Output1\n    Output1 = get_delta(Input1, Input2)\n'
 
 
 class XProximityConnector(XPython):
@@ -276,7 +290,7 @@ class XBBox(XPython):
         self.set_ports()
 
     def set_params(self):
-        self.obj[c4d.GV_PYTHON_CODE] = 'from typing import Optional\nimport c4d\n\nop: c4d.modules.graphview.GvNode # The Xpresso node\n\n\nObject: c4d.BaseList2D # In: The object to measure the bounding box for.\nCenter: c4d.Vector # Out: The bounding box center.\nDiameter: c4d.Vector # Out: The bounding box radius.\n\n\ndef get_bounding_box(obj):\n\n    center = obj.GetMp()*obj.GetMg()\n    radius = obj.GetRad()\n    radius = c4d.Vector(abs(radius.x), abs(radius.y), abs(radius.z))\n\n    return center, radius\n\n\ndef recurse_hierarchy(op, callback, local_bboxes):\n# Recurses a hierarchy, starting from op\n    while op:\n        center, radius = callback(op)\n        if radius != c4d.Vector(0,0,0) and not op.GetName() == "MoSpline":\n            local_bbox = (center, radius)\n            local_bboxes.append(local_bbox)\n        local_bboxes = recurse_hierarchy(op.GetDown(), callback, local_bboxes)\n        op = op.GetNext()\n    return local_bboxes\n\n\ndef initial_step(op, callback):\n    # manually does the initial step for the parent of the hierarchy\n    # everything underneath it will be recursively crawled\n    center, radius = callback(op)\n    local_bbox = (center, radius)\n    return local_bbox\n\n\ndef get_global_bounding_box(local_bboxes):\n    """derives the global bounding box from a list of local ones"""\n    xs = []\n    ys = []\n    zs = []\n    for local_bbox in local_bboxes:\n        center, radius = local_bbox\n        max_x = center.x + radius.x\n        min_x = center.x - radius.x\n        max_y = center.y + radius.y\n        min_y = center.y - radius.y\n        max_z = center.z + radius.z\n        min_z = center.z - radius.z\n        xs += [min_x, max_x]\n        ys += [min_y, max_y]\n        zs += [min_z, max_z]\n\n    global_max_x = max(xs)\n    global_min_x = min(xs)\n    global_max_y = max(ys)\n    global_min_y = min(ys)\n    global_max_z = max(zs)\n    global_min_z = min(zs)\n\n    global_width = global_max_x - global_min_x\n    global_height = global_max_y - global_min_y\n    global_depth = global_max_z - global_min_z\n\n    global_center_x = global_min_x + global_width/2\n    global_center_y = global_min_y + global_height/2\n    global_center_z = global_min_z + global_depth/2\n\n    global_diameter = c4d.Vector(global_width, global_height, global_depth)\n    global_center = c4d.Vector(global_center_x, global_center_y, global_center_z)\n\n    return global_center, global_diameter\n\n\ndef main() -> None:\n    global Center, Diameter\n\n    local_bboxes = []\n\n    for port in op.GetInPorts():\n        obj = globals()[port.GetName(op)]\n\n        initial_bbox = initial_step(obj, get_bounding_box)\n        local_bboxes.append(initial_bbox)\n        local_bboxes = recurse_hierarchy(obj.GetDown(), get_bounding_box, local_bboxes)\n\n    global_bbox = get_global_bounding_box(local_bboxes)\n\n    Center, Diameter = global_bbox'
+        self.obj[c4d.GV_PYTHON_CODE] = 'from pydeation.utils import get_bounding_box\n\nBOUNDS = {}  # bounds per object of the previous evaluation\n\n\ndef main():\n    global Center, Diameter\n    Center, Diameter = get_bounding_box(op, globals(), BOUNDS)\n'
 
     def set_ports(self):
         self.obj.RemoveUnusedPorts()
@@ -304,7 +318,7 @@ class XMax(XPython):
         super().__init__(target, name=name, **kwargs)
 
     def set_params(self):
-        self.obj[c4d.GV_PYTHON_CODE] = 'import c4d\n\ndef main():\n    global Output1\n    Output1 = 0\n    values = []\n    for port in op.GetInPorts():\n        value = globals()[port.GetName(op)]\n        values.append(value)\n    Output1 = max(values)'
+        self.obj[c4d.GV_PYTHON_CODE] = 'from pydeation.utils import get_input_values\n\n\ndef main():\n    global Output1\n    Output1 = max(get_input_values(op, globals()), default=0)\n'
 
 
 class XMin(XPython):
@@ -314,7 +328,7 @@ class XMin(XPython):
         super().__init__(target, name=name, **kwargs)
 
     def set_params(self):
-        self.obj[c4d.GV_PYTHON_CODE] = 'import c4d\n\ndef main():\n    global Output1\n    Output1 = 0\n    values = []\n    for port in op.GetInPorts():\n        value = globals()[port.GetName(op)]\n        values.append(value)\n    Output1 = min(values)'
+        self.obj[c4d.GV_PYTHON_CODE] = 'from pydeation.utils import get_input_values\n\n\ndef main():\n    global Output1\n    Output1 = min(get_input_values(op, globals()), default=0)\n'
 
 
 class XFormula(XNode):
@@ -358,33 +372,13 @@ class XRangeMapper(XNode):
         spline.MakeLinearSplineBezier()
         # set easing
         knot_ini, knot_fin = spline.GetKnots()
-        if self.easing is True:
-            spline.SetKnot(0, knot_ini["vPos"], knot_ini["lFlagsSettings"], vTangentLeft=c4d.Vector(
-                0, 0, 0), vTangentRight=c4d.Vector(0.25, 0, 0))
-            spline.SetKnot(1, knot_fin["vPos"], knot_fin["lFlagsSettings"],
-                           vTangentLeft=c4d.Vector(-0.25, 0, 0), vTangentRight=c4d.Vector(0, 0, 0))
-        elif self.easing == "strong":
-            spline.SetKnot(0, knot_ini["vPos"], knot_ini["lFlagsSettings"], vTangentLeft=c4d.Vector(
-                0, 0, 0), vTangentRight=c4d.Vector(0.5, 0, 0))
-            spline.SetKnot(1, knot_fin["vPos"], knot_fin["lFlagsSettings"],
-                           vTangentLeft=c4d.Vector(-0.5, 0, 0), vTangentRight=c4d.Vector(0, 0, 0))
-        elif self.easing == "soft":
+        tangent_ini, tangent_fin = EASING_TANGENTS.get(self.easing, (None, None))
+        if tangent_ini is not None:
             spline.SetKnot(0, knot_ini["vPos"], knot_ini["lFlagsSettings"], vTangentLeft=c4d.Vector(
-                0, 0, 0), vTangentRight=c4d.Vector(0.125, 0, 0))
+                0, 0, 0), vTangentRight=c4d.Vector(tangent_ini, 0, 0))
+        if tangent_fin is not None:
             spline.SetKnot(1, knot_fin["vPos"], knot_fin["lFlagsSettings"],
-                           vTangentLeft=c4d.Vector(-0.125, 0, 0), vTangentRight=c4d.Vector(0, 0, 0))
-        elif self.easing == "in":
-            spline.SetKnot(0, knot_ini["vPos"], knot_ini["lFlagsSettings"], vTangentLeft=c4d.Vector(
-                0, 0, 0), vTangentRight=c4d.Vector(0.25, 0, 0))
-        elif self.easing == "strong_in":
-            spline.SetKnot(0, knot_ini["vPos"], knot_ini["lFlagsSettings"], vTangentLeft=c4d.Vector(
-                0, 0, 0), vTangentRight=c4d.Vector(0.5, 0, 0))
-        elif self.easing == "out":
-            spline.SetKnot(1, knot_fin["vPos"], knot_fin["lFlagsSettings"],
-                           vTangentLeft=c4d.Vector(-0.25, 0, 0), vTangentRight=c4d.Vector(0, 0, 0))
-        elif self.easing == "strong_out":
-            spline.SetKnot(1, knot_fin["vPos"], knot_fin["lFlagsSettings"],
-                           vTangentLeft=c4d.Vector(-0.5, 0, 0), vTangentRight=c4d.Vector(0, 0, 0))
+                           vTangentLeft=c4d.Vector(-tangent_fin, 0, 0), vTangentRight=c4d.Vector(0, 0, 0))
 
         self.obj[c4d.GV_RANGEMAPPER_SPLINE] = spline
 
@@ -400,6 +394,39 @@ class XRangeMapper(XNode):
         self.obj[c4d.GV_RANGEMAPPER_REVERSE] = self.reverse
 
 
+class XMovementMapper(XPython):
+    """evaluates the range mappers of several movements driven by the same completion in a single python node"""
+
+    def __init__(self, target, movements=[], name="MovementMapper", **kwargs):
+        self.movements = movements
+        super().__init__(target, name=name, **kwargs)
+        self.set_ports()
+
+    def get_movement_ranges(self):
+        """returns the input and output ranges and the easing tangents per movement"""
+        movement_ranges = []
+        for movement in self.movements:
+            tangent_ini, tangent_fin = EASING_TANGENTS.get(movement.easing, (None, None))
+            movement_ranges.append((float(movement.timing[0]), float(movement.timing[1]), float(movement.output[0]),
+                                    float(movement.output[1]), tangent_ini or 0.0, tangent_fin or 0.0))
+        return tuple(movement_ranges)
+
+    def set_params(self):
+        outputs = ", ".join(f"Output{i}" for i in range(len(self.movements)))
+        self.obj[c4d.GV_PYTHON_CODE] = f"from pydeation.utils import map_movements\n\nMOVEMENTS = {self.get_movement_ranges()!r}\n\n\ndef main():\n    global {outputs}\n    {outputs}, = map_movements(Completion, MOVEMENTS)\n"
+
+    def set_ports(self):
+        self.obj.RemoveUnusedPorts()
+        self.completion_port_in = self.obj.AddPort(
+            c4d.GV_PORT_INPUT, PYTHON_REAL_DESCID_IN)
+        self.completion_port_in.SetName("Completion")
+        self.output_ports = []
+        for i in range(len(self.movements)):
+            output_port = self.obj.AddPort(c4d.GV_PORT_OUTPUT, PYTHON_REAL_DESCID_OUT)
+            output_port.SetName(f"Output{i}")
+            self.output_ports.append(output_port)
+
+
 class XFreeze(XNode):
     """creates a freeze node"""
 